@@ -0,0 +1,297 @@
+"""End-to-end benchmark: N Tapper instances through full cycles against the mock API.
+
+A fake Telegram client hands out initData, benchmarks/mock_server.py runs in
+a child process, all tapper sleeps are compressed through bot.utils.clock
+and the RNG is seeded. Reports requests per cycle, wall time per phase,
+CPU time per account, peak RSS per 1,000 accounts and event-loop lag, and
+writes everything to JSON so runs can be compared.
+
+Run from the repository root:
+
+    python benchmarks/bench_cycles.py --accounts 500 --cycles 2
+    python benchmarks/bench_cycles.py --accounts 200 --soak 50   # memory growth over 50 cycles
+"""
+import argparse
+import asyncio
+import atexit
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import quote
+from urllib.request import urlopen
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+WORKDIR = tempfile.mkdtemp(prefix="bums-bench-")
+# Registered before the bot is imported so it runs after the bot's own exit-time saves
+atexit.register(shutil.rmtree, WORKDIR, True)
+
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+os.environ.setdefault("TOKEN_CACHE_PATH", os.path.join(WORKDIR, "tokens.json"))
+os.environ["SAVE_RESPONSE_DATA"] = "False"
+os.environ["NIGHT_MODE"] = "False"
+
+
+class FakeTelegramClient:
+    """Stands in for a Pyrogram Client in get_tg_web_data, with optional RPC latency."""
+
+    def __init__(self, name: str, user_id: int, latency: float = 0.0):
+        self.name = name
+        self.user_id = user_id
+        self.latency = latency
+        self.proxy = None
+        self.is_connected = False
+        self.calls = 0
+
+    async def _rpc(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def connect(self):
+        await self._rpc()
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def resolve_peer(self, peer_id):
+        await self._rpc()
+        return peer_id
+
+    async def invoke(self, query):
+        await self._rpc()
+        user = json.dumps({"id": self.user_id, "first_name": self.name})
+        init_data = f"query_id=bench{self.user_id}&user={quote(user)}&auth_date={int(time.time())}&hash=bench"
+        return SimpleNamespace(url=f"https://app.bums.bot/#tgWebAppData={quote(init_data)}&tgWebAppVersion=7.10")
+
+    async def get_me(self):
+        await self._rpc()
+        return SimpleNamespace(id=self.user_id)
+
+
+def percentiles(values, points=(50, 95, 99)) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {f"p{point}": ordered[min(int(len(ordered) * point / 100), len(ordered) - 1)] for point in points}
+    result["max"] = ordered[-1]
+    result["mean"] = sum(ordered) / len(ordered)
+    return {key: round(value, 6) for key, value in result.items()}
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_kb()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def mock_stats(base_url: str) -> dict:
+    with urlopen(f"{base_url}/__stats", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def start_mock(port: int, args) -> subprocess.Popen:
+    command = [sys.executable, os.path.join(ROOT, "benchmarks", "mock_server.py"), "--port", str(port),
+               "--seed", str(args.seed), "--latency", str(args.latency[0]), str(args.latency[1]),
+               "--error-rate", str(args.error_rate)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            mock_stats(f"http://127.0.0.1:{port}")
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock API did not start")
+
+
+async def watch_loop_lag(samples: list, interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(loop.time() - started - interval, 0.0))
+
+
+async def run_benchmark(args, base_url: str) -> dict:
+    import bot.utils  # noqa: F401  bot.utils has to be imported before bot.config
+    from bot.core.connector_pool import connector_pool
+    from bot.core.tapper import Tapper, PHASES
+    from bot.core.tg_pool import tg_pool
+    from bot.utils.clock import clock
+    from bot.utils.combo import combo_store
+    from bot.utils.logger import set_sink
+
+    set_sink(sys.stderr, level="INFO" if args.verbose else "CRITICAL")
+    clock.scale = args.time_scale
+
+    # combo.json is rewritten when the mock rejects a combo, keep the repository copy untouched
+    shutil.copy(os.path.join(ROOT, "combo.json"), os.path.join(WORKDIR, "combo.json"))
+    combo_store.path = os.path.join(WORKDIR, "combo.json")
+    combo_store.refresh(force=True)
+
+    phase_times = {phase: [] for phase in PHASES}
+
+    def timed(phase, method):
+        async def wrapper(self, *a, **kw):
+            started = time.perf_counter()
+            try:
+                return await method(self, *a, **kw)
+            finally:
+                phase_times[phase].append(time.perf_counter() - started)
+        return wrapper
+
+    BenchTapper = type("BenchTapper", (Tapper,), {
+        f"phase_{phase}": timed(phase, getattr(Tapper, f"phase_{phase}")) for phase in PHASES
+    })
+
+    gc.collect()
+    rss_before = current_rss_kb()
+    tappers = [BenchTapper(tg_client=FakeTelegramClient(f"bench_{index}", 100000 + index, args.tg_latency),
+                           first_run=False, user_agent="Mozilla/5.0 (Linux; Android 13) bench")
+               for index in range(args.accounts)]
+
+    lag_samples = []
+    lag_task = asyncio.create_task(watch_loop_lag(lag_samples))
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(tapper):
+        async with slots:
+            return await tapper.run_once(proxy=None)
+
+    cycles, soak = [], []
+    if args.soak:
+        tracemalloc.start()
+    total_cycles = args.soak or args.cycles
+    stats_before = mock_stats(base_url)
+
+    for cycle in range(total_cycles):
+        requests_before = mock_stats(base_url)["requests"]
+        cpu_before, wall_before = time.process_time(), time.perf_counter()
+        results = await asyncio.gather(*(one(tapper) for tapper in tappers), return_exceptions=True)
+        wall, cpu = time.perf_counter() - wall_before, time.process_time() - cpu_before
+        requests = mock_stats(base_url)["requests"] - requests_before
+
+        failed = sum(1 for result in results if result is None or isinstance(result, BaseException))
+        cycles.append({"cycle": cycle, "wall_s": round(wall, 4), "cpu_s": round(cpu, 4),
+                       "requests": requests, "failed_accounts": failed})
+
+        if args.soak:
+            gc.collect()
+            soak.append({"cycle": cycle, "rss_kb": current_rss_kb(), "traced_kb": tracemalloc.get_traced_memory()[0] // 1024})
+            print(f"cycle {cycle + 1}/{total_cycles}: {wall:.2f}s, rss {soak[-1]['rss_kb']} KB", file=sys.stderr)
+
+    lag_task.cancel()
+    await connector_pool.close()
+    await tg_pool.close()
+    if args.soak:
+        tracemalloc.stop()
+
+    stats_after = mock_stats(base_url)
+    account_cycles = args.accounts * total_cycles
+    peak = peak_rss_kb()
+    paths = {path: count - stats_before["paths"].get(path, 0) for path, count in stats_after["paths"].items()
+             if path.startswith("/miniapps/")}
+
+    report = {
+        "requests_per_cycle": round(sum(cycle["requests"] for cycle in cycles) / account_cycles, 2),
+        "requests_per_cycle_by_endpoint": {path: round(count / account_cycles, 3) for path, count in sorted(paths.items())},
+        "cpu_ms_per_account_cycle": round(sum(cycle["cpu_s"] for cycle in cycles) / account_cycles * 1000, 3),
+        "wall_s_per_cycle": percentiles([cycle["wall_s"] for cycle in cycles]),
+        "phase_wall_s": {phase: {**percentiles(times), "total": round(sum(times), 4)} for phase, times in phase_times.items() if times},
+        "event_loop_lag_s": percentiles(lag_samples),
+        "peak_rss_kb": peak,
+        "rss_kb_per_1000_accounts": round((current_rss_kb() - rss_before) / args.accounts * 1000) if rss_before else None,
+        "telegram_rpcs": sum(tapper.tg_client.calls for tapper in tappers),
+        "mock_errors_injected": stats_after["errors"] - stats_before["errors"],
+        "cycles": cycles,
+    }
+    if soak:
+        report["soak"] = soak
+        report["soak_rss_growth_kb_per_cycle"] = round((soak[-1]["rss_kb"] - soak[0]["rss_kb"]) / max(len(soak) - 1, 1), 2)
+        report["soak_traced_growth_kb_per_cycle"] = round((soak[-1]["traced_kb"] - soak[0]["traced_kb"]) / max(len(soak) - 1, 1), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--soak", type=int, default=0, metavar="CYCLES", help="Run this many cycles and track memory growth")
+    parser.add_argument("--concurrency", type=int, default=100, help="Accounts running a cycle at the same time")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--time-scale", type=float, default=0.0, help="Factor applied to tapper sleeps (0 - none)")
+    parser.add_argument("--latency", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN", "MAX"), help="Mock API latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock API answers that are 503")
+    parser.add_argument("--tg-latency", type=float, default=0.0, help="Latency of each fake Telegram RPC")
+    parser.add_argument("--output", help="JSON report path (default - benchmarks/results/cycles-<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the bot's INFO logs")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["API_BASE_URL"] = base_url
+
+    mock = start_mock(port, args)
+    try:
+        report = asyncio.run(run_benchmark(args, base_url))
+    finally:
+        mock.terminate()
+        mock.wait(timeout=10)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"cycles-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    result = {
+        "benchmark": "cycles",
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "verbose")},
+        "results": report,
+    }
+    with open(output, "w", encoding="utf8") as file:
+        json.dump(result, file, indent=2)
+
+    summary = {key: report[key] for key in ("requests_per_cycle", "cpu_ms_per_account_cycle", "rss_kb_per_1000_accounts", "event_loop_lag_s")}
+    print(json.dumps(summary, indent=2))
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Micro-benchmark: per-tap generate_taps loop vs. plan_tap_batches.
+
+Run from the repository root:  python benchmarks/bench_taps.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "benchmark")
+
+from bot.utils.taps import plan_tap_batches  # noqa: E402
+
+
+TAP_VALUE = 12
+LEFT_ENERGY = 9000
+COIN_ROOM = 1_000_000
+BONUS_CHANCE = 1500
+BONUS_RATIO = 300
+MAX_TAPS = 30
+
+
+def generate_taps(tap_value, left_energy, bonus_chance, bonus_multiplier):
+    # Copy of the former bot.utils.functions.generate_taps, kept as the baseline
+    if tap_value < left_energy:
+        gain = False
+        if tap_value * bonus_multiplier / 100 <= left_energy:
+            gain = random.randint(0, 100) <= bonus_chance / 100
+            tap_value = tap_value * bonus_multiplier / 100 if gain else tap_value
+            return int(tap_value)
+        return 0
+
+
+def legacy_drain():
+    # What the old tap loop did on the CPU side to spend the same energy
+    energy, batches = LEFT_ENERGY, 0
+    while energy > TAP_VALUE:
+        amount = 0
+        for _ in range(random.randint(15, MAX_TAPS)):
+            amount += generate_taps(TAP_VALUE, energy, BONUS_CHANCE, BONUS_RATIO)
+        if amount <= 0 or amount > energy:
+            break
+        energy -= amount
+        batches += 1
+    return batches
+
+
+def planned_drain():
+    return len(plan_tap_batches(TAP_VALUE, LEFT_ENERGY, COIN_ROOM, BONUS_CHANCE, BONUS_RATIO, MAX_TAPS))
+
+
+def main():
+    random.seed(0)
+    number = 2000
+    legacy = min(timeit.repeat(legacy_drain, number=number, repeat=5)) / number
+    planned = min(timeit.repeat(planned_drain, number=number, repeat=5)) / number
+
+    random.seed(0)
+    print(f"energy={LEFT_ENERGY} tap={TAP_VALUE} max_taps={MAX_TAPS}")
+    print(f"legacy loop : {legacy * 1e6:9.1f} us/drain, {legacy_drain()} submissions")
+    print(f"planner     : {planned * 1e6:9.1f} us/drain, {planned_drain()} submissions")
+    print(f"speedup     : {legacy / planned:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""Local stand-in for api.bums.bot with a simulated game economy.
+
+Every account gets its own state: coins, energy that regenerates per
+second, tap boosts and mine cards with growing costs, collect sequence
+numbers checked against the tap hash, and daily sign-in, box, spin and
+coin limits that reset at --reset-hour UTC. Latency and 5xx/429 errors
+can be injected to load-test the bot.
+
+Run from the repository root, then point the bot at it with
+API_BASE_URL=http://127.0.0.1:8080:
+
+    python benchmarks/mock_server.py --port 8080 --latency 0.01 0.05 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+TAP_SECRET = "7be2a16a82054ee58398c5edb7ac4a5a"
+DAY = 86400
+
+# Boost type -> (value at level 0, value added per level, base upgrade cost)
+BOOSTS = {
+    "tap": (1, 1, 200),
+    "energy": (500, 250, 300),
+    "recovery": (1, 1, 400),
+    "bonusChance": (100, 100, 500),
+    "bonusRatio": (150, 50, 500),
+}
+COST_GROWTH = 1.6
+
+MINE_CARDS = [(101 + i, 100 * (i + 1), 10 * (i + 1)) for i in range(20)]  # (mineId, base cost, profit per level)
+SIGN_REWARDS = [1000, 2000, 3000, 5000, 8000, 12000, 20000]
+COMBO = [101, 102, 103]
+
+
+def ok(data=None, **extra):
+    return web.json_response({"code": 0, "msg": "OK", "data": data if data is not None else {}, **extra})
+
+
+def fail(msg):
+    return web.json_response({"code": -1, "msg": msg, "data": {}})
+
+
+class Account:
+    def __init__(self, user_id: str, reset_hour: int):
+        self.user_id = user_id
+        self.reset_hour = reset_hour
+        self.coin = 5000
+        self.level = 1
+        self.boosts = {name: 0 for name in BOOSTS}
+        self.energy = self.boost_value("energy")
+        self.energy_at = time.time()
+        self.collect_seq = 1
+        self.mines = {mine_id: 0 for mine_id, _, _ in MINE_CARDS}
+        self.mined_at = time.time()
+        self.refer_balance = random.randint(0, 5000)
+        self.gang = None
+        self.finished_tasks = set()
+        self.day = None
+        self.new_day()
+
+    def new_day(self):
+        day = int((time.time() - self.reset_hour * 3600) // DAY)
+        if day == self.day:
+            return
+        self.day = day
+        self.today_coin = 0
+        self.signed = False
+        self.sign_days = getattr(self, "sign_days", 0) % len(SIGN_REWARDS)
+        self.box_used = 0
+        self.stamina = 50
+        self.combo_left = 3
+        self.combo_solved = False
+
+    def boost_value(self, name: str) -> int:
+        base, step, _ = BOOSTS[name]
+        return base + step * self.boosts[name]
+
+    def boost_cost(self, name: str) -> int:
+        return int(BOOSTS[name][2] * COST_GROWTH ** self.boosts[name])
+
+    def regenerate(self):
+        now = time.time()
+        gained = int((now - self.energy_at) * self.boost_value("recovery"))
+        if gained > 0:
+            self.energy = min(self.energy + gained, self.boost_value("energy"))
+            self.energy_at = now
+
+    @property
+    def mine_power(self) -> int:
+        return sum(profit * self.mines[mine_id] for mine_id, _, profit in MINE_CARDS)
+
+    def collect_offline(self) -> int:
+        now = time.time()
+        hours = min(now - self.mined_at, 3 * 3600) / 3600
+        self.mined_at = now
+        earned = int(self.mine_power * hours)
+        self.coin += earned
+        return earned
+
+    def mine_card(self, mine_id: int, base_cost: int, profit: int) -> dict:
+        level = self.mines[mine_id]
+        return {
+            "mineId": mine_id,
+            "level": level,
+            "nextLevelCost": int(base_cost * COST_GROWTH ** level),
+            "perHourReward": profit * level,
+            "nextPerHourReward": profit * (level + 1),
+            "status": 1,
+        }
+
+    def tap_info(self) -> dict:
+        info = {name: {"level": self.boosts[name], "value": self.boost_value(name), "nextCostCoin": self.boost_cost(name)}
+                for name in BOOSTS}
+        info["collectInfo"] = {"collectSeqNo": self.collect_seq}
+        return info
+
+    def game_info(self, offline: int) -> dict:
+        return {
+            "gameInfo": {
+                "coin": self.coin,
+                "level": self.level,
+                "todayCollegeCoin": self.today_coin,
+                "todayMaxCollegeCoin": self.boost_value("energy") * 20,
+                "energySurplus": self.energy,
+                "collegeCanUse": ["Lottery"] if self.level >= 1 else [],
+            },
+            "mineInfo": {"minePower": self.mine_power, "mineOfflineCoin": offline},
+            "tapInfo": self.tap_info(),
+            "propInfo": [],
+        }
+
+
+class MockBumsApi:
+    def __init__(self, latency=(0.0, 0.0), error_rate: float = 0.0, throttle_rate: float = 0.0, reset_hour: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.reset_hour = reset_hour
+        self.accounts = {}
+        self.tokens = {}
+        self.requests = 0
+        self.errors = 0
+        self.paths = {}
+        self.spans = 0
+        self.started_at = time.time()
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.faults])
+        api = "/miniapps/api"
+        routes = {
+            ("POST", "/user/telegram_auth"): self.telegram_auth,
+            ("GET", "/user_game_level/getGameInfo"): self.get_game_info,
+            ("POST", "/user_game_level/upgradeLeve"): self.upgrade_boost,
+            ("POST", "/user_game/collectCoin"): self.collect_coin,
+            ("POST", "/mine/getMineLists"): self.mine_lists,
+            ("POST", "/mine/upgrade"): self.mine_upgrade,
+            ("GET", "/sign/getSignLists"): self.sign_lists,
+            ("POST", "/sign/sign"): self.sign,
+            ("GET", "/task/lists"): self.task_lists,
+            ("POST", "/task/finish_task"): self.finish_task,
+            ("GET", "/wallet/balance"): self.wallet_balance,
+            ("POST", "/wallet/W70001To80001"): self.wallet_collect,
+            ("POST", "/gang/gang_lists"): self.gang_lists,
+            ("POST", "/gang/gang_join"): self.gang_join,
+            ("GET", "/mine_active/getMineAcctiveInfo"): self.combo_info,
+            ("POST", "/mine_active/JoinMineAcctive"): self.combo_join,
+            ("GET", "/prop_shop/Lists"): self.prop_lists,
+            ("POST", "/game_spin/Start"): self.open_box,
+            ("GET", "/game_slot/stamina"): self.stamina,
+            ("POST", "/game_slot/start"): self.spin,
+        }
+        for (method, path), handler in routes.items():
+            app.router.add_route(method, api + path, handler)
+        app.router.add_get("/__stats", self.stats)
+        # OTLP/HTTP collector stand-in for TRACE_OTLP_URL, spans are only counted
+        app.router.add_post("/v1/traces", self.traces)
+        return app
+
+    @web.middleware
+    async def faults(self, request, handler):
+        if not request.path.startswith("/miniapps/"):
+            return await handler(request)
+        self.requests += 1
+        self.paths[request.path] = self.paths.get(request.path, 0) + 1
+        if self.latency[1] > 0:
+            await asyncio.sleep(random.uniform(*self.latency))
+        roll = random.random()
+        if roll < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if roll < self.error_rate + self.throttle_rate:
+            self.errors += 1
+            return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+        return await handler(request)
+
+    def account(self, request) -> Account:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        account = self.tokens.get(token)
+        if account is None:
+            raise web.HTTPUnauthorized(text="invalid token")
+        account.new_day()
+        return account
+
+    async def telegram_auth(self, request):
+        form = await request.post()
+        init_data = form.get("initData") or ""
+        try:
+            user_id = str(json.loads(parse_qs(init_data).get("user", ["{}"])[0]).get("id") or "")
+        except ValueError:
+            user_id = ""
+        user_id = user_id or hashlib.md5(init_data.encode()).hexdigest()[:12]
+
+        account = self.accounts.setdefault(user_id, Account(user_id, self.reset_hour))
+        token = hashlib.sha1(f"{user_id}{time.time()}{random.random()}".encode()).hexdigest()
+        self.tokens[token] = account
+        return ok({"token": token})
+
+    async def get_game_info(self, request):
+        account = self.account(request)
+        account.regenerate()
+        offline = account.collect_offline()
+        return ok(account.game_info(offline))
+
+    async def upgrade_boost(self, request):
+        account = self.account(request)
+        card_type = (await request.post()).get("type")
+        if card_type not in BOOSTS:
+            return fail("Param error")
+        cost = account.boost_cost(card_type)
+        if account.coin < cost:
+            return fail("Insufficient balance")
+        account.coin -= cost
+        account.boosts[card_type] += 1
+        return ok({"tapInfo": account.tap_info(), "coin": account.coin})
+
+    async def collect_coin(self, request):
+        account = self.account(request)
+        form = await request.post()
+        try:
+            seq, amount = int(form.get("collectSeqNo")), int(form.get("collectAmount"))
+        except (TypeError, ValueError):
+            return fail("Param error")
+
+        expected = hashlib.md5(f"{amount}{seq}{TAP_SECRET}".encode()).hexdigest()
+        if seq != account.collect_seq or form.get("hashCode") != expected:
+            return fail("collectSeqNo error")
+
+        account.regenerate()
+        limit = account.boost_value("energy") * 20
+        if amount <= 0 or amount > account.energy or account.today_coin + amount > limit:
+            return fail("Insufficient energy")
+
+        account.energy -= amount
+        account.coin += amount
+        account.today_coin += amount
+        account.collect_seq += 1
+        return ok({"coin": account.coin, "collectSeqNo": account.collect_seq,
+                   "energySurplus": account.energy, "todayCollegeCoin": account.today_coin})
+
+    async def mine_lists(self, request):
+        account = self.account(request)
+        return ok({"lists": [account.mine_card(*card) for card in MINE_CARDS]})
+
+    async def mine_upgrade(self, request):
+        account = self.account(request)
+        try:
+            mine_id = int((await request.post()).get("mineId"))
+        except (TypeError, ValueError):
+            return fail("Param error")
+        card = next((card for card in MINE_CARDS if card[0] == mine_id), None)
+        if card is None:
+            return fail("Param error")
+
+        cost = account.mine_card(*card)["nextLevelCost"]
+        if account.coin < cost:
+            return fail("Insufficient balance")
+        account.collect_offline()
+        account.coin -= cost
+        account.mines[mine_id] += 1
+        account.level = 1 + sum(account.mines.values()) // 10
+        return ok(account.mine_card(*card))
+
+    async def sign_lists(self, request):
+        account = self.account(request)
+        lists = [{"daysDesc": f"Day {day + 1}", "normal": reward, "status": 1 if day < account.sign_days else 0}
+                 for day, reward in enumerate(SIGN_REWARDS)]
+        return ok({"lists": lists, "signStatus": 1 if account.signed else 0})
+
+    async def sign(self, request):
+        account = self.account(request)
+        if account.signed:
+            return fail("Already signed")
+        account.coin += SIGN_REWARDS[account.sign_days % len(SIGN_REWARDS)]
+        account.sign_days += 1
+        account.signed = True
+        return ok()
+
+    def tasks(self, account: Account) -> list:
+        base = {"limitInviteCount": 0, "InviteCount": 0, "qualify": 1, "jumpUrl": ""}
+        tasks = [
+            {**base, "id": 1, "name": "Reach level 2", "rewardParty": 5000, "taskType": "level", "classifyName": "In-game tasks", "type": "normal"},
+            {**base, "id": 2, "name": "Visit partner", "rewardParty": 3000, "taskType": "normal", "classifyName": "Partner Task", "type": "open_link"},
+            {**base, "id": 3, "name": "Find hidden code - watch Bums Show Episode 0", "rewardParty": 10000, "taskType": "pwd", "classifyName": "YouTube", "type": "open_link"},
+        ]
+        for task in tasks:
+            task["isFinish"] = 1 if task["id"] in account.finished_tasks else 0
+        return tasks
+
+    async def task_lists(self, request):
+        account = self.account(request)
+        return ok({"lists": self.tasks(account)})
+
+    async def finish_task(self, request):
+        account = self.account(request)
+        form = await request.post()
+        task = next((task for task in self.tasks(account) if str(task["id"]) == form.get("id")), None)
+        if task is None or task["isFinish"]:
+            return fail("Task not found")
+        if task["taskType"] == "pwd" and form.get("pwd") != "42858":
+            return fail("Wrong code")
+        account.finished_tasks.add(task["id"])
+        account.coin += task["rewardParty"]
+        return ok()
+
+    async def wallet_balance(self, request):
+        account = self.account(request)
+        return ok({"lists": [{"id": 70001, "availableAmount": account.refer_balance, "freezeAmount": 0}]})
+
+    async def wallet_collect(self, request):
+        account = self.account(request)
+        account.coin += account.refer_balance
+        account.refer_balance = 0
+        return ok()
+
+    async def gang_lists(self, request):
+        account = self.account(request)
+        return ok({"myGang": {"gangId": account.gang} if account.gang else {}, "lists": []})
+
+    async def gang_join(self, request):
+        account = self.account(request)
+        account.gang = (await request.post()).get("name") or "gang"
+        return ok()
+
+    async def combo_info(self, request):
+        account = self.account(request)
+        return ok({"resultNum": 0 if account.combo_solved else account.combo_left, "rewardNum": 100000})
+
+    async def combo_join(self, request):
+        account = self.account(request)
+        if account.combo_solved or account.combo_left <= 0:
+            return fail("No chance left")
+        cards = [int(card) for card in ((await request.post()).get("cardIdStr") or "").split(",") if card.strip().isdigit()]
+        if sorted(cards) == sorted(COMBO):
+            account.combo_solved = True
+            account.coin += 100000
+            return ok({"status": 0, "resultNum": account.combo_left})
+        account.combo_left -= 1
+        return ok({"status": 1, "resultNum": account.combo_left})
+
+    async def prop_lists(self, request):
+        account = self.account(request)
+        return ok([{"propId": 500010001, "toDayUse": account.box_used >= 1, "toDayMaxUseNum": 1, "toDayNowUseNum": account.box_used}])
+
+    async def open_box(self, request):
+        account = self.account(request)
+        if account.box_used >= 1:
+            return fail("Already used today")
+        account.box_used += 1
+        reward = random.choice([500, 1000, 5000])
+        account.coin += reward
+        return web.json_response({"code": 0, "msg": "OK", "rewardLists": [{"name": f"{reward} coins"}]})
+
+    async def stamina(self, request):
+        account = self.account(request)
+        return ok({"staminaNow": account.stamina, "staminaMax": 50})
+
+    async def spin(self, request):
+        account = self.account(request)
+        try:
+            count = int((await request.post()).get("count"))
+        except (TypeError, ValueError):
+            return fail("Param error")
+        if count <= 0 or count > account.stamina:
+            return fail("Insufficient stamina")
+        account.stamina -= count
+        reward = random.choice([100, 200, 500]) * count
+        account.coin += reward
+        return ok({"rewardLists": {"rewardList": [{"name": f"{reward} coins"}]}})
+
+    async def stats(self, request):
+        uptime = time.time() - self.started_at
+        return web.json_response({
+            "accounts": len(self.accounts),
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_second": round(self.requests / uptime, 2) if uptime else 0,
+            "paths": self.paths,
+            "spans": self.spans,
+        })
+
+    async def traces(self, request):
+        payload = await request.json()
+        self.spans += sum(len(scope.get("spans", [])) for resource in payload.get("resourceSpans", [])
+                          for scope in resource.get("scopeSpans", []))
+        return web.json_response({})
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 8080, **options) -> tuple:
+    """Starts the mock in the running loop; returns (runner, api) for benchmarks embedding it."""
+    api = MockBumsApi(**options)
+    runner = web.AppRunner(api.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner, api
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN", "MAX"),
+                        help="Random delay (in seconds) added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--reset-hour", type=int, default=0, help="UTC hour daily limits reset")
+    parser.add_argument("--seed", type=int, help="Seed for rewards and injected faults")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    api = MockBumsApi(latency=tuple(args.latency), error_rate=args.error_rate,
+                      throttle_rate=args.throttle_rate, reset_hour=args.reset_hour)
+    print(f"Mock Bums API on http://{args.host}:{args.port} (stats at /__stats)")
+    web.run_app(api.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,8 @@ class Settings(BaseSettings):
     AUTO_TAP: bool = True
     TAPS_PER_BATCH: list[int] = [15, 30]
     DELAY_BETWEEN_TAPS: list[int] = [10, 20]
+    TAP_SYNC_EVERY: int = 5
+    TAP_WAKEUP_ENERGY: float = 0.9
     
     AUTO_TASK: bool = True
     AUTO_JOIN_CHANNELS: bool = True
@@ -44,15 +46,54 @@ class Settings(BaseSettings):
 
     SLEEP_TIME: list[int] = [2700, 4200]
     START_DELAY: list[int] = [5, 100]
+    STARTS_PER_SECOND: float = 2
+    SCHEDULER_WORKERS: int = 20
+    SCHEDULER_MAX_CYCLES: int = 100
+    DAILY_RESET_HOUR: int = 0 #TIMEZONE = UTC
     
     REF_KEY: str = 'ref_3CcrQyaN' #KEY AFTER 'startapp=' from invite link
     IN_USE_SESSIONS_PATH: str = 'bot/config/used_sessions.txt'
     
     TRACK_BOT_UPDATES: bool = False
     
+    API_BASE_URL: str = 'https://api.bums.bot'
     MAX_REQUEST_RETRY: int = 3
+    API_CONCURRENCY: list[int] = [1, 32]
+    RETRY_BUDGET: float = 0.2
+    GAME_INFO_TTL: int = 60
+    
+    HTTP_LIMIT_PER_HOST: int = 30
+    HTTP_KEEPALIVE_TIMEOUT: int = 30
+    HTTP_DNS_CACHE_TTL: int = 600
+    HTTP_IDLE_TIMEOUT: int = 300
+    
+    TG_MAX_CONNECTIONS: int = 50
+    INIT_DATA_TTL: int = 3600
+    
+    TOKEN_CACHE_PATH: str = 'sessions/tokens.json'
+    TOKEN_TTL: int = 3600
+    TOKEN_REFRESH_MARGIN: int = 300
     
     SAVE_RESPONSE_DATA: bool = False
+    RECORD_PATH: str = 'traffic/traffic.jsonl'
+    RECORD_MAX_SIZE: int = 50 #MB
+    RECORD_COMPRESS: bool = True
+    
+    LOG_MODE: str = 'pretty' #pretty / production
+    LOG_SAMPLE: list[str] = ['Tapped', 'Sleep']
+    LOG_SAMPLE_WINDOW: int = 60
+    LOG_DIR: str = 'logs'
+    LOG_FILE_SIZE: int = 10 #MB
+    
+    TRACE_SPANS: bool = False
+    TRACE_PATH: str = 'traces/spans.jsonl'
+    TRACE_OTLP_URL: str = '' #e.g. http://127.0.0.1:4318, replaces TRACE_PATH
+    
+    METRICS_PORT: int = 0 #0 = DISABLED
+    METRICS_HOST: str = '127.0.0.1'
+    
+    PROFILE_SECONDS: int = 30
+    PROFILE_PATH: str = 'profiles'
     
     NIGHT_MODE: bool = False
     NIGHT_TIME: list[int] = [0, 7] #TIMEZONE = UTC, FORMAT = HOURS, [start, end]
@@ -0,0 +1,117 @@
+import asyncio
+from time import monotonic
+
+import aiohttp
+from aiohttp_proxy import ProxyConnector
+
+from bot.config import settings
+
+
+class ConnectorPool:
+    """One keep-alive connector per proxy (or direct), shared by every account using it.
+
+    Sessions are opened per cycle with `connector_owner=False`, so the TCP/TLS
+    connections outlive them and are reused by the next account on the same
+    route. Connectors nobody has used for `idle_timeout` seconds are closed by
+    a background reaper, which frees their sockets during long sleeps.
+
+    Sessions pass `trace_config` so the pool can count new and reused
+    connections through aiohttp's public tracing hooks.
+    """
+
+    def __init__(self, limit_per_host: int, keepalive_timeout: float, dns_cache_ttl: int, idle_timeout: float):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.idle_timeout = idle_timeout
+        self._pools = {}
+        self._reaper = None
+        self.created = 0
+        self.closed = 0
+        self.acquisitions = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_connection_create_end.append(self._on_connection_created)
+        self.trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    def _create(self, proxy: str | None) -> aiohttp.TCPConnector:
+        kwargs = dict(
+            limit=0,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self.created += 1
+        return ProxyConnector.from_url(proxy, **kwargs) if proxy else aiohttp.TCPConnector(**kwargs)
+
+    def acquire(self, proxy: str | None) -> aiohttp.TCPConnector:
+        entry = self._pools.get(proxy)
+        if entry is None or entry["connector"].closed:
+            entry = self._pools[proxy] = {"connector": self._create(proxy), "users": 0, "last_used": monotonic()}
+
+        entry["users"] += 1
+        entry["last_used"] = monotonic()
+        self.acquisitions += 1
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap())
+        return entry["connector"]
+
+    def release(self, proxy: str | None):
+        entry = self._pools.get(proxy)
+        if entry is None:
+            return
+        entry["users"] = max(entry["users"] - 1, 0)
+        entry["last_used"] = monotonic()
+
+    async def close_idle(self, idle_timeout: float | None = None) -> int:
+        idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        now = monotonic()
+        closing = [proxy for proxy, entry in self._pools.items()
+                   if entry["users"] == 0 and now - entry["last_used"] >= idle_timeout]
+
+        for proxy in closing:
+            entry = self._pools.pop(proxy)
+            await entry["connector"].close()
+            self.closed += 1
+        return len(closing)
+
+    async def _reap(self):
+        while self._pools:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1))
+            await self.close_idle()
+
+    async def close(self):
+        for entry in self._pools.values():
+            await entry["connector"].close()
+        self._pools.clear()
+        if self._reaper is not None:
+            self._reaper.cancel()
+
+    def stats(self) -> dict:
+        pools = list(self._pools.values())
+        return {
+            "connectors": len(pools),
+            "users": sum(entry["users"] for entry in pools),
+            "acquisitions": self.acquisitions,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "created": self.created,
+            "closed": self.closed,
+        }
+
+
+connector_pool = ConnectorPool(
+    limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+    keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl=settings.HTTP_DNS_CACHE_TTL,
+    idle_timeout=settings.HTTP_IDLE_TIMEOUT,
+)
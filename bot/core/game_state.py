@@ -0,0 +1,109 @@
+import asyncio
+from time import monotonic
+
+from .models import TapInfo, to_int
+
+
+# Sections of the getGameInfo payload each mutating endpoint can change. The
+# coin balance is its own "balance" section: almost every call moves it, and
+# readers that don't need it shouldn't refetch because of that.
+MUTATING_ENDPOINTS = {
+    "/miniapps/api/user_game/collectCoin": ("balance", "gameInfo", "tapInfo"),
+    "/miniapps/api/user_game_level/upgradeLeve": ("balance", "tapInfo"),
+    "/miniapps/api/mine/upgrade": ("balance", "mineInfo"),
+    "/miniapps/api/sign/sign": ("balance",),
+    "/miniapps/api/task/finish_task": ("balance",),
+    "/miniapps/api/wallet/W70001To80001": ("balance",),
+    "/miniapps/api/mine_active/JoinMineAcctive": ("balance",),
+    "/miniapps/api/game_spin/Start": ("balance", "propInfo"),
+    "/miniapps/api/game_slot/start": ("balance", "propInfo"),
+}
+
+
+class GameState:
+    """Per-account cache of the getGameInfo response.
+
+    Readers name the sections they need; a cached payload is reused while it
+    is younger than `ttl` and none of those sections were touched by a
+    mutating call since. A mutation whose answer carries the new values of
+    a section (the coin balance of an upgrade, the energy and sequence
+    number of collectCoin) updates the cached payload instead of marking
+    that section stale. Concurrent readers share one in-flight request.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.data = None
+        self.fetched_at = 0.0
+        self.stale = set()
+        self.fetches = 0
+        self.hits = 0
+        self._generation = 0
+        self._inflight = None
+
+    def is_fresh(self, sections=None) -> bool:
+        if self.data is None or monotonic() - self.fetched_at > self.ttl:
+            return False
+        if sections is None:
+            return not self.stale
+        return self.stale.isdisjoint(sections)
+
+    def invalidate(self, endpoint=None, sections=None, data=None):
+        if endpoint is not None:
+            sections = MUTATING_ENDPOINTS.get(endpoint.split('?')[0])
+            if not sections:
+                return
+            sections = self.apply(sections, data)
+        if sections is None:
+            self.data = None
+            self.stale.clear()
+        else:
+            self.stale.update(sections)
+        self._generation += 1
+
+    def apply(self, sections, data) -> tuple:
+        # Returns the sections the answer did not carry new values for, those become stale
+        if self.data is None or not isinstance(data, dict):
+            return sections
+        updated = set()
+        coin = to_int(data.get('coin'), None)
+        if "balance" in sections and coin is not None:
+            self.data.coin = coin
+            updated.add("balance")
+        if "tapInfo" in sections:
+            if isinstance(data.get('tapInfo'), dict):
+                # An upgrade answer may carry only the upgraded boost, the others are kept
+                tap_info = TapInfo.parse(data['tapInfo'])
+                self.data.tap_info.boosts.update(tap_info.boosts)
+                if 'collectInfo' in data['tapInfo']:
+                    self.data.tap_info.collect_seq = tap_info.collect_seq
+                updated.add("tapInfo")
+            elif data.get('collectSeqNo') is not None:
+                self.data.tap_info.collect_seq = to_int(data['collectSeqNo'])
+                updated.add("tapInfo")
+        if "gameInfo" in sections and data.get('energySurplus') is not None and data.get('todayCollegeCoin') is not None:
+            self.data.left_energy = to_int(data['energySurplus'])
+            self.data.today_coin = to_int(data['todayCollegeCoin'])
+            updated.add("gameInfo")
+        return tuple(section for section in sections if section not in updated or section in self.stale)
+
+    async def get(self, fetch, sections=None):
+        if self.is_fresh(sections):
+            self.hits += 1
+            return self.data
+
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch(fetch))
+        return await asyncio.shield(self._inflight)
+
+    async def _fetch(self, fetch):
+        generation = self._generation
+        self.fetches += 1
+        data = await fetch()
+        if data:
+            self.data = data
+            self.fetched_at = monotonic()
+            # A mutation that landed while we were waiting keeps its sections stale
+            if generation == self._generation:
+                self.stale.clear()
+        return data
@@ -0,0 +1,181 @@
+import asyncio
+import random
+from collections import deque
+from email.utils import parsedate_to_datetime
+from time import monotonic, time
+
+from bot.config import settings
+
+
+class TokenBucket:
+    """Hands out `rate` permits per second, spaced evenly, with bursts of up to `capacity`.
+
+    Each caller reserves the next free slot and sleeps until it, so waiters
+    are served in arrival order without polling.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._next = monotonic()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = monotonic()
+        slot = max(self._next, now - (self.capacity - 1) / self.rate)
+        self._next = slot + 1 / self.rate
+        return max(slot - now, 0.0)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit for one endpoint, adjusted AIMD style.
+
+    Each successful call raises the limit by about one per `limit` calls;
+    an overload answer (5xx/429) halves it, at most once per `cooldown`
+    seconds so one burst of failures counts as a single signal. `pause`
+    holds every caller back, e.g. for a Retry-After.
+    """
+
+    def __init__(self, minimum: int, maximum: int, decrease: float = 0.5, cooldown: float = 2.0):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.overloads = 0
+        self._decreased_at = 0.0
+        self._waiters = deque()
+
+    async def acquire(self):
+        while True:
+            wait = self.blocked_until - monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            # Queued callers go first, a newcomer doesn't take a slot freed for them
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # Woken with a slot but cancelled before taking it, the slot goes to the next waiter
+                    self.in_flight -= 1
+                    self._wake()
+                raise
+            # _wake counted the slot for us; a pause that started meanwhile hands it back and waits again
+            if self.blocked_until <= monotonic():
+                return
+            self.in_flight -= 1
+            self._wake()
+
+    def release(self, overloaded: bool = False):
+        self.in_flight = max(self.in_flight - 1, 0)
+        now = monotonic()
+        if overloaded:
+            self.overloads += 1
+            if now - self._decreased_at >= self.cooldown:
+                self.limit = max(self.limit * self.decrease, self.minimum)
+                self._decreased_at = now
+        else:
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+        self._wake()
+
+    def pause(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+
+    def _wake(self):
+        # The slot is handed over on wake: the woken waiter is counted in flight right away
+        while self.in_flight < int(self.limit) and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class RetryBudget:
+    """Retries allowed across all accounts: `ratio` of first attempts plus `min_per_second`.
+
+    When the API is down, retries stop once the budget is spent instead of
+    multiplying the load, and they come back as normal traffic succeeds.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float = 1.0, capacity: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.denied = 0
+        self._updated_at = monotonic()
+
+    def deposit(self):
+        self.tokens = min(self.tokens + self.ratio, self.capacity)
+
+    def withdraw(self) -> bool:
+        now = monotonic()
+        self.tokens = min(self.tokens + (now - self._updated_at) * self.min_per_second, self.capacity)
+        self._updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.denied += 1
+        return False
+
+
+class EndpointLimiters:
+    """One AdaptiveLimiter per API path (query string ignored), created on first use."""
+
+    def __init__(self, minimum: int, maximum: int):
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limiters = {}
+
+    def get(self, endpoint: str) -> AdaptiveLimiter:
+        key = endpoint.split('?')[0]
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = AdaptiveLimiter(self.minimum, self.maximum)
+        return limiter
+
+    def stats(self) -> dict:
+        return {key: {"limit": int(limiter.limit), "in_flight": limiter.in_flight, "overloads": limiter.overloads}
+                for key, limiter in self._limiters.items()}
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    # Full jitter keeps accounts that failed together from retrying together
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after_seconds(headers) -> float | None:
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - time(), 0.0)
+
+
+api_limiters = EndpointLimiters(minimum=settings.API_CONCURRENCY[0], maximum=settings.API_CONCURRENCY[1])
+retry_budget = RetryBudget(ratio=settings.RETRY_BUDGET)
@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+
+
+def to_int(value, default: int = 0) -> int:
+    # The API sends numbers as ints, floats or strings, and sometimes null
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return default
+
+
+@dataclass(slots=True)
+class Boost:
+    """One tapInfo entry (tap, energy, recovery, bonusChance, bonusRatio)."""
+
+    level: int = 0
+    value: int = 0
+    next_cost: int | None = None
+
+    @classmethod
+    def parse(cls, data) -> "Boost | None":
+        if not isinstance(data, dict):
+            return None
+        next_cost = data.get('nextCostCoin')
+        return cls(
+            level=to_int(data.get('level')),
+            value=to_int(data.get('value')),
+            next_cost=to_int(next_cost, None) if next_cost is not None else None,
+        )
+
+
+# tapInfo entries a getGameInfo answer can't be used without
+TAP_ENTRIES = ('tap', 'energy', 'recovery', 'bonusChance', 'bonusRatio', 'collectInfo')
+
+
+@dataclass(slots=True)
+class TapInfo:
+    boosts: dict = field(default_factory=dict)
+    collect_seq: int = 0
+
+    @classmethod
+    def parse(cls, data) -> "TapInfo":
+        data = data if isinstance(data, dict) else {}
+        boosts = {name: boost for name, info in data.items() if name != 'collectInfo' and (boost := Boost.parse(info))}
+        return cls(boosts=boosts, collect_seq=to_int((data.get('collectInfo') or {}).get('collectSeqNo')))
+
+    def value(self, name: str) -> int:
+        boost = self.boosts.get(name)
+        return boost.value if boost else 0
+
+    @property
+    def tap(self) -> int:
+        return self.value('tap')
+
+    @property
+    def total_energy(self) -> int:
+        return self.value('energy')
+
+    @property
+    def recovery(self) -> int:
+        return self.value('recovery')
+
+    @property
+    def bonus_chance(self) -> int:
+        return self.value('bonusChance')
+
+    @property
+    def bonus_ratio(self) -> int:
+        return self.value('bonusRatio')
+
+
+@dataclass(slots=True)
+class GameInfo:
+    """The fields of a getGameInfo answer the bot uses, converted once.
+
+    Missing numbers default to 0, but a missing section or tapInfo entry
+    makes `parse` return None and the caller give up on the answer.
+    """
+
+    coin: int = 0
+    level: int = 0
+    today_coin: int = 0
+    today_coin_limit: int = 0
+    left_energy: int = 0
+    college_can_use: tuple = ()
+    mine_power: int = 0
+    offline_coin: int = 0
+    auto_click: bool = False
+    tap_info: TapInfo = field(default_factory=TapInfo)
+
+    @classmethod
+    def parse(cls, data: dict) -> "GameInfo | None":
+        game, mine, tap = data.get('gameInfo'), data.get('mineInfo'), data.get('tapInfo')
+        if not isinstance(game, dict) or not isinstance(mine, dict) or not isinstance(tap, dict):
+            return None
+        if not all(isinstance(tap.get(name), dict) for name in TAP_ENTRIES):
+            return None
+        return cls(
+            coin=to_int(game.get('coin')),
+            level=to_int(game.get('level')),
+            today_coin=to_int(game.get('todayCollegeCoin')),
+            today_coin_limit=to_int(game.get('todayMaxCollegeCoin')),
+            left_energy=to_int(game.get('energySurplus')),
+            college_can_use=tuple(game.get('collegeCanUse') or ()),
+            mine_power=to_int(mine.get('minePower')),
+            offline_coin=to_int(mine.get('mineOfflineCoin')),
+            auto_click=any(isinstance(prop, dict) and prop.get('source') == 'autoClick' for prop in data.get('propInfo') or ()),
+            tap_info=TapInfo.parse(tap),
+        )
+
+
+@dataclass(slots=True)
+class MineCard:
+    mine_id: int
+    level: int = 0
+    status: int = 1
+    cost: int = 0
+    reward: int = 0
+    next_reward: int = 0
+    title: str | None = None
+    desc: str | None = None
+
+    @classmethod
+    def parse(cls, data) -> "MineCard | None":
+        if not isinstance(data, dict) or data.get('mineId') is None or data.get('nextLevelCost') is None:
+            return None
+        return cls(
+            mine_id=to_int(data['mineId']),
+            level=to_int(data.get('level')),
+            status=to_int(data.get('status'), 1),
+            cost=to_int(data['nextLevelCost']),
+            reward=to_int(data.get('perHourReward')),
+            next_reward=to_int(data.get('nextPerHourReward')),
+            title=data.get('title') or data.get('name'),
+            desc=data.get('desc'),
+        )
+
+    @property
+    def reward_increase(self) -> int:
+        return self.next_reward - self.reward
+
+
+@dataclass(slots=True)
+class Task:
+    id: int
+    name: str = ""
+    reward: str = ""
+    task_type: str = ""
+    type: str = ""
+    classify: str = ""
+    jump_url: str = ""
+    finished: bool = False
+    qualify: bool = False
+    invite_count: int | None = None
+    limit_invite_count: int | None = None
+
+    @classmethod
+    def parse(cls, data: dict) -> "Task":
+        return cls(
+            id=data.get('id'),
+            name=data.get('name') or "",
+            reward=data.get('rewardParty') or "",
+            task_type=data.get('taskType') or "",
+            type=data.get('type') or "",
+            classify=data.get('classifyName') or "",
+            jump_url=data.get('jumpUrl') or "",
+            finished=data.get('isFinish') != 0,
+            qualify=data.get('qualify') == 1,
+            invite_count=to_int(data.get('InviteCount'), None),
+            limit_invite_count=to_int(data.get('limitInviteCount'), None),
+        )
+
+    @property
+    def available(self) -> bool:
+        # Open tasks of the kinds the bot knows how to finish
+        return (self.limit_invite_count == 0 and self.invite_count == 0 and not self.finished and self.qualify
+                and self.classify.lower() in ('youtube', 'partner task', 'welcome task', 'in-game tasks')
+                and self.task_type in ('level', 'pwd', 'nickname_check', 'normal'))
+
+
+@dataclass(slots=True)
+class SpinInfo:
+    stamina_now: int = 0
+    stamina_max: int | None = None
+
+    @classmethod
+    def parse(cls, data) -> "SpinInfo":
+        data = data if isinstance(data, dict) else {}
+        stamina_max = data.get('staminaMax')
+        return cls(stamina_now=to_int(data.get('staminaNow')), stamina_max=to_int(stamina_max, None) if stamina_max else None)
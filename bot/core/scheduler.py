@@ -0,0 +1,162 @@
+import asyncio
+import datetime
+import heapq
+import traceback
+from random import randint
+from time import time
+
+from bot.utils import logger
+from bot.utils.clock import current_slot
+
+
+class WorkerSlot:
+    """The scheduler slot held by one running job.
+
+    Only the job's own task can lend it (see Clock.sleep): tasks started by
+    the job inherit `current_slot` but must not give back a slot they don't
+    hold.
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore, task):
+        self.semaphore = semaphore
+        self.task = task
+        self.held = True
+
+    def release(self) -> bool:
+        if not self.held or asyncio.current_task() is not self.task:
+            return False
+        self.held = False
+        self.semaphore.release()
+        return True
+
+    async def acquire(self):
+        if self.held or asyncio.current_task() is not self.task:
+            return
+        await self.semaphore.acquire()
+        self.held = True
+
+
+class Scheduler:
+    """Runs every account from one dispatcher instead of one sleeping task per account.
+
+    Each account is a single heap entry keyed by the time its next phase is
+    due. The dispatcher sleeps until the earliest entry (or until a new one is
+    added) and hands due jobs to at most `workers` concurrent runs; a job
+    lends its slot to the next one while it sleeps inside the cycle. Lent
+    slots still leave at most `max_cycles` cycles in flight, each with its
+    own session and state. A job returns the seconds until it wants to run
+    again, or None to drop out. Jobs can be added while it runs; `close`
+    marks the end of additions.
+    """
+
+    def __init__(self, workers: int, max_cycles: int | None = None, quiet_hours=None, quiet_check=(3600, 7200)):
+        self.workers = workers
+        self.max_cycles = max(max_cycles or workers, workers)
+        self.quiet_hours = quiet_hours
+        self.quiet_check = quiet_check
+        self._heap = []
+        self._jobs = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(workers)
+        self._cycles = asyncio.Semaphore(self.max_cycles)
+        self._running = set()
+        self._tasks = set()
+        self.accepting = True
+        self.runs = 0
+        self.failures = 0
+
+    def add(self, key: str, job, delay: float = 0):
+        self._jobs[key] = job
+        self._push(key, time() + delay)
+
+    def remove(self, key: str):
+        self._jobs.pop(key, None)
+
+    def close(self):
+        # No more jobs will be added, run() returns once the current ones are done
+        self.accepting = False
+        self._wakeup.set()
+
+    def _push(self, key: str, due: float):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, key))
+        self._wakeup.set()
+
+    def _quiet_until(self, timestamp: float) -> float | None:
+        # Like the old per-account night loop: a due account inside quiet hours checks again after `quiet_check` seconds
+        if not self.quiet_hours:
+            return None
+
+        start, end = self.quiet_hours
+        hour = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).hour
+        inside = start <= hour < end if start <= end else hour >= start or hour < end
+        if not inside:
+            return None
+        return timestamp + randint(self.quiet_check[0], self.quiet_check[1])
+
+    async def _run_job(self, key: str):
+        job = self._jobs.get(key)
+        slot = WorkerSlot(self._slots, asyncio.current_task())
+        current_slot.set(slot)
+        try:
+            delay = await job()
+        except Exception as error:
+            self.failures += 1
+            logger.error(f"{key} | Unknown error: {error}")
+            traceback.print_exc()
+            delay = 3
+        finally:
+            slot.release()
+            self._cycles.release()
+            self._running.discard(key)
+
+        self.runs += 1
+        if delay is None:
+            self.remove(key)
+        elif key in self._jobs:
+            self._push(key, time() + delay)
+        self._wakeup.set()
+
+    async def run(self):
+        while self.accepting or self._jobs or self._running:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, key = self._heap[0]
+            now = time()
+            if due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if key not in self._jobs:
+                continue
+
+            resume = self._quiet_until(now)
+            if resume is not None:
+                logger.info(f"{key} | Night-Mode is on, next check-in on {round((resume - now) / 3600, 1)} hours.")
+                self._push(key, resume)
+                continue
+
+            await self._cycles.acquire()
+            await self._slots.acquire()
+            self._running.add(key)
+            task = asyncio.create_task(self._run_job(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> dict:
+        return {
+            "accounts": len(self._jobs),
+            "running": len(self._running),
+            "scheduled": len(self._heap),
+            "runs": self.runs,
+            "failures": self.failures,
+        }
@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import queue
+import sys
+import zlib
+from time import monotonic
+
+from bot.utils import logger
+
+
+def shard_accounts(accounts: list, workers: int) -> list:
+    # Hashing the session name keeps every account on the same worker across restarts. Empty
+    # shards are kept: a worker's index names its token file, so indices must not shift
+    shards = [[] for _ in range(workers)]
+    for account in accounts:
+        shards[zlib.crc32(account['session_name'].encode()) % workers].append(account)
+    return shards
+
+
+class Supervisor:
+    """Runs `target(index, shard, *args, events)` in one process per non-empty shard.
+
+    Workers send ("log", index, line) and ("status", index, dict) tuples on
+    the `events` queue; the supervisor prints their log lines, keeps the
+    last status of each and logs a fleet summary every `status_interval`
+    seconds. A worker exiting with an error is restarted after a backoff.
+    """
+
+    def __init__(self, target, shards: list, args=(), status_interval: float = 60, max_backoff: float = 60):
+        self.target = target
+        self.shards = shards
+        self.args = args
+        self.status_interval = status_interval
+        self.max_backoff = max_backoff
+        self.context = multiprocessing.get_context("spawn")
+        self.events = self.context.Queue()
+        self.processes = {}
+        self.started_at = {}
+        self.crashes = {}
+        self.restart_at = {}
+        self.status = {}
+        self.restarts = 0
+
+    def start(self, index: int):
+        process = self.context.Process(target=self.target, args=(index, self.shards[index], *self.args, self.events),
+                                       name=f"bums-worker-{index}", daemon=True)
+        process.start()
+        self.processes[index] = process
+        self.started_at[index] = monotonic()
+        logger.info(f"Worker <y>{index}</y> started with <y>{len(self.shards[index])}</y> accounts (pid {process.pid})")
+
+    def check(self):
+        now = monotonic()
+        for index, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+
+            del self.processes[index]
+            self.status.pop(index, None)
+            if process.exitcode == 0:
+                logger.info(f"Worker <y>{index}</y> finished, all its accounts stopped")
+                continue
+
+            # A worker that ran for a while before crashing starts over with a short backoff
+            if now - self.started_at[index] > self.max_backoff * 5:
+                self.crashes[index] = 0
+            self.crashes[index] = self.crashes.get(index, 0) + 1
+            delay = min(2 ** self.crashes[index], self.max_backoff)
+            self.restart_at[index] = now + delay
+            logger.error(f"Worker <y>{index}</y> exited with code <r>{process.exitcode}</r>, restarting in {delay} seconds")
+
+        for index, restart_at in list(self.restart_at.items()):
+            if restart_at <= now:
+                del self.restart_at[index]
+                self.restarts += 1
+                self.start(index)
+
+    def drain(self, timeout: float):
+        try:
+            kind, index, payload = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return
+
+        while True:
+            if kind == "log":
+                sys.stdout.write(payload)
+            elif kind == "status":
+                self.status[index] = payload
+            try:
+                kind, index, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+        sys.stdout.flush()
+
+    def summary(self) -> dict:
+        totals = {}
+        for status in self.status.values():
+            for key, value in status.items():
+                if isinstance(value, (int, float)):
+                    totals[key] = totals.get(key, 0) + value
+        return {"workers": len(self.processes), "restarts": self.restarts, **totals}
+
+    async def run(self):
+        for index, shard in enumerate(self.shards):
+            if shard:
+                self.start(index)
+
+        next_summary = monotonic() + self.status_interval
+        try:
+            while self.processes or self.restart_at:
+                await asyncio.to_thread(self.drain, 1.0)
+                self.check()
+
+                if monotonic() >= next_summary:
+                    next_summary = monotonic() + self.status_interval
+                    summary = self.summary()
+                    logger.info(" | ".join(f"{key}: <y>{value}</y>" for key, value in summary.items()))
+            self.drain(0.1)
+        finally:
+            self.stop()
+
+    def stop(self):
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=5)
+        self.processes.clear()
+        self.restart_at.clear()
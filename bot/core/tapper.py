@@ -1,1114 +1,1281 @@
-import asyncio
-import traceback
-import json
-import shutil
-import os
-import random
-import re
-import datetime
-import brotli
-import functools
-import string
-
-from typing import Callable
-from multiprocessing.util import debug
-from time import time
-from urllib.parse import unquote, quote
-
-import aiohttp
-from aiohttp_proxy import ProxyConnector
-from better_proxy import Proxy
-from pyrogram import Client
-from pyrogram.errors import (
-    Unauthorized, UserDeactivated, AuthKeyUnregistered, UserDeactivatedBan,
-    AuthKeyDuplicated, SessionExpired, SessionRevoked, FloodWait
-)
-from pyrogram.raw import types
-from pyrogram.raw import functions
-
-from bot.config import settings
-
-from bot.utils import logger
-from bot.exceptions import TelegramInvalidSessionException, TelegramProxyError
-from .headers import headers
-
-from random import randint
-
-from bot.utils.functions import card_details, tapHash, generate_taps, task_answer, combo_answer, count_spin, get_profit_card, fnum
-
-def error_handler(func: Callable):
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except Exception as e:
-            await asyncio.sleep(1)
-    return wrapper
-
-
-class Tapper:
-    def __init__(self, tg_client: Client, first_run: bool):
-        self.tg_client = tg_client
-        self.first_run = first_run
-        self.session_name = tg_client.name
-        self.main_bot_peer = 'bums'
-
-    async def get_tg_web_data(self, proxy: str | None) -> str:
-        if proxy:
-            proxy = Proxy.from_str(proxy)
-            proxy_dict = dict(
-                scheme=proxy.protocol,
-                hostname=proxy.host,
-                port=proxy.port,
-                username=proxy.login,
-                password=proxy.password
-            )
-        else:
-            proxy_dict = None
-
-        self.tg_client.proxy = proxy_dict
-
-        try:
-            if not self.tg_client.is_connected:
-                await self.tg_client.connect()
-            
-            while True:
-                try:
-                    peer = await self.tg_client.resolve_peer('bums')
-                    break
-                except FloodWait as fl:
-                    fls = fl.value
-
-                    logger.warning(f"{self.session_name} | FloodWait {fl}")
-                    logger.info(f"{self.session_name} | Sleep {fls}s")
-                    await asyncio.sleep(fls + 3)
-
-            ref_key = random.choice([settings.REF_KEY, "ref_3CcrQyaN"]) if settings.SUPPORT_AUTHOR else settings.REF_KEY
-            ref_id = ref_key.removeprefix("ref_")
-            
-            web_view = await self.tg_client.invoke(functions.messages.RequestAppWebView(
-                peer=peer,
-                app=types.InputBotAppShortName(bot_id=peer, short_name="app"),
-                platform='android',
-                write_allowed=True,
-                start_param=ref_key
-            ))
-
-            auth_url = web_view.url
-            tg_web_data = unquote(string=auth_url.split('tgWebAppData=')[1].split('&tgWebAppVersion')[0])
-
-            me = await self.tg_client.get_me()
-            self.tg_client_id = me.id
-            
-            if self.tg_client.is_connected:
-                await self.tg_client.disconnect()
-
-            return ref_id, tg_web_data
-
-        except (Unauthorized, UserDeactivated, AuthKeyUnregistered, UserDeactivatedBan, AuthKeyDuplicated,
-                SessionExpired, SessionRevoked):
-            raise TelegramInvalidSessionException(f"Telegram session is invalid. Client: {self.tg_client.name}")
-        except AttributeError as e:
-            raise TelegramProxyError(e)
-        except Exception as error:
-            logger.error(f"{self.session_name} | Unknown error during Authorization: {error}")
-            await asyncio.sleep(delay=3)
-            
-        finally:
-            if self.tg_client.is_connected:
-                await self.tg_client.disconnect()
-
-    @error_handler  
-    async def join_and_mute_tg_channel(self, link: str):
-        await asyncio.sleep(delay=random.randint(15, 30))
-        
-        if not self.tg_client.is_connected:
-            await self.tg_client.connect()
-    
-        try:
-            parsed_link = link if 'https://t.me/+' in link else link[13:]
-            
-            chat = await self.tg_client.get_chat(parsed_link)
-            
-            if chat.username:
-                chat_username = chat.username
-            elif chat.id:
-                chat_username = chat.id
-            else:
-                logger.error("Unable to get channel username or id")
-                return
-            
-            logger.info(f"{self.session_name} | Retrieved channel: <y>{chat_username}</y>")
-    
-            # Check if already a member
-            try:
-                await self.tg_client.get_chat_member(chat_username, "me")
-            except Exception as error:
-                if getattr(error, "ID", None) == 'USER_NOT_PARTICIPANT':
-                    # Join the channel if not a member
-                    await asyncio.sleep(delay=3)
-                    chat = await self.tg_client.join_chat(parsed_link)
-                    chat_id = chat.id
-                    logger.info(f"{self.session_name} | Successfully joined chat <y>{chat_username}</y>")
-                    
-                    # Wait before muting
-                    await asyncio.sleep(random.randint(5, 10))
-                    
-                    # Resolve the peer
-                    if chat.is_channel or chat.is_group:
-                        peer = types.InputPeerChannel(channel_id=chat.id, access_hash=chat.access_hash)
-                    else:
-                        logger.error(f"{self.session_name} | Unsupported chat type for {chat_username or chat_id}")
-                        return
-                    
-                    # Mute the chat
-                    await self.tg_client.invoke(functions.account.UpdateNotifySettings(
-                        peer=peer,
-                        settings=types.InputPeerNotifySettings(mute_until=2147483647)
-                    ))
-                    logger.info(f"{self.session_name} | Successfully muted chat <y>{chat_username}</y>")
-                else:
-                    logger.error(f"{self.session_name} | Error while checking channel: <y>{chat_username}</y>: {str(error)}")
-        except Exception as e:
-            logger.error(f"{self.session_name} | Error joining/muting channel {link}: {str(e)}")
-            await asyncio.sleep(delay=3)    
-        finally:
-            if self.tg_client.is_connected:
-                await self.tg_client.disconnect()
-            await asyncio.sleep(random.randint(10, 20))
-        
-    @error_handler
-    async def change_tg_name(self, name: str):
-        await asyncio.sleep(delay=random.randint(15, 30))
-        
-        if not self.tg_client.is_connected:
-            await self.tg_client.connect()
-    
-        try:
-            me = await self.tg_client.get_me()
-            current_first_name = me.first_name
-            current_last_name = me.last_name or ""
-            if name in current_last_name:
-                return
-            
-            updated_last_name = f"{current_last_name} {name}".strip()
-            await self.tg_client.update_profile(last_name=updated_last_name)
-            logger.info(f"{self.session_name} | Successfully updated last name to: <y>{current_first_name} {updated_last_name}</y>")
-        except Exception as e:
-            logger.error(f"{self.session_name} | Error updating last name: {str(e)}")
-        finally:
-            if self.tg_client.is_connected:
-                await self.tg_client.disconnect()
-            await asyncio.sleep(random.randint(10, 20))
-            
-    @error_handler
-    async def check_proxy(self, http_client: aiohttp.ClientSession, proxy: Proxy) -> None:
-        try:
-            response = await http_client.get(url='http://ip-api.com/json', timeout=aiohttp.ClientTimeout(20))
-            response.raise_for_status()
-
-            response_json = await response.json()
-            ip = response_json.get('query', 'N/A')
-            country = response_json.get('country', 'N/A')
-
-            logger.info(f"{self.session_name} | Proxy IP : {ip} | Proxy Country : {country}")
-        except Exception as error:
-            logger.error(f"{self.session_name} | Proxy: {proxy} | Error: {error}")
-                   
-    @error_handler
-    async def make_request(
-        self,
-        http_client: aiohttp.ClientSession,
-        method,
-        endpoint=None,
-        url=None,
-        extra_headers=None,
-        web_boundary=None,
-        json_data=None,
-        urlencoded_data=None,
-        **kwargs
-        ):
-        
-        full_url = url or f"https://api.bums.bot{endpoint or ''}"
-        
-        request_headers = http_client._default_headers.copy()
-        if extra_headers:
-            request_headers.update(extra_headers)
-            
-        if web_boundary:
-            boundary = "------WebKitFormBoundary" + ''.join(random.choices(string.ascii_letters + string.digits, k=16))
-            body = "\r\n".join(
-                f"{boundary}\r\nContent-Disposition: form-data; name=\"{key}\"\r\n\r\n{value}"
-                for key, value in web_boundary.items()
-            ) + f"\r\n{boundary}--\r\n"
-
-            request_headers["Content-Type"] = f"multipart/form-data; boundary=----{boundary.strip('--')}"
-            kwargs["data"] = body
-            
-        elif json_data is not None:
-            request_headers["Content-Type"] = "application/json"
-            kwargs["json"] = json_data
-
-        elif urlencoded_data is not None:
-            request_headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
-            kwargs["data"] = aiohttp.FormData(urlencoded_data)
-        
-        retries = 0
-        max_retries = settings.MAX_REQUEST_RETRY
-        
-        while retries < max_retries:
-            try:
-                response = await http_client.request(method, full_url, headers=request_headers, **kwargs)
-                response.raise_for_status()
-                
-                if settings.SAVE_RESPONSE_DATA:
-                    response_data = ""
-                    response_data += f"Timestamp: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                    response_data += f"Request URL: {full_url}\n"
-
-                    if method == 'POST':
-                        request_body = kwargs.get('json', None)
-                        if request_body is not None:
-                            response_data += f"Request Body (JSON): {json.dumps(request_body, indent=2)}\n\n"
-                        else:
-                            request_body = kwargs.get('data', None)
-                            if request_body is not None:
-                                response_data += f"Request Body (Data): {request_body}\n\n"
-
-                    response_data += f"Response Code: {response.status}\n"
-                    response_data += f"Response Headers: {dict(response.headers)}\n"
-                    response_data += f"Response Body: {await response.text()}\n"
-                    response_data += "-" * 50 + "\n"
-                    
-                    with open("saved_data.txt", "a", encoding='utf8') as file:
-                        file.write(response_data)
-                        
-                return await response.json()
-            except aiohttp.ClientResponseError as error:
-                
-                if settings.SAVE_RESPONSE_DATA:
-                    response_data = ""
-                    response_data += f"Timestamp: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                    response_data += f"Request URL: {full_url}\n"
-
-                    if method == 'POST':
-                        request_body = kwargs.get('json', None)
-                        if request_body is not None:
-                            response_data += f"Request Body (JSON): {json.dumps(request_body, indent=2)}\n\n"
-                        else:
-                            request_body = kwargs.get('data', None)
-                            if request_body is not None:
-                                response_data += f"Request Body (Data): {request_body}\n\n"
-
-                    response_data += f"Response Code: {error.status}\n"
-                    response_data += f"Response Headers: {dict(error.headers)}\n"
-                    response_data += f"Response Message: {await error.message}\n"
-                    response_data += "-" * 50 + "\n"
-                    
-                    with open("saved_data.txt", "a", encoding='utf8') as file:
-                        file.write(response_data)
-                        
-                if error.status == 503 or error.status == 500:
-                    retries += 1
-                    logger.warning(f"{self.session_name} | Received <r>{error.status}</r>, retrying {retries}/{max_retries}...")
-                    await asyncio.sleep(2 ** retries)
-                    continue
-                else:
-                    logger.error(f"{self.session_name} | HTTP error: {error}")
-                    raise
-            except (aiohttp.ClientError, Exception) as error:
-                logger.error(f"{self.session_name} | Unknown error when processing request: {error}")
-                raise
-        logger.error(f"{self.session_name} | Max retries reached for 'Server Un-Reachable' error.")
-        raise aiohttp.ClientResponseError(
-            request_info=None,
-            history=None,
-            status=503,
-            message="Max retries reached for 503 errors."
-        )
-        
-    @error_handler
-    async def login(self, http_client: aiohttp.ClientSession, ref_id, init_data):
-        additional_headers = {'Authorization': 'Bearer false'}
-        web_boundary = {
-            "invitationCode": ref_id,
-            "initData": init_data
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user/telegram_auth", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response and response.get("data", {}).get("token"):
-            return response
-        return None
-
-    @error_handler
-    async def user_data(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/user_game_level/getGameInfo", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def upgrade_tap(self, http_client: aiohttp.ClientSession, auth_token, card_type):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "type": card_type
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user_game_level/upgradeLeve", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def get_tap_cards(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine/getMineLists", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def upgrade_mine(self, http_client: aiohttp.ClientSession, auth_token, mineId):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "mineId": mineId
-        }
-        
-        retries = 0
-        while retries < 10:
-            response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine/upgrade", extra_headers=additional_headers, web_boundary=web_boundary)
-            
-            if response.get('code') == -1 and response.get('msg') == 'Insufficient balance':
-                retries += 1
-                continue
-            
-            if response.get('code') == 0 and response.get('msg') == 'OK':
-                return response
-            
-            logger.error(f"{self.session_name} | Error in upgrading... Retrying ({retries}/10)")
-            await asyncio.sleep(random.randint(5, 10))
-            
-        return None
-    
-    @error_handler
-    async def sign_in_data(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/sign/getSignLists", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def sign_in(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "": "undefined"
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/sign/sign", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def get_tap_info(self, http_client: aiohttp.ClientSession, auth_token):
-        user_data = await self.user_data(http_client, auth_token=auth_token)
-    
-        if not user_data or user_data.get('code') != 0:
-            logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
-            return None
-    
-        try:
-            prop_info = user_data['data'].get('propInfo')
-            auto_click = False
-            if prop_info:
-                auto_click = any(prop.get('source') == 'autoClick' for prop in prop_info)
-            tap_data = {
-                "balance": int(user_data['data']['gameInfo'].get('coin', 0)),
-                "todayCoin": int(user_data['data']['gameInfo'].get('todayCollegeCoin', 0)),
-                "todayCoinLimit": int(user_data['data']['gameInfo'].get('todayMaxCollegeCoin', 0)),
-                "leftEnergy": int(user_data['data']['gameInfo'].get('energySurplus', 0)),
-                "totalEnergy": int(user_data['data']['tapInfo']['energy'].get('value', 0)),
-                "recovery": int(user_data['data']['tapInfo']['recovery'].get('value', 0)),
-                "tap": int(user_data['data']['tapInfo']['tap'].get('value', 0)),
-                "bonusChance": int(user_data['data']['tapInfo']['bonusChance'].get('value', 0)),
-                "bonusRatio": int(user_data['data']['tapInfo']['bonusRatio'].get('value', 0)),
-                "collectSeqNo": int(user_data['data']['tapInfo']['collectInfo'].get('collectSeqNo', 0)),
-                "autoClick": auto_click
-            }
-        except (KeyError, TypeError, ValueError) as e:
-            logger.error(f"{self.session_name} | Error parsing tap data: {e}")
-            return None
-    
-        return tap_data
-    
-    @error_handler
-    async def submit_taps(self, http_client: aiohttp.ClientSession, auth_token, collect_seq, taps_amount, hashCode):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "hashCode": hashCode,
-            "collectSeqNo": collect_seq,
-            "collectAmount": taps_amount
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user_game/collectCoin", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def get_tasklist(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/task/lists", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def done_task(self, http_client: aiohttp.ClientSession, auth_token, task_id, pwd=None):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        urlencoded_data = {
-            "id": task_id
-        }
-        if pwd:
-            urlencoded_data["pwd"] = pwd
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/task/finish_task", extra_headers=additional_headers, urlencoded_data=urlencoded_data)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def get_refer_wallet(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/wallet/balance", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def collect_refer_wallet(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "": "undefined"
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/wallet/W70001To80001", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def get_gang_list(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "boostNum": 100,
-            "powerNum": 0
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/gang/gang_lists", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def join_gang(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "name": settings.GANG_USERNAME
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/gang/gang_join", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def combo_details(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/mine_active/getMineAcctiveInfo", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK' and int(response['data'].get('resultNum')) > 0:
-            return response
-        return None
-    
-    @error_handler
-    async def submit_combo(self, http_client: aiohttp.ClientSession, auth_token, one, two, three):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "cardIdStr": f"{one},{two},{three}"
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine_active/JoinMineAcctive", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def box_info(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/prop_shop/Lists?showPages=spin&page=1&pageSize=10", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def open_box(self, http_client: aiohttp.ClientSession, auth_token, count, prop_id):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "count": count,
-            "propId": prop_id
-        }
-
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/game_spin/Start", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('rewardLists'):
-            return response
-        return None
-    
-    @error_handler
-    async def spin_info(self, http_client: aiohttp.ClientSession, auth_token):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        
-        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/game_slot/stamina", extra_headers=additional_headers)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-    
-    @error_handler
-    async def start_spin(self, http_client: aiohttp.ClientSession, auth_token, count):
-        additional_headers = {'Authorization': 'Bearer ' + auth_token}
-        web_boundary = {
-            "count": count
-        }
-        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/game_slot/start", extra_headers=additional_headers, web_boundary=web_boundary)
-        if response.get('code') == 0 and response.get('msg') == 'OK':
-            return response
-        return None
-
-    async def run(self, user_agent: str, proxy: str | None) -> None:
-        proxy_conn = ProxyConnector().from_url(proxy) if proxy else None
-        headers["User-Agent"] = user_agent
-
-        async with aiohttp.ClientSession(headers=headers, connector=proxy_conn, trust_env=True) as http_client:
-            if proxy:
-                await self.check_proxy(http_client=http_client, proxy=proxy)
-
-            delay = randint(settings.START_DELAY[0], settings.START_DELAY[1])
-            logger.info(f"{self.session_name} | Starting in {delay} seconds")
-            await asyncio.sleep(delay=delay)
-            
-            while True:
-                try:
-                    if settings.NIGHT_MODE:
-                        current_utc_time = datetime.datetime.utcnow().time()
-
-                        start_time = datetime.time(settings.NIGHT_TIME[0], 0)
-                        end_time = datetime.time(settings.NIGHT_TIME[1], 0)
-
-                        next_checking_time = randint(settings.NIGHT_CHECKING[0], settings.NIGHT_CHECKING[1])
-
-                        if start_time <= current_utc_time <= end_time:
-                            logger.info(f"{self.session_name} | Night-Mode is on, The current UTC time is {current_utc_time.replace(microsecond=0)}, next check-in on {round(next_checking_time / 3600, 1)} hours.")
-                            await asyncio.sleep(next_checking_time)
-                            continue
-
-                    sleep_time = randint(settings.SLEEP_TIME[0], settings.SLEEP_TIME[1])
-                    
-                    try:
-                        ref_id, init_data = await self.get_tg_web_data(proxy=proxy)
-                    except TelegramProxyError:
-                        return logger.error(f"<r>The selected proxy cannot be applied to the Telegram client.</r>")
-                    except Exception as e:
-                        return logger.error(f"Stop Tapper. Reason: {e}")
-            
-                    logger.info(f"{self.session_name} | Trying to login")
-                    
-                    # Login
-                    login_data = await self.login(http_client, ref_id=ref_id, init_data=init_data)
-                    if not login_data:
-                        logger.error(f"{self.session_name} | Login Failed")
-                        logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                        await asyncio.sleep(delay=sleep_time)
-                        continue
-                    
-                    auth_token = login_data.get("data", {}).get("token")
-                    
-                    logger.success(f"{self.session_name} | <g>📦 Login Successful</g>")
-                    
-                    # User-Data
-                    user_data = await self.user_data(http_client, auth_token=auth_token)
-                    if not user_data:
-                        logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
-                        logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                        await asyncio.sleep(delay=sleep_time)
-                        break
-                    
-                    coin = int(user_data['data']['gameInfo'].get('coin')) or 0
-                    
-                    current_level = user_data['data']['gameInfo'].get('level') or 0
-                    profit_hour = user_data['data']['mineInfo'].get('minePower') or 0
-                    offline_bonus = int(user_data['data']['mineInfo'].get('mineOfflineCoin'))
-                    
-                    logger.info(f"{self.session_name} | Balance: <y>{fnum(coin - offline_bonus)}</y> | Level: <y>{current_level}</y> | Profit Per Hour: <y>{fnum(profit_hour)}</y>")
-                    
-                    if offline_bonus > 0:
-                        logger.success(f"{self.session_name} | Offline Bonus: <g>+{fnum(offline_bonus)}</g> | Updated Balance: <y>{fnum(coin)}</y>")
-                        
-                    await asyncio.sleep(random.randint(1, 3))
-                    
-                    # Sign-In (Check-In)
-                    if settings.AUTO_SIGN_IN:
-                        signin_data = await self.sign_in_data(http_client, auth_token=auth_token)
-                        if not signin_data:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Check-In Data!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            break
-                        
-                        lists = signin_data['data']['lists']
-                        sign_status = signin_data['data']['signStatus']
-
-                        if sign_status == 0:
-                            for item in lists:
-                                if item["status"] == 0:
-                                    day_reward = item["normal"]
-                                    current_day = item["daysDesc"]
-                                    make_signin = await self.sign_in(http_client, auth_token=auth_token)
-                                    if make_signin:
-                                        logger.success(f"{self.session_name} | Successful Sign-In <y>{current_day}</y>: <g>+{fnum(day_reward)}</g>")
-                                    continue
-                                
-                        await asyncio.sleep(random.randint(1, 3))
-                    
-                    # Refer Collect
-                    if settings.COLLECT_REFER_BALANCE:
-                        refer_balance = await self.get_refer_wallet(http_client, auth_token=auth_token)
-                        if not refer_balance:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Refer Data!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            break
-                        
-                        refer_wallet = refer_balance.get("data", {}).get("lists", [])
-                        for item in refer_wallet:
-                            if item['id'] == 70001:
-                                main_balance = int(item['availableAmount'])
-                                freeze_balance = int(item['freezeAmount'])
-
-                                if main_balance > 0 and main_balance - freeze_balance > 0:
-                                    logger.info(f"{self.session_name} | Refer Wallet Balance : <y>{main_balance}</y> | Freeze Refer Balance : <y>{freeze_balance}</y>")
-                                    logger.info(f"{self.session_name} | Collecting Refer Balance...")
-    
-                                    collect_refer = await self.collect_refer_wallet(http_client, auth_token=auth_token)
-                                    if not collect_refer:
-                                        logger.error(f"{self.session_name} | Unknown error while collecting Refer Balance!")
-                                        logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                        await asyncio.sleep(delay=sleep_time)
-                                        break
-                                    
-                                    if collect_refer:
-                                        logger.success(f"{self.session_name} | Refer Balance Collected: <g>+{main_balance - freeze_balance}</g>")
-                            
-                        await asyncio.sleep(random.randint(1, 3))
-                    
-                    # Auto Open Free Box
-                    if settings.AUTO_OPEN_FREE_BOX:
-                        box_info = await self.box_info(http_client, auth_token=auth_token)
-                        if not box_info:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Box Info!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            break
-                        
-                        box_list = box_info.get("data", {})
-                        for box in box_list:
-                            if box.get("propId") == 500010001:
-                                usage = box.get("toDayUse")
-                                max_use = int(box.get("toDayMaxUseNum"))
-                                today_use = int(box.get("toDayNowUseNum"))
-                                if usage == False and today_use < max_use:
-                                    open_box = await self.open_box(http_client, auth_token=auth_token, count=1, prop_id=500010001)
-                                    if not open_box:
-                                        logger.error(f"{self.session_name} | Unknown error while Opening Box!")
-                                        logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                        await asyncio.sleep(delay=sleep_time)
-                                        continue
-                                    fb_name = open_box['rewardLists'][0].get('name')
-                                    logger.success(f"{self.session_name} | Free Box Opened: <y>500010001</y> | Prize: <g>{fb_name}</g>")
-                                    
-                        await asyncio.sleep(random.randint(1, 3))
-                        
-                    # Auto Tap
-                    if settings.AUTO_TAP:
-                        tapData = await self.get_tap_info(http_client, auth_token=auth_token)
-                        coin = tapData['balance']
-                        tap_value = tapData['tap']
-                        today_coin_limit = tapData['todayCoinLimit']
-                        today_tap_done = tapData['todayCoin']
-                        energy_left = tapData['leftEnergy']
-                        total_energy = tapData['totalEnergy']
-                        recovery = tapData['recovery']
-                        bonus_chance = tapData['bonusChance']
-                        bonus_multiplier = tapData['bonusRatio']
-                        collect_seq = tapData['collectSeqNo']
-                        auto_clicker = tapData['autoClick']
-                        
-                        logger.info(f"{self.session_name} | Starting Auto-Taps...")
-                        
-                        while energy_left > 1:
-                            if auto_clicker:
-                                logger.info(f"{self.session_name} | Auto-clicker detected. Skipping Auto-Taps...")
-                                break
-                        
-                            if today_tap_done > today_coin_limit:
-                                logger.warning(f"{self.session_name} | Today Tap limit is over, Skipping.")
-                                break
-                        
-                            total_taps = random.randint(settings.TAPS_PER_BATCH[0], settings.TAPS_PER_BATCH[1])
-                            taps_amount = 0
-                            for _ in range(total_taps):
-                                taps_amount += generate_taps(tap_value, energy_left, bonus_chance, bonus_multiplier)
-                            if taps_amount > 0 and taps_amount <= energy_left:
-                                hashCode = tapHash(taps_amount=taps_amount, collect_seq=collect_seq)
-                                post_taps = await self.submit_taps(http_client, auth_token=auth_token, collect_seq=collect_seq, taps_amount=taps_amount, hashCode=hashCode)
-                                if post_taps:
-                                    tapData = await self.get_tap_info(http_client, auth_token=auth_token)
-                                    energy_left = tapData['leftEnergy']
-                                    today_tap_done = tapData['todayCoin']
-                                    collect_seq = tapData['collectSeqNo']
-                                    logger.success(f"{self.session_name} | Tapped <y>x{total_taps}</y>: <g>+{fnum(taps_amount)}</g> | Balance: <y>{fnum(post_taps['data'].get('coin'))}</y> | Energy: <y>({energy_left}/{total_energy})</y>")
-                                    await asyncio.sleep(random.randint(settings.DELAY_BETWEEN_TAPS[0], settings.DELAY_BETWEEN_TAPS[1]))
-                                else:
-                                    logger.error(f"{self.session_name} | Unknown error while tapping, Skipping taps!")
-                                    break
-                            else:
-                                logger.warning(f"{self.session_name} | Insufficient energy for tap amount: <y>({energy_left}/{total_energy})</y>")
-                                break
-                            
-                            if energy_left <= 0:
-                                logger.error(f"{self.session_name} | Left energy depleted, Skipping Auto-Taps!")
-                                break
-                        
-                        await asyncio.sleep(random.randint(1, 3))
-
-                    # Auto Task
-                    if settings.AUTO_TASK:
-                        logger.info(f"{self.session_name} | Checking available task...")
-                        task_list = await self.get_tasklist(http_client, auth_token=auth_token)
-
-                        if not task_list:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Task-List!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            return
-                    
-                        tasks = task_list.get("data", {}).get("lists", [])
-
-                        filtered_tasks = [
-                            task for task in tasks
-                            if task.get("limitInviteCount") == 0 and 
-                               task.get("InviteCount") == 0 and 
-                               task.get("isFinish") == 0 and 
-                               task.get("qualify") == 1 and
-                               task.get("classifyName", "").lower() in ['youtube', 'partner task', 'welcome task', 'in-game tasks'] and
-                               task.get("taskType") in ['level', 'pwd', 'nickname_check', 'normal']
-                        ]
-
-
-                        if not filtered_tasks:
-                            logger.info("Task Not Found")
-                            return
-
-                        for task in filtered_tasks:
-                            task_id = task.get("id")
-                            task_name = task.get("name", "")
-                            task_reward = task.get("rewardParty", "")
-                            task_type = task.get("taskType")
-                            task_classify = task.get("classifyName")
-                            jump_url = task.get("jumpUrl", "")
-
-                            if task.get("type") == "open_link" and task_type == "normal" and re.match(r"https?:\/\/(?:t\.me|telegram\.me|telegram\.dog)\/(?:[a-zA-Z0-9_]{4,32}|\+[a-zA-Z0-9_-]{08,18})", jump_url):
-                                if any(keyword in task_name for keyword in ["Subscribe", "Join", "Follow"]):
-                                    if settings.AUTO_JOIN_CHANNELS:
-                                        await self.join_and_mute_tg_channel(link=jump_url)
-                                        await asyncio.sleep(random.randint(5, 10))
-
-                            if task.get("type") == "open_link" and task_type == "nickname_check":
-                                if settings.AUTO_NAME_CHANGE:
-                                    await self.change_tg_name(name='📦 Bums')
-                                    await asyncio.sleep(random.randint(5, 10))
-                                    data_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id)
-                                    if data_done:
-                                        logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
-                                continue
-
-                            if task_classify.lower() == "youtube" and task_type == "pwd":
-                                utube_code = task_answer(task_name=task_name, method='get-code')
-                                if utube_code:
-                                    utube_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id, pwd=utube_code)
-                                    if utube_done:
-                                        logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
-                                continue
-                            
-                            data_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id)
-                            if data_done:
-                                logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
-                
-                        await asyncio.sleep(random.randint(1, 5))
-                        
-                    await asyncio.sleep(random.randint(1, 3))
-                    
-                    # Update Tap-Cards
-                    if settings.AUTO_UPGRADE_TAP_CARDS:
-                        logger.info(f"{self.session_name} | Updating Tap-Cards...")
-                        upgrades = {
-                            "bonusChance": {"level": "jackpot_level", "max_level": settings.JACKPOT_LEVEL},
-                            "bonusRatio": {"level": "crit_multiplier_level", "max_level": settings.CRIT_LEVEL},
-                            "energy": {"level": "max_energy_level", "max_level": settings.ENERGY_LEVEL},
-                            "tap": {"level": "tap_reward_level", "max_level": settings.TAP_LEVEL},
-                            "recovery": {"level": "energy_regen_level", "max_level": settings.ENERGY_REGEN_LEVEL}
-                        }
-
-                        while True:
-                            user_data = await self.user_data(http_client, auth_token=auth_token)
-                            if not user_data:
-                                logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-                            
-                            coin = int(user_data['data']['gameInfo'].get('coin') or 0)
-                            profit_hour = int(user_data['data']['mineInfo'].get('minePower')  or 0)
-                            current_level = user_data['data']['gameInfo'].get('level') or 0
-                            tap_info = user_data['data']['tapInfo']
-                            
-                            upgrade_made = False
-                            for card_type, data in upgrades.items():
-                                level = int(tap_info[card_type].get('level'))
-                                price = int(tap_info[card_type].get('nextCostCoin'))
-                                max_level = data["max_level"]
-
-                                if level < max_level and coin >= price:
-                                    upgrade_tap = await self.upgrade_tap(http_client, auth_token=auth_token, card_type=card_type)
-                                    if upgrade_tap:
-                                        card_name = card_details(card_type)
-                                        logger.success(f"{self.session_name} | '{card_name[0]}' upgraded: <e>{level + 1}</e>, <r>-{fnum(price)}</r>")
-                                        upgrade_made = True
-                                    break
-                                
-                                await asyncio.sleep(random.randint(3, 10))
-                                
-                            if not upgrade_made:
-                                all_upgraded = all(int(tap_info[card]["level"]) >= upgrades[card]["max_level"] for card in upgrades)
-                                if all_upgraded:
-                                    logger.success(f"{self.session_name} | All Tap-Cards upgraded!")
-                                    logger.info(f"{self.session_name} | Updated Balance: <y>{fnum(coin)}</y> | Updated Level: <y>{current_level}</y>")
-                                else:
-                                    logger.info(f"{self.session_name} | Insufficient Balance to keep upgrading.")
-                                    logger.info(f"{self.session_name} | Updated Balance: <y>{fnum(coin)}</y> | Updated Level: <y>{current_level}</y>")
-                                break
-                            
-                        await asyncio.sleep(random.randint(1, 3))
-
-                    # Update Mine-Cards
-                    if settings.AUTO_UPGRADE_MINE_CARDS:
-                        logger.info(f"{self.session_name} | Updating Mine-Cards...")
-                        while True:
-                            mine_data = await self.get_tap_cards(http_client, auth_token=auth_token)
-                            if not mine_data:
-                                logger.error(f"{self.session_name} | Unknown error while collecting Mine List!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-
-                            mine_list = mine_data['data']['lists']
-
-                            user_data = await self.user_data(http_client, auth_token=auth_token)
-                            if not user_data:
-                                logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-
-                            coin = int(user_data['data']['gameInfo'].get('coin') or 0)
-                            current_level = user_data['data']['gameInfo'].get('level') or 0
-                            profit_hour = user_data['data']['mineInfo'].get('minePower') or 0
-
-                            upgrades_done = False
-
-                            if settings.PROFIT_UPGRADE:
-                                allowed_cards = []
-                                for mine in mine_list:
-                                    next_level_cost = int(mine['nextLevelCost'])
-                                    status = int(mine['status'])
-                                    mine_id = int(mine['mineId'])
-
-                                    if next_level_cost <= coin and next_level_cost <= settings.MAX_CARD_PRICE_PURCHASE and status == 1:
-                                        allowed_cards.append(mine)
-                                if allowed_cards:
-                                    profit_card = await get_profit_card(cards=allowed_cards)
-                                    if profit_card:
-                                        mine_id = profit_card["mineId"]
-                                        next_level_cost = profit_card["nextLevelCost"]
-                                        mine_level = int(profit_card['level'])
-                                        
-                                        mine_card = card_details(mine_id)
-                                        
-                                        upgrade_card = await self.upgrade_mine(http_client, auth_token=auth_token, mineId=mine_id)
-                                        
-                                        if upgrade_card:
-                                            logger.success(f"{self.session_name} | '{mine_card[0]}' upgraded: <e>{mine_level + 1}</e>, <r>-{fnum(next_level_cost)}</r>")
-                                            upgrades_done = True
-
-                            else:
-                                for mine in mine_list:
-                                    next_level_cost = int(mine['nextLevelCost'])
-                                    status = int(mine['status'])
-                                    mine_id = int(mine['mineId'])
-                                    mine_level = int(mine['level'])
-                                    
-                                    mine_card = card_details(mine_id)
-                                    if next_level_cost <= coin and next_level_cost <= settings.MAX_CARD_PRICE_PURCHASE and status == 1:
-                                        upgrade_card = await self.upgrade_mine(http_client, auth_token=auth_token, mineId=mine_id)
-                                        
-                                        if upgrade_card:
-                                            logger.success(f"{self.session_name} | '{mine_card[0]}' upgraded: <e>{mine_level + 1}</e>, <r>-{fnum(next_level_cost)}</r>")
-                                            upgrades_done = True
-
-                            if not upgrades_done:
-                                logger.info(f"{self.session_name} | No more upgrades possible. Stopping process.")
-                                logger.info(f"{self.session_name} | Updated Balance: <y>{fnum(coin)}</y> | Updated Level: <y>{current_level}</y> | Updated Profit/Hour: <y>{fnum(profit_hour)}</y>")
-                                break
-
-                            await asyncio.sleep(random.randint(3, 10))
-
-                        await asyncio.sleep(random.randint(1, 3))
-
-                    # Join Gang
-                    if settings.JOIN_GANG:
-                        gang_list = await self.get_gang_list(http_client, auth_token=auth_token)
-                        if not gang_list:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Gang-List!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            continue
-                        
-                        my_gang = gang_list['data']['myGang'].get('gangId') or None
-                        if my_gang is None:
-                            logger.success(f"{self.session_name} | Joining Gang...")
-                            
-                            join_gang = await self.join_gang(http_client, auth_token=auth_token)
-                            if not join_gang:
-                                logger.error(f"{self.session_name} | Unknown error while Joining Gang!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-                            logger.success(f"{self.session_name} | Gang joined successfully!")
-                            
-                        await asyncio.sleep(random.randint(1, 3))
-
-                    # Auto Solve Combos
-                    if settings.SOLVE_COMBO:
-                        user_data = await self.user_data(http_client, auth_token=auth_token)
-                        if not user_data:
-                            logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            continue
-                        
-                        if "Lottery" in user_data["data"]["gameInfo"]["collegeCanUse"]:
-                            combo_available = await self.combo_details(http_client, auth_token=auth_token)
-                            if combo_available:
-                                reward = combo_available['data'].get('rewardNum')
-                                combo_data = combo_answer(method='get')
-                                if combo_data:
-                                    await asyncio.sleep(random.randint(1, 3))
-                                    logger.info(f"{self.session_name} | Checking Combo...")
-                                    solve_combo = await self.submit_combo(http_client, auth_token=auth_token, one=combo_data[0], two=combo_data[1], three=combo_data[2])
-                                    if not solve_combo:
-                                        logger.error(f"{self.session_name} | Unknown error while solving Combo!")
-                                        logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                        await asyncio.sleep(delay=sleep_time)
-                                        continue
-                                    answer_status = solve_combo['data'].get('status')
-                                    if answer_status == 0:
-                                        logger.success(f"{self.session_name} | Combo solved: <g>+{reward}</g>")
-                                    else:
-                                        attempt_left = solve_combo['data'].get('resultNum')
-                                        combo_answer(method='wrong')
-                                        logger.error(f"{self.session_name} | Combo is wrong, Left Chance: <r>{attempt_left}</r>. Edit 'combo.json' with valid combo.")
-                                else:
-                                    logger.error(f"{self.session_name} | Skipping Combo, Combo is empty or invalid. Edit 'combo.json' with correct answers!")
-                        else:
-                            logger.error(f"{self.session_name} | Skipping Combo, Combo (Lottery) is currently locked!")
-                            
-
-                        await asyncio.sleep(random.randint(1, 3))
-                        
-                    # Auto Spins
-                    if settings.AUTO_SPINS:
-                        spin_info = await self.spin_info(http_client, auth_token=auth_token)
-                        if not spin_info:
-                            logger.error(f"{self.session_name} | Unknown error while collecting Spin Info!")
-                            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                            await asyncio.sleep(delay=sleep_time)
-                            continue
-                        
-                        spin_count = settings.SPIN_COUNT
-                        total_spins = int(spin_info.get('data', {}).get('staminaNow')) or 0
-                        max_spins = spin_info.get('data', {}).get('staminaMax') or 'NaN'
-                        
-                        if total_spins > 0:
-                            logger.info(f"{self.session_name} | Total Spins: <y>({total_spins}/{max_spins})</y>, Spinning...")
-                        
-                        while total_spins > 0:
-                            if spin_count > total_spins:
-                                spin_count = count_spin(total_spins)
-                                
-                            spin_data = await self.start_spin(http_client, auth_token=auth_token, count=spin_count)
-                            if not spin_data:
-                                logger.error(f"{self.session_name} | Unknown error while collecting Spin Data!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-                            
-                            spin_reward = (spin_data.get('data', {}).get('rewardLists', {}).get('rewardList', [{}])[0].get('name') or 'None')
-                            
-                            logger.success(f"{self.session_name} | Spin Reward: <g>{spin_reward}</g>")
-                            
-                            spin_info = await self.spin_info(http_client, auth_token=auth_token)
-                            if not spin_info:
-                                logger.error(f"{self.session_name} | Unknown error while collecting Spin Info!")
-                                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                                await asyncio.sleep(delay=sleep_time)
-                                continue
-                            
-                            total_spins = int(spin_info.get('data', {}).get('staminaNow')) or 0
-                            await asyncio.sleep(random.randint(2, 8))
-                        
-                        await asyncio.sleep(random.randint(1, 3))
-                        
-                    logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                    await asyncio.sleep(delay=sleep_time)
-
-                except Exception as error:
-                    logger.error(f"{self.session_name} | Unknown error: {error}")
-                    traceback.print_exc()
-                    await asyncio.sleep(delay=3)
-
-async def run_tapper(tg_client: Client, user_agent: str, proxy: str | None, first_run: bool):
-    try:
-        await Tapper(tg_client=tg_client, first_run=first_run).run(user_agent=user_agent, proxy=proxy)
-    except TelegramInvalidSessionException:
-        session_file = f"sessions/{tg_client.name}.session"
-        if not os.path.exists("sessions/deleted_sessions"):
-            os.makedirs("sessions/deleted_sessions", exist_ok=True)
-        shutil.move(session_file, f"sessions/deleted_sessions/{tg_client.name}.session")
-        logger.error(f"Telegram account {tg_client.name} is not work!")
+import asyncio
+import json
+import shutil
+import os
+import random
+import re
+import datetime
+import brotli
+import functools
+import string
+
+from typing import Callable
+from multiprocessing.util import debug
+from time import monotonic, time
+from urllib.parse import unquote, quote, parse_qs, urlsplit
+
+import aiohttp
+from better_proxy import Proxy
+from pyrogram import Client
+from pyrogram.errors import (
+    Unauthorized, UserDeactivated, AuthKeyUnregistered, UserDeactivatedBan,
+    AuthKeyDuplicated, SessionExpired, SessionRevoked, FloodWait
+)
+from pyrogram.raw import types
+from pyrogram.raw import functions
+
+from bot.config import settings
+
+from bot.utils import logger
+from bot.exceptions import TelegramInvalidSessionException, TelegramProxyError, NeedReLoginError, AuthError
+from .connector_pool import connector_pool
+from .limiter import api_limiters, retry_budget, backoff_delay, retry_after_seconds
+from .game_state import GameState
+from .models import GameInfo, MineCard, Task, SpinInfo, to_int
+from .tg_pool import tg_pool
+from .headers import headers
+
+from random import randint
+
+from bot.utils.card_catalog import card_catalog
+from bot.utils.clock import clock
+from bot.utils.metrics import (
+    api_request_seconds, api_retries, api_errors, telegram_rpc_seconds, phase_active, phase_seconds,
+    account_mine_profit, account_coins
+)
+from bot.utils.recorder import recorder
+from bot.utils.token_cache import token_cache
+from bot.utils.tracing import tracer
+from bot.utils.planner import MineUpgradePlanner, TapUpgradePlanner
+from bot.utils.taps import plan_tap_batches, next_tap_wakeup, TapState
+from bot.utils.functions import card_details, tapHash, task_answer, combo_answer, count_spin, fnum, seconds_until_daily_reset
+
+def error_handler(func: Callable):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except NeedReLoginError:
+            raise
+        except Exception as e:
+            await clock.sleep(1)
+    return wrapper
+
+
+# Answers that mean the server is overloaded, retried within the fleet retry budget
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Longest wait between logins while the API keeps answering 401
+RELOGIN_BACKOFF_CAP = 900
+
+
+# Cycle phases in the order they run, with the setting that enables each
+PHASES = {
+    "sign_in": "AUTO_SIGN_IN",
+    "refer": "COLLECT_REFER_BALANCE",
+    "free_box": "AUTO_OPEN_FREE_BOX",
+    "taps": "AUTO_TAP",
+    "tasks": "AUTO_TASK",
+    "tap_cards": "AUTO_UPGRADE_TAP_CARDS",
+    "mine_cards": "AUTO_UPGRADE_MINE_CARDS",
+    "gang": "JOIN_GANG",
+    "combo": "SOLVE_COMBO",
+    "spins": "AUTO_SPINS",
+}
+
+
+class Tapper:
+    def __init__(self, tg_client: Client, first_run: bool, user_agent: str | None = None, replay=None):
+        self.tg_client = tg_client
+        self.first_run = first_run
+        self.session_name = tg_client.name
+        self.main_bot_peer = 'bums'
+        self.game_state = GameState(ttl=settings.GAME_INFO_TTL)
+        self.web_data = None
+        self.refresh_task = None
+        self.proxy_checked = False
+        self.next_due = {}
+        self.relogin_failures = 0
+        self.headers = {**headers, "User-Agent": user_agent} if user_agent else dict(headers)
+        # ReplaySession serving recorded responses instead of the network (see bot/utils/replay.py)
+        self.replay = replay
+
+    def cached_web_data(self):
+        if not self.web_data:
+            return None
+        ref_id, tg_web_data, auth_date = self.web_data
+        if time() - auth_date >= settings.INIT_DATA_TTL:
+            return None
+        return ref_id, tg_web_data
+
+    async def get_tg_web_data(self, proxy: str | None) -> str:
+        if self.replay:
+            return self.replay.web_data()
+
+        # initData stays valid for a while after auth_date, no need to touch Telegram every cycle
+        cached = self.cached_web_data()
+        if cached:
+            return cached
+
+        if proxy:
+            proxy = Proxy.from_str(proxy)
+            proxy_dict = dict(
+                scheme=proxy.protocol,
+                hostname=proxy.host,
+                port=proxy.port,
+                username=proxy.login,
+                password=proxy.password
+            )
+        else:
+            proxy_dict = None
+
+        self.tg_client.proxy = proxy_dict
+
+        try:
+            with telegram_rpc_seconds.time(method="connect"), tracer.span("connect", kind="telegram"):
+                await tg_pool.acquire(self.tg_client)
+
+            # Released only after a successful acquire, a failed connect holds no reference
+            try:
+                while True:
+                    try:
+                        with telegram_rpc_seconds.time(method="resolve_peer"), tracer.span("resolve_peer", kind="telegram"):
+                            peer = await self.tg_client.resolve_peer('bums')
+                        break
+                    except FloodWait as fl:
+                        fls = fl.value
+
+                        logger.warning(f"{self.session_name} | FloodWait {fl}")
+                        logger.info(f"{self.session_name} | Sleep {fls}s")
+                        await clock.sleep(fls + 3)
+
+                ref_key = random.choice([settings.REF_KEY, "ref_3CcrQyaN"]) if settings.SUPPORT_AUTHOR else settings.REF_KEY
+                ref_id = ref_key.removeprefix("ref_")
+            
+                with telegram_rpc_seconds.time(method="request_app_web_view"), tracer.span("request_app_web_view", kind="telegram"):
+                    web_view = await self.tg_client.invoke(functions.messages.RequestAppWebView(
+                        peer=peer,
+                        app=types.InputBotAppShortName(bot_id=peer, short_name="app"),
+                        platform='android',
+                        write_allowed=True,
+                        start_param=ref_key
+                    ))
+
+                auth_url = web_view.url
+                tg_web_data = unquote(string=auth_url.split('tgWebAppData=')[1].split('&tgWebAppVersion')[0])
+
+                if not hasattr(self, 'tg_client_id'):
+                    with telegram_rpc_seconds.time(method="get_me"), tracer.span("get_me", kind="telegram"):
+                        me = await self.tg_client.get_me()
+                    self.tg_client_id = me.id
+
+                auth_date = int(parse_qs(tg_web_data).get('auth_date', ['0'])[0] or 0) or int(time())
+                self.web_data = (ref_id, tg_web_data, auth_date)
+
+                return ref_id, tg_web_data
+            finally:
+                tg_pool.release(self.tg_client)
+
+        except (Unauthorized, UserDeactivated, AuthKeyUnregistered, UserDeactivatedBan, AuthKeyDuplicated,
+                SessionExpired, SessionRevoked):
+            await tg_pool.disconnect(self.tg_client)
+            raise TelegramInvalidSessionException(f"Telegram session is invalid. Client: {self.tg_client.name}")
+        except AttributeError as e:
+            raise TelegramProxyError(e)
+        except Exception as error:
+            logger.error(f"{self.session_name} | Unknown error during Authorization: {error}")
+            await clock.sleep(delay=3)
+
+    @error_handler  
+    async def join_and_mute_tg_channel(self, link: str):
+        if self.replay:
+            return
+
+        await clock.sleep(delay=random.randint(15, 30))
+        
+        await tg_pool.acquire(self.tg_client)
+    
+        try:
+            parsed_link = link if 'https://t.me/+' in link else link[13:]
+            
+            chat = await self.tg_client.get_chat(parsed_link)
+            
+            if chat.username:
+                chat_username = chat.username
+            elif chat.id:
+                chat_username = chat.id
+            else:
+                logger.error("Unable to get channel username or id")
+                return
+            
+            logger.info(f"{self.session_name} | Retrieved channel: <y>{chat_username}</y>")
+    
+            # Check if already a member
+            try:
+                await self.tg_client.get_chat_member(chat_username, "me")
+            except Exception as error:
+                if getattr(error, "ID", None) == 'USER_NOT_PARTICIPANT':
+                    # Join the channel if not a member
+                    await clock.sleep(delay=3)
+                    chat = await self.tg_client.join_chat(parsed_link)
+                    chat_id = chat.id
+                    logger.info(f"{self.session_name} | Successfully joined chat <y>{chat_username}</y>")
+                    
+                    # Wait before muting
+                    await clock.sleep(random.randint(5, 10))
+                    
+                    # Resolve the peer
+                    if chat.is_channel or chat.is_group:
+                        peer = types.InputPeerChannel(channel_id=chat.id, access_hash=chat.access_hash)
+                    else:
+                        logger.error(f"{self.session_name} | Unsupported chat type for {chat_username or chat_id}")
+                        return
+                    
+                    # Mute the chat
+                    await self.tg_client.invoke(functions.account.UpdateNotifySettings(
+                        peer=peer,
+                        settings=types.InputPeerNotifySettings(mute_until=2147483647)
+                    ))
+                    logger.info(f"{self.session_name} | Successfully muted chat <y>{chat_username}</y>")
+                else:
+                    logger.error(f"{self.session_name} | Error while checking channel: <y>{chat_username}</y>: {str(error)}")
+        except Exception as e:
+            logger.error(f"{self.session_name} | Error joining/muting channel {link}: {str(e)}")
+            await clock.sleep(delay=3)    
+        finally:
+            tg_pool.release(self.tg_client)
+            await clock.sleep(random.randint(10, 20))
+        
+    @error_handler
+    async def change_tg_name(self, name: str):
+        if self.replay:
+            return
+
+        await clock.sleep(delay=random.randint(15, 30))
+        
+        await tg_pool.acquire(self.tg_client)
+    
+        try:
+            me = await self.tg_client.get_me()
+            current_first_name = me.first_name
+            current_last_name = me.last_name or ""
+            if name in current_last_name:
+                return
+            
+            updated_last_name = f"{current_last_name} {name}".strip()
+            await self.tg_client.update_profile(last_name=updated_last_name)
+            logger.info(f"{self.session_name} | Successfully updated last name to: <y>{current_first_name} {updated_last_name}</y>")
+        except Exception as e:
+            logger.error(f"{self.session_name} | Error updating last name: {str(e)}")
+        finally:
+            tg_pool.release(self.tg_client)
+            await clock.sleep(random.randint(10, 20))
+            
+    @error_handler
+    async def check_proxy(self, http_client: aiohttp.ClientSession, proxy: Proxy) -> None:
+        try:
+            response = await http_client.get(url='http://ip-api.com/json', timeout=aiohttp.ClientTimeout(20))
+            response.raise_for_status()
+
+            response_json = await response.json()
+            ip = response_json.get('query', 'N/A')
+            country = response_json.get('country', 'N/A')
+
+            logger.info(f"{self.session_name} | Proxy IP : {ip} | Proxy Country : {country}")
+        except Exception as error:
+            logger.error(f"{self.session_name} | Proxy: {proxy} | Error: {error}")
+                   
+    def record_traffic(self, method, url, request_body, started_at, status, response_headers, response_body):
+        recorder.record({
+            "time": datetime.datetime.now().isoformat(timespec='milliseconds'),
+            "session": self.session_name,
+            "method": method,
+            "url": url,
+            "request": request_body,
+            "status": status,
+            "elapsed": round(monotonic() - started_at, 4),
+            "headers": dict(response_headers or {}),
+            "response": response_body,
+        })
+
+    @error_handler
+    async def make_request(
+        self,
+        http_client: aiohttp.ClientSession,
+        method,
+        endpoint=None,
+        url=None,
+        extra_headers=None,
+        web_boundary=None,
+        json_data=None,
+        urlencoded_data=None,
+        **kwargs
+        ):
+        
+        full_url = url or f"{settings.API_BASE_URL}{endpoint or ''}"
+        
+        request_headers = http_client._default_headers.copy()
+        if extra_headers:
+            request_headers.update(extra_headers)
+            
+        if web_boundary:
+            boundary = "------WebKitFormBoundary" + ''.join(random.choices(string.ascii_letters + string.digits, k=16))
+            body = "\r\n".join(
+                f"{boundary}\r\nContent-Disposition: form-data; name=\"{key}\"\r\n\r\n{value}"
+                for key, value in web_boundary.items()
+            ) + f"\r\n{boundary}--\r\n"
+
+            request_headers["Content-Type"] = f"multipart/form-data; boundary=----{boundary.strip('--')}"
+            kwargs["data"] = body
+            
+        elif json_data is not None:
+            request_headers["Content-Type"] = "application/json"
+            kwargs["json"] = json_data
+
+        elif urlencoded_data is not None:
+            request_headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
+            kwargs["data"] = aiohttp.FormData(urlencoded_data)
+        
+        request_body = json_data if json_data is not None else web_boundary or urlencoded_data
+        limiter = api_limiters.get(endpoint or full_url)
+        # Query strings stay out of metric labels, e.g. getGameInfo?blumInvitationCode=...
+        metric_endpoint = endpoint.split('?')[0] if endpoint else urlsplit(full_url)._replace(query="").geturl()
+        retries = 0
+        max_retries = settings.MAX_REQUEST_RETRY
+        retry_budget.deposit()
+        
+        with tracer.span(metric_endpoint, kind="api", method=method) as span:
+            while True:
+                await limiter.acquire()
+                overloaded = False
+                status = "error"
+                started_at = monotonic()
+                span.add_request()
+                span.set(status=status, attempts=retries + 1)
+                try:
+                    if self.replay:
+                        response = await self.replay.request(method, full_url)
+                    else:
+                        response = await http_client.request(method, full_url, headers=request_headers, **kwargs)
+                    status = response.status
+                    span.set(status=status)
+                    response.raise_for_status()
+                
+                    response_json = await response.json()
+                    # Rejected mutations (non-zero code) leave the cached state as it was
+                    if endpoint and isinstance(response_json, dict) and response_json.get('code') == 0:
+                        self.game_state.invalidate(endpoint=endpoint, data=response_json.get('data'))
+                    if settings.SAVE_RESPONSE_DATA and not self.replay:
+                        self.record_traffic(method, full_url, request_body, started_at, response.status, response.headers, response_json)
+                        
+                    return response_json
+                except aiohttp.ClientResponseError as error:
+                
+                    if settings.SAVE_RESPONSE_DATA and not self.replay:
+                        self.record_traffic(method, full_url, request_body, started_at, error.status, error.headers, error.message)
+                        
+                    status = error.status
+                    span.set(status=status)
+                    if error.status == 401:
+                        api_errors.inc(endpoint=metric_endpoint, status=status)
+                        token = request_headers.get('Authorization', '').removeprefix('Bearer ')
+                        token_cache.invalidate(self.session_name, token=token)
+                        raise NeedReLoginError(f"Token rejected on {endpoint or full_url}")
+                
+                    if error.status not in RETRY_STATUSES:
+                        api_errors.inc(endpoint=metric_endpoint, status=status)
+                        logger.error(f"{self.session_name} | HTTP error: {error}")
+                        raise
+                
+                    overloaded = True
+                    retry_after = retry_after_seconds(error.headers)
+                except (aiohttp.ClientError, Exception) as error:
+                    api_errors.inc(endpoint=metric_endpoint, status=status)
+                    logger.error(f"{self.session_name} | Unknown error when processing request: {error}")
+                    raise
+                finally:
+                    limiter.release(overloaded=overloaded)
+                    api_request_seconds.observe(monotonic() - started_at, endpoint=metric_endpoint, status=status)
+            
+                retries += 1
+                if retries >= max_retries:
+                    api_errors.inc(endpoint=metric_endpoint, status=status)
+                    logger.error(f"{self.session_name} | Max retries reached for 'Server Un-Reachable' error.")
+                    break
+                if not retry_budget.withdraw():
+                    api_errors.inc(endpoint=metric_endpoint, status=status)
+                    logger.error(f"{self.session_name} | Retry budget exhausted, server is overloaded. Giving up on {endpoint or full_url}")
+                    break
+            
+                api_retries.inc(endpoint=metric_endpoint, status=status)
+                # Retry-After applies to everyone calling this endpoint, not just this account
+                if retry_after is not None:
+                    limiter.pause(retry_after)
+                delay = retry_after if retry_after is not None else backoff_delay(retries)
+                logger.warning(f"{self.session_name} | Received <r>{status}</r>, retrying {retries}/{max_retries} in {round(delay, 1)}s...")
+                await clock.sleep(delay)
+        
+            raise aiohttp.ClientResponseError(
+                request_info=None,
+                history=None,
+                status=503,
+                message="Max retries reached for 503 errors."
+            )
+        
+    @error_handler
+    async def login(self, http_client: aiohttp.ClientSession, ref_id, init_data):
+        additional_headers = {'Authorization': 'Bearer false'}
+        web_boundary = {
+            "invitationCode": ref_id,
+            "initData": init_data
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user/telegram_auth", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response and response.get("data", {}).get("token"):
+            return response
+        return None
+
+    async def user_data(self, http_client: aiohttp.ClientSession, auth_token, sections=None):
+        return await self.game_state.get(lambda: self.fetch_user_data(http_client, auth_token=auth_token), sections=sections)
+
+    @error_handler
+    async def fetch_user_data(self, http_client: aiohttp.ClientSession, auth_token) -> GameInfo | None:
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/user_game_level/getGameInfo", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            # Parsed once here, every reader of the cached GameState shares the result
+            game_info = GameInfo.parse(response.get('data') or {})
+            if game_info is None:
+                logger.error(f"{self.session_name} | Error parsing User Data: required fields are missing")
+                return None
+            account_mine_profit.set(game_info.mine_power, session=self.session_name)
+            account_coins.set(game_info.coin, session=self.session_name)
+            return game_info
+        return None
+    
+    @error_handler
+    async def upgrade_tap(self, http_client: aiohttp.ClientSession, auth_token, card_type):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "type": card_type
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user_game_level/upgradeLeve", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def get_tap_cards(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine/getMineLists", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return [card for mine in (response.get('data') or {}).get('lists') or [] if (card := MineCard.parse(mine))]
+        return None
+    
+    @error_handler
+    async def upgrade_mine(self, http_client: aiohttp.ClientSession, auth_token, mineId):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "mineId": mineId
+        }
+        
+        retries = 0
+        while retries < 10:
+            response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine/upgrade", extra_headers=additional_headers, web_boundary=web_boundary)
+            
+            if response.get('code') == 0 and response.get('msg') == 'OK':
+                return response
+            
+            # Balance won't change by asking again, let the caller refetch and re-plan
+            if response.get('code') == -1 and response.get('msg') == 'Insufficient balance':
+                logger.warning(f"{self.session_name} | Insufficient balance for mine upgrade <y>{mineId}</y>")
+                return None
+            
+            retries += 1
+            logger.error(f"{self.session_name} | Error in upgrading... Retrying ({retries}/10)")
+            await clock.sleep(random.randint(5, 10))
+            
+        return None
+    
+    @error_handler
+    async def sign_in_data(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/sign/getSignLists", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def sign_in(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "": "undefined"
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/sign/sign", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def get_tap_info(self, http_client: aiohttp.ClientSession, auth_token) -> GameInfo | None:
+        game_info = await self.user_data(http_client, auth_token=auth_token, sections=("gameInfo", "tapInfo", "propInfo"))
+    
+        if not game_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
+            return None
+    
+        return game_info
+    
+    @error_handler
+    async def submit_taps(self, http_client: aiohttp.ClientSession, auth_token, collect_seq, taps_amount, hashCode):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "hashCode": hashCode,
+            "collectSeqNo": collect_seq,
+            "collectAmount": taps_amount
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/user_game/collectCoin", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def get_tasklist(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/task/lists", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return [Task.parse(task) for task in (response.get('data') or {}).get('lists') or [] if isinstance(task, dict)]
+        return None
+    
+    @error_handler
+    async def done_task(self, http_client: aiohttp.ClientSession, auth_token, task_id, pwd=None):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        urlencoded_data = {
+            "id": task_id
+        }
+        if pwd:
+            urlencoded_data["pwd"] = pwd
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/task/finish_task", extra_headers=additional_headers, urlencoded_data=urlencoded_data)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def get_refer_wallet(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/wallet/balance", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def collect_refer_wallet(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "": "undefined"
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/wallet/W70001To80001", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def get_gang_list(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "boostNum": 100,
+            "powerNum": 0
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/gang/gang_lists", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def join_gang(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "name": settings.GANG_USERNAME
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/gang/gang_join", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def combo_details(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/mine_active/getMineAcctiveInfo", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK' and int(response['data'].get('resultNum')) > 0:
+            return response
+        return None
+    
+    @error_handler
+    async def submit_combo(self, http_client: aiohttp.ClientSession, auth_token, one, two, three):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "cardIdStr": f"{one},{two},{three}"
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/mine_active/JoinMineAcctive", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def box_info(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/prop_shop/Lists?showPages=spin&page=1&pageSize=10", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+    
+    @error_handler
+    async def open_box(self, http_client: aiohttp.ClientSession, auth_token, count, prop_id):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "count": count,
+            "propId": prop_id
+        }
+
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/game_spin/Start", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('rewardLists'):
+            return response
+        return None
+    
+    @error_handler
+    async def spin_info(self, http_client: aiohttp.ClientSession, auth_token):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        
+        response = await self.make_request(http_client, 'GET', endpoint="/miniapps/api/game_slot/stamina", extra_headers=additional_headers)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return SpinInfo.parse(response.get('data'))
+        return None
+    
+    @error_handler
+    async def start_spin(self, http_client: aiohttp.ClientSession, auth_token, count):
+        additional_headers = {'Authorization': 'Bearer ' + auth_token}
+        web_boundary = {
+            "count": count
+        }
+        response = await self.make_request(http_client, 'POST', endpoint="/miniapps/api/game_slot/start", extra_headers=additional_headers, web_boundary=web_boundary)
+        if response.get('code') == 0 and response.get('msg') == 'OK':
+            return response
+        return None
+
+    async def authorize(self, http_client: aiohttp.ClientSession, ref_id, init_data):
+        try:
+            login_data = await self.login(http_client, ref_id=ref_id, init_data=init_data)
+        except NeedReLoginError:
+            # telegram_auth rejected the initData itself, only a fresh one from Telegram helps
+            self.web_data = None
+            raise
+        if not login_data:
+            self.web_data = None
+            return None
+
+        auth_token = login_data.get("data", {}).get("token")
+        if not self.replay:
+            token_cache.set(self.session_name, auth_token)
+        return auth_token
+
+    async def refresh_token(self, proxy: str | None, delay: float = 0):
+        try:
+            if delay > 0:
+                await clock.sleep(delay)
+            ref_id, init_data = await self.get_tg_web_data(proxy=proxy)
+            connector = connector_pool.acquire(proxy)
+            try:
+                async with aiohttp.ClientSession(headers=self.headers, connector=connector, connector_owner=False, trust_env=True,
+                                                 trace_configs=[connector_pool.trace_config]) as http_client:
+                    if await self.authorize(http_client, ref_id=ref_id, init_data=init_data):
+                        logger.info(f"{self.session_name} | Token refreshed ahead of expiry")
+            finally:
+                connector_pool.release(proxy)
+        except Exception as error:
+            logger.warning(f"{self.session_name} | Background token refresh failed: {error}")
+
+    async def phase_sign_in(self, http_client: aiohttp.ClientSession, auth_token):
+        signin_data = await self.sign_in_data(http_client, auth_token=auth_token)
+        if not signin_data:
+            logger.error(f"{self.session_name} | Unknown error while collecting Check-In Data!")
+            return
+
+        lists = signin_data['data']['lists']
+        sign_status = signin_data['data']['signStatus']
+        signed = True
+
+        if sign_status == 0:
+            for item in lists:
+                if item["status"] == 0:
+                    day_reward = item["normal"]
+                    current_day = item["daysDesc"]
+                    make_signin = await self.sign_in(http_client, auth_token=auth_token)
+                    if make_signin:
+                        logger.success(f"{self.session_name} | Successful Sign-In <y>{current_day}</y>: <g>+{fnum(day_reward)}</g>")
+                    else:
+                        signed = False
+                    continue
+
+        await clock.sleep(random.randint(1, 3))
+        # A failed sign-in is tried again after SLEEP_TIME instead of waiting for the next day
+        return seconds_until_daily_reset(settings.DAILY_RESET_HOUR) + randint(60, 900) if signed else None
+
+    async def phase_refer(self, http_client: aiohttp.ClientSession, auth_token):
+        refer_balance = await self.get_refer_wallet(http_client, auth_token=auth_token)
+        if not refer_balance:
+            logger.error(f"{self.session_name} | Unknown error while collecting Refer Data!")
+            return
+
+        refer_wallet = refer_balance.get("data", {}).get("lists", [])
+        for item in refer_wallet:
+            if item['id'] == 70001:
+                main_balance = int(item['availableAmount'])
+                freeze_balance = int(item['freezeAmount'])
+
+                if main_balance > 0 and main_balance - freeze_balance > 0:
+                    logger.info(f"{self.session_name} | Refer Wallet Balance : <y>{main_balance}</y> | Freeze Refer Balance : <y>{freeze_balance}</y>")
+                    logger.info(f"{self.session_name} | Collecting Refer Balance...")
+
+                    collect_refer = await self.collect_refer_wallet(http_client, auth_token=auth_token)
+                    if not collect_refer:
+                        logger.error(f"{self.session_name} | Unknown error while collecting Refer Balance!")
+                        break
+
+                    if collect_refer:
+                        logger.success(f"{self.session_name} | Refer Balance Collected: <g>+{main_balance - freeze_balance}</g>")
+
+        await clock.sleep(random.randint(1, 3))
+
+    async def phase_free_box(self, http_client: aiohttp.ClientSession, auth_token):
+        box_info = await self.box_info(http_client, auth_token=auth_token)
+        if not box_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting Box Info!")
+            return
+
+        box_list = box_info.get("data", {})
+        opened = True
+        for box in box_list:
+            if box.get("propId") == 500010001:
+                usage = box.get("toDayUse")
+                max_use = to_int(box.get("toDayMaxUseNum"))
+                today_use = to_int(box.get("toDayNowUseNum"))
+                if usage == False and today_use < max_use:
+                    open_box = await self.open_box(http_client, auth_token=auth_token, count=1, prop_id=500010001)
+                    if not open_box:
+                        logger.error(f"{self.session_name} | Unknown error while Opening Box!")
+                        opened = False
+                        continue
+                    fb_name = open_box['rewardLists'][0].get('name')
+                    logger.success(f"{self.session_name} | Free Box Opened: <y>500010001</y> | Prize: <g>{fb_name}</g>")
+
+        await clock.sleep(random.randint(1, 3))
+        # Like the sign-in, a box that failed to open is tried again after SLEEP_TIME
+        return seconds_until_daily_reset(settings.DAILY_RESET_HOUR) + randint(60, 900) if opened else None
+
+    async def phase_taps(self, http_client: aiohttp.ClientSession, auth_token):
+        game_info = await self.get_tap_info(http_client, auth_token=auth_token)
+        if not game_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting Tap Info!")
+            return
+
+        tap_value = game_info.tap_info.tap
+        bonus_chance = game_info.tap_info.bonus_chance
+        bonus_multiplier = game_info.tap_info.bonus_ratio
+        auto_clicker = game_info.auto_click
+
+        # Energy, sequence and today's coin are carried forward from collectCoin, getGameInfo only confirms them
+        tap_state = TapState(game_info)
+        batches_since_sync = 0
+        resynced = False
+
+        logger.info(f"{self.session_name} | Starting Auto-Taps...")
+
+        while tap_state.left_energy > 1:
+            if auto_clicker:
+                logger.info(f"{self.session_name} | Auto-clicker detected. Skipping Auto-Taps...")
+                break
+
+            if tap_state.today_coin > tap_state.today_coin_limit:
+                logger.warning(f"{self.session_name} | Today Tap limit is over, Skipping.")
+                break
+
+            # The whole plan is submitted, energy regenerated in the meantime is planned on the next pass
+            batches = plan_tap_batches(tap_value, tap_state.left_energy, tap_state.coin_room, bonus_chance, bonus_multiplier,
+                                       settings.TAPS_PER_BATCH[1], min_taps=settings.TAPS_PER_BATCH[0])
+            if not batches:
+                logger.warning(f"{self.session_name} | Insufficient energy for tap amount: <y>({tap_state.left_energy}/{tap_state.total_energy})</y>")
+                break
+
+            stop = False
+            for total_taps, taps_amount in batches:
+                if taps_amount > tap_state.left_energy:
+                    # A re-sync found less energy than planned for
+                    break
+
+                hashCode = tapHash(taps_amount=taps_amount, collect_seq=tap_state.collect_seq)
+                post_taps = await self.submit_taps(http_client, auth_token=auth_token, collect_seq=tap_state.collect_seq, taps_amount=taps_amount, hashCode=hashCode)
+                if not post_taps:
+                    if resynced:
+                        logger.error(f"{self.session_name} | Unknown error while tapping, Skipping taps!")
+                        stop = True
+                        break
+                    # Most likely the local model drifted (sequence or energy), confirm with the server once and plan again.
+                    # A rejected submit invalidates nothing, the cached payload is what drifted
+                    self.game_state.invalidate(sections=("gameInfo", "tapInfo"))
+                    game_info = await self.get_tap_info(http_client, auth_token=auth_token)
+                    if not game_info:
+                        logger.error(f"{self.session_name} | Unknown error while tapping, Skipping taps!")
+                        stop = True
+                        break
+                    drift = tap_state.sync(game_info)
+                    batches_since_sync = 0
+                    resynced = True
+                    logger.warning(f"{self.session_name} | Tap submit rejected, re-synced with server (energy drift: <y>{drift}</y>)")
+                    break
+
+                resynced = False
+                tap_state.apply(taps_amount, post_taps.get('data'))
+                batches_since_sync += 1
+
+                if not tap_state.confirmed and batches_since_sync >= settings.TAP_SYNC_EVERY:
+                    game_info = await self.get_tap_info(http_client, auth_token=auth_token)
+                    if game_info:
+                        tap_state.sync(game_info)
+                    batches_since_sync = 0
+
+                logger.success(f"{self.session_name} | Tapped <y>x{total_taps}</y>: <g>+{fnum(taps_amount)}</g> | Balance: <y>{fnum(post_taps['data'].get('coin'))}</y> | Energy: <y>({tap_state.left_energy}/{tap_state.total_energy})</y>")
+                await clock.sleep(random.randint(settings.DELAY_BETWEEN_TAPS[0], settings.DELAY_BETWEEN_TAPS[1]))
+                tap_state.regenerate()
+
+            if stop:
+                break
+
+            if tap_state.left_energy <= 0:
+                logger.error(f"{self.session_name} | Left energy depleted, Skipping Auto-Taps!")
+                break
+
+        await clock.sleep(random.randint(1, 3))
+
+        if auto_clicker:
+            return
+
+        # Come back when the energy is worth a login, not after a fixed sleep
+        tap_state.regenerate()
+        wakeup = next_tap_wakeup(tap_state, reset_in=seconds_until_daily_reset(settings.DAILY_RESET_HOUR), fill=settings.TAP_WAKEUP_ENERGY)
+        if wakeup is not None:
+            wakeup += randint(0, 120)
+            logger.info(f"{self.session_name} | Next taps in <y>{round(wakeup / 60, 1)}</y> min | Energy: <y>({tap_state.left_energy}/{tap_state.total_energy})</y>")
+        return wakeup
+
+    async def phase_tasks(self, http_client: aiohttp.ClientSession, auth_token):
+        logger.info(f"{self.session_name} | Checking available task...")
+        tasks = await self.get_tasklist(http_client, auth_token=auth_token)
+
+        if tasks is None:
+            logger.error(f"{self.session_name} | Unknown error while collecting Task-List!")
+            return
+
+        filtered_tasks = [task for task in tasks if task.available]
+
+
+        if not filtered_tasks:
+            logger.info(f"{self.session_name} | Task Not Found")
+
+        for task in filtered_tasks:
+            task_id = task.id
+            task_name = task.name
+            task_reward = task.reward
+            task_type = task.task_type
+            task_classify = task.classify
+            jump_url = task.jump_url
+
+            if task.type == "open_link" and task_type == "normal" and re.match(r"https?:\/\/(?:t\.me|telegram\.me|telegram\.dog)\/(?:[a-zA-Z0-9_]{4,32}|\+[a-zA-Z0-9_-]{08,18})", jump_url):
+                if any(keyword in task_name for keyword in ["Subscribe", "Join", "Follow"]):
+                    if settings.AUTO_JOIN_CHANNELS:
+                        await self.join_and_mute_tg_channel(link=jump_url)
+                        await clock.sleep(random.randint(5, 10))
+
+            if task.type == "open_link" and task_type == "nickname_check":
+                if settings.AUTO_NAME_CHANGE:
+                    await self.change_tg_name(name='📦 Bums')
+                    await clock.sleep(random.randint(5, 10))
+                    data_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id)
+                    if data_done:
+                        logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
+                continue
+
+            if task_classify.lower() == "youtube" and task_type == "pwd":
+                utube_code = task_answer(task_name=task_name, method='get-code')
+                if utube_code:
+                    utube_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id, pwd=utube_code)
+                    if utube_done:
+                        logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
+                continue
+
+            data_done = await self.done_task(http_client, auth_token=auth_token, task_id=task_id)
+            if data_done:
+                logger.success(f"{self.session_name} | Task: <y>{task_name}</y> | Reward: <y>+{fnum(task_reward)}</y>")
+
+        await clock.sleep(random.randint(1, 5))
+
+    async def phase_tap_cards(self, http_client: aiohttp.ClientSession, auth_token):
+        logger.info(f"{self.session_name} | Updating Tap-Cards...")
+        max_levels = {
+            "bonusChance": settings.JACKPOT_LEVEL,
+            "bonusRatio": settings.CRIT_LEVEL,
+            "energy": settings.ENERGY_LEVEL,
+            "tap": settings.TAP_LEVEL,
+            "recovery": settings.ENERGY_REGEN_LEVEL
+        }
+
+        while True:
+            game_info = await self.user_data(http_client, auth_token=auth_token, sections=("balance", "tapInfo"))
+            if not game_info:
+                logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
+                break
+
+            coin = game_info.coin
+            current_level = game_info.level
+
+            # Costs and levels are tracked locally, the server is asked again only after the plan runs out
+            planner = TapUpgradePlanner(game_info.tap_info, balance=coin, max_levels=max_levels)
+            upgrades_done = 0
+
+            while (step := planner.next()) is not None:
+                upgrade_tap = await self.upgrade_tap(http_client, auth_token=auth_token, card_type=step["type"])
+                if not upgrade_tap:
+                    # Nothing was paid, the boost sits out this plan and the others go on
+                    continue
+
+                card_name = card_details(step["type"])
+                logger.success(f"{self.session_name} | '{card_name[0]}' upgraded: <e>{step['level'] + 1}</e>, <r>-{fnum(step['cost'])}</r>")
+                upgrades_done += 1
+                planner.advance(step, upgrade_tap.get('data'))
+                await clock.sleep(random.randint(1, 3))
+
+            if not upgrades_done:
+                if planner.all_upgraded:
+                    logger.success(f"{self.session_name} | All Tap-Cards upgraded!")
+                else:
+                    logger.info(f"{self.session_name} | Insufficient Balance to keep upgrading.")
+                logger.info(f"{self.session_name} | Updated Balance: <y>{fnum(coin)}</y> | Updated Level: <y>{current_level}</y>")
+                break
+
+        await clock.sleep(random.randint(1, 3))
+
+    async def phase_mine_cards(self, http_client: aiohttp.ClientSession, auth_token):
+        logger.info(f"{self.session_name} | Updating Mine-Cards...")
+        while True:
+            mine_list = await self.get_tap_cards(http_client, auth_token=auth_token)
+            if mine_list is None:
+                logger.error(f"{self.session_name} | Unknown error while collecting Mine List!")
+                break
+
+            card_catalog.learn(mine_list)
+
+            game_info = await self.user_data(http_client, auth_token=auth_token, sections=("balance", "mineInfo"))
+            if not game_info:
+                logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
+                break
+
+            coin = game_info.coin
+            current_level = game_info.level
+            profit_hour = game_info.mine_power
+
+            # Whole purchase sequence from this snapshot, refetched only after it runs out
+            planner = MineUpgradePlanner(mine_list, balance=coin, max_price=settings.MAX_CARD_PRICE_PURCHASE, by_profit=settings.PROFIT_UPGRADE)
+            upgrades_done = 0
+
+            while (step := planner.next()) is not None:
+                mine_card = card_details(step["mineId"])
+                upgrade_card = await self.upgrade_mine(http_client, auth_token=auth_token, mineId=step["mineId"])
+                if not upgrade_card:
+                    # Nothing was paid, the rest of the plan can still be afforded
+                    continue
+
+                logger.success(f"{self.session_name} | '{mine_card[0]}' upgraded: <e>{step['level'] + 1}</e>, <r>-{fnum(step['cost'])}</r>")
+                upgrades_done += 1
+                planner.advance(step, upgrade_card.get('data'))
+                await clock.sleep(random.randint(1, 3))
+
+            if not upgrades_done:
+                logger.info(f"{self.session_name} | No more upgrades possible. Stopping process.")
+                logger.info(f"{self.session_name} | Updated Balance: <y>{fnum(coin)}</y> | Updated Level: <y>{current_level}</y> | Updated Profit/Hour: <y>{fnum(profit_hour)}</y>")
+                break
+
+            await clock.sleep(random.randint(3, 10))
+
+        await clock.sleep(random.randint(1, 3))
+
+    async def phase_gang(self, http_client: aiohttp.ClientSession, auth_token):
+        gang_list = await self.get_gang_list(http_client, auth_token=auth_token)
+        if not gang_list:
+            logger.error(f"{self.session_name} | Unknown error while collecting Gang-List!")
+            return
+
+        my_gang = gang_list['data']['myGang'].get('gangId') or None
+        if my_gang is None:
+            logger.success(f"{self.session_name} | Joining Gang...")
+
+            join_gang = await self.join_gang(http_client, auth_token=auth_token)
+            if not join_gang:
+                logger.error(f"{self.session_name} | Unknown error while Joining Gang!")
+                return
+            logger.success(f"{self.session_name} | Gang joined successfully!")
+
+        await clock.sleep(random.randint(1, 3))
+        return seconds_until_daily_reset(settings.DAILY_RESET_HOUR) + randint(60, 900)
+
+    async def phase_combo(self, http_client: aiohttp.ClientSession, auth_token):
+        game_info = await self.user_data(http_client, auth_token=auth_token, sections=("gameInfo",))
+        if not game_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
+            return
+
+        if "Lottery" in game_info.college_can_use:
+            combo_available = await self.combo_details(http_client, auth_token=auth_token)
+            if combo_available:
+                reward = combo_available['data'].get('rewardNum')
+                await clock.sleep(random.randint(1, 3))
+                # Read right before submitting so a combo rejected for another account is not retried
+                combo_data = combo_answer(method='get')
+                if combo_data:
+                    logger.info(f"{self.session_name} | Checking Combo...")
+                    solve_combo = await self.submit_combo(http_client, auth_token=auth_token, one=combo_data[0], two=combo_data[1], three=combo_data[2])
+                    if not solve_combo:
+                        logger.error(f"{self.session_name} | Unknown error while solving Combo!")
+                        return
+                    answer_status = solve_combo['data'].get('status')
+                    if answer_status == 0:
+                        logger.success(f"{self.session_name} | Combo solved: <g>+{reward}</g>")
+                    else:
+                        attempt_left = solve_combo['data'].get('resultNum')
+                        combo_answer(method='wrong', combo=combo_data)
+                        logger.error(f"{self.session_name} | Combo is wrong, Left Chance: <r>{attempt_left}</r>. Edit 'combo.json' with valid combo.")
+                else:
+                    logger.error(f"{self.session_name} | Skipping Combo, Combo is empty or invalid. Edit 'combo.json' with correct answers!")
+        else:
+            logger.error(f"{self.session_name} | Skipping Combo, Combo (Lottery) is currently locked!")
+
+
+        await clock.sleep(random.randint(1, 3))
+
+    async def phase_spins(self, http_client: aiohttp.ClientSession, auth_token):
+        spin_info = await self.spin_info(http_client, auth_token=auth_token)
+        if not spin_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting Spin Info!")
+            return
+
+        spin_count = settings.SPIN_COUNT
+        total_spins = spin_info.stamina_now
+        max_spins = spin_info.stamina_max or 'NaN'
+
+        if total_spins > 0:
+            logger.info(f"{self.session_name} | Total Spins: <y>({total_spins}/{max_spins})</y>, Spinning...")
+
+        while total_spins > 0:
+            if spin_count > total_spins:
+                spin_count = count_spin(total_spins)
+
+            spin_data = await self.start_spin(http_client, auth_token=auth_token, count=spin_count)
+            if not spin_data:
+                logger.error(f"{self.session_name} | Unknown error while collecting Spin Data!")
+                break
+
+            spin_reward = (spin_data.get('data', {}).get('rewardLists', {}).get('rewardList', [{}])[0].get('name') or 'None')
+
+            logger.success(f"{self.session_name} | Spin Reward: <g>{spin_reward}</g>")
+
+            spin_info = await self.spin_info(http_client, auth_token=auth_token)
+            if not spin_info:
+                logger.error(f"{self.session_name} | Unknown error while collecting Spin Info!")
+                break
+
+            total_spins = spin_info.stamina_now
+            await clock.sleep(random.randint(2, 8))
+
+        await clock.sleep(random.randint(1, 3))
+
+    async def run_cycle(self, http_client: aiohttp.ClientSession, ref_id, init_data, auth_token=None, phases=None) -> dict | None:
+        if auth_token:
+            logger.info(f"{self.session_name} | Using cached token")
+        else:
+            logger.info(f"{self.session_name} | Trying to login")
+
+            # Login
+            auth_token = await self.authorize(http_client, ref_id=ref_id, init_data=init_data)
+            if not auth_token:
+                logger.error(f"{self.session_name} | Login Failed")
+                return None
+
+            logger.success(f"{self.session_name} | <g>📦 Login Successful</g>")
+
+        # User-Data
+        self.game_state.invalidate()
+        game_info = await self.user_data(http_client, auth_token=auth_token)
+        if not game_info:
+            logger.error(f"{self.session_name} | Unknown error while collecting User Data!")
+            return None
+
+        coin = game_info.coin
+        current_level = game_info.level
+        profit_hour = game_info.mine_power
+        offline_bonus = game_info.offline_coin
+
+        logger.info(f"{self.session_name} | Balance: <y>{fnum(coin - offline_bonus)}</y> | Level: <y>{current_level}</y> | Profit Per Hour: <y>{fnum(profit_hour)}</y>")
+
+        if offline_bonus > 0:
+            logger.success(f"{self.session_name} | Offline Bonus: <g>+{fnum(offline_bonus)}</g> | Updated Balance: <y>{fnum(coin)}</y>")
+
+        await clock.sleep(random.randint(1, 3))
+
+        # Each phase may answer with the seconds until it is worth running again
+        results = {}
+        for phase in enabled_phases() if phases is None else phases:
+            phase_active.inc(phase=phase)
+            try:
+                with phase_seconds.time(phase=phase), tracer.span(phase, kind="phase") as span:
+                    results[phase] = await getattr(self, f"phase_{phase}")(http_client, auth_token=auth_token)
+                    if results[phase] is not None:
+                        span.set(next_in=round(results[phase]))
+            finally:
+                phase_active.dec(phase=phase)
+        return results
+
+    async def preflight(self, proxy: str | None):
+        # Checks the proxy once and opens its pooled connector before the first cycle
+        self.proxy_checked = True
+        if not proxy or self.replay:
+            return
+        try:
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector_pool.acquire(proxy), connector_owner=False, trust_env=True,
+                                             trace_configs=[connector_pool.trace_config]) as http_client:
+                await self.check_proxy(http_client=http_client, proxy=proxy)
+        finally:
+            connector_pool.release(proxy)
+
+    async def run_once(self, proxy: str | None, phases=None) -> dict | None:
+        with tracer.span("cycle", kind="cycle", session=self.session_name, phases=",".join(phases) if phases is not None else "all") as span:
+            if not self.proxy_checked:
+                await self.preflight(proxy)
+
+            # A still valid token skips Telegram and telegram_auth entirely
+            ref_id = init_data = None
+            if self.replay:
+                # Without a recorded login the recorded calls are replayed with a placeholder token
+                auth_token = None if self.replay.login_request is not None else "replay"
+            else:
+                auth_token = token_cache.get(self.session_name)
+            if not auth_token:
+                web_data = await self.get_tg_web_data(proxy=proxy)
+                if not web_data:
+                    # get_tg_web_data logs the reason and returns None when Telegram authorization failed
+                    raise AuthError("Telegram authorization failed")
+                ref_id, init_data = web_data
+            else:
+                self.schedule_refresh(proxy, wake_in=0)
+
+            # The session only lives for the cycle, its connections stay in the shared pool
+            connector = connector_pool.acquire(proxy)
+            try:
+                async with aiohttp.ClientSession(headers=self.headers, connector=connector, connector_owner=False, trust_env=True,
+                                                 trace_configs=[connector_pool.trace_config]) as http_client:
+                    results = await self.run_cycle(http_client, ref_id=ref_id, init_data=init_data, auth_token=auth_token, phases=phases)
+            finally:
+                connector_pool.release(proxy)
+
+            if results is None:
+                span.fail("cycle stopped")
+            return results
+
+    async def run_due(self, proxy: str | None) -> float | None:
+        """One scheduler job: runs the phases that are due and returns the delay until the next one.
+
+        Returns None when the account can't continue (bad proxy, Telegram session or
+        authorization). Other errors propagate to the scheduler, which retries the job.
+        """
+        now = time()
+        due = [phase for phase in enabled_phases() if self.next_due.get(phase, 0) <= now]
+
+        try:
+            results = await self.run_once(proxy, phases=due)
+        except TelegramProxyError:
+            logger.error(f"{self.session_name} | <r>The selected proxy cannot be applied to the Telegram client.</r>")
+            return None
+        except TelegramInvalidSessionException:
+            raise
+        except NeedReLoginError as error:
+            # Backs off while the API keeps rejecting fresh logins instead of retrying every few seconds
+            self.relogin_failures += 1
+            delay = max(backoff_delay(self.relogin_failures, base=3, cap=RELOGIN_BACKOFF_CAP), 3)
+            logger.warning(f"{self.session_name} | {error}, logging in again in <y>{round(delay)}</y>s")
+            return delay
+        except AuthError as error:
+            logger.error(f"{self.session_name} | Stop Tapper. Reason: {error}")
+            return None
+
+        self.relogin_failures = 0
+
+        now = time()
+        for phase in due:
+            delay = (results or {}).get(phase)
+            self.next_due[phase] = now + (delay if delay is not None else randint(settings.SLEEP_TIME[0], settings.SLEEP_TIME[1]))
+
+        if not enabled_phases():
+            return None
+        delay = max(min(self.next_due[phase] for phase in enabled_phases()) - now, 1)
+        self.schedule_refresh(proxy, wake_in=delay)
+        return delay
+
+    def schedule_refresh(self, proxy: str | None, wake_in: float):
+        # A token that would be within TOKEN_REFRESH_MARGIN of expiry by the next cycle is renewed in the
+        # background at that point, the cycle then starts with a valid token instead of a cold login
+        if self.replay or (self.refresh_task and not self.refresh_task.done()):
+            return
+        expires_in = token_cache.expires_in(self.session_name)
+        if expires_in <= 0 or expires_in - settings.TOKEN_REFRESH_MARGIN >= wake_in:
+            return
+        delay = max(expires_in - settings.TOKEN_REFRESH_MARGIN, 0)
+        self.refresh_task = asyncio.create_task(self.refresh_token(proxy=proxy, delay=delay))
+
+
+def enabled_phases() -> list:
+    return [phase for phase, setting in PHASES.items() if getattr(settings, setting)]
+
+
+def move_invalid_session(tg_client: Client):
+    session_file = f"sessions/{tg_client.name}.session"
+    if not os.path.exists("sessions/deleted_sessions"):
+        os.makedirs("sessions/deleted_sessions", exist_ok=True)
+    shutil.move(session_file, f"sessions/deleted_sessions/{tg_client.name}.session")
+    logger.error(f"Telegram account {tg_client.name} is not work!")
+
+
+async def schedule_tapper(scheduler, tg_client: Client, user_agent: str, proxy: str | None, first_run: bool, delay: float = 0):
+    tapper = Tapper(tg_client=tg_client, first_run=first_run, user_agent=user_agent)
+    await tapper.preflight(proxy)
+
+    async def job():
+        try:
+            return await tapper.run_due(proxy=proxy)
+        except TelegramInvalidSessionException:
+            move_invalid_session(tg_client)
+            return None
+
+    scheduler.add(tapper.session_name, job, delay=delay)
+    return tapper
@@ -0,0 +1,83 @@
+import asyncio
+from collections import OrderedDict
+
+from pyrogram import Client
+
+from bot.config import settings
+
+
+class TelegramClientPool:
+    """Keeps up to `max_connected` Pyrogram clients connected between uses.
+
+    A client handed back with `release` stays connected so the next call
+    skips the MTProto handshake. When the limit is reached the least
+    recently used idle client is disconnected to make room.
+    """
+
+    def __init__(self, max_connected: int):
+        self.max_connected = max_connected
+        self._clients = OrderedDict()
+        self._users = {}
+        self._locks = {}
+        self.connects = 0
+        self.reuses = 0
+        self.evictions = 0
+
+    async def acquire(self, client: Client) -> Client:
+        name = client.name
+        self._users[name] = self._users.get(name, 0) + 1
+
+        try:
+            async with self._locks.setdefault(name, asyncio.Lock()):
+                if client.is_connected:
+                    self.reuses += 1
+                else:
+                    await self._make_room()
+                    await client.connect()
+                    self.connects += 1
+        except BaseException:
+            self._users[name] -= 1
+            raise
+
+        self._clients[name] = client
+        self._clients.move_to_end(name)
+        return client
+
+    def release(self, client: Client):
+        name = client.name
+        self._users[name] = max(self._users.get(name, 0) - 1, 0)
+        if name in self._clients:
+            self._clients.move_to_end(name)
+
+    async def _make_room(self):
+        connected = [name for name, client in self._clients.items() if client.is_connected]
+        overflow = len(connected) - self.max_connected + 1
+        for name in connected:
+            if overflow <= 0:
+                break
+            if self._users.get(name):
+                continue
+            await self.disconnect(self._clients[name])
+            self.evictions += 1
+            overflow -= 1
+
+    async def disconnect(self, client: Client):
+        self._clients.pop(client.name, None)
+        if client.is_connected:
+            await client.disconnect()
+
+    async def close(self):
+        for client in list(self._clients.values()):
+            await self.disconnect(client)
+
+    def stats(self) -> dict:
+        return {
+            "connected": sum(1 for client in self._clients.values() if client.is_connected),
+            "in_use": sum(1 for users in self._users.values() if users),
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "evictions": self.evictions,
+        }
+
+
+tg_pool = TelegramClientPool(max_connected=settings.TG_MAX_CONNECTIONS)
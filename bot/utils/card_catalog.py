@@ -0,0 +1,41 @@
+from bot.utils.json_cache import JsonFileCache
+
+
+class CardCatalog(JsonFileCache):
+    def __init__(self, path: str = "./card-list.json"):
+        self.cards = {}
+        self.learned = {}
+        super().__init__(path)
+
+    def parse(self, data):
+        self.cards = {str(card_id): card for card_id, card in data.items() if isinstance(card, dict)}
+
+    def dump(self):
+        return dict(self.cards)
+
+    def get(self, card_id):
+        self.refresh()
+        card_id = str(card_id)
+        return self.cards.get(card_id) or self.learned.get(card_id)
+
+    def details(self, card_id):
+        card = self.get(card_id)
+        if card is None:
+            return [card_id, self.error or "ID not found"]
+
+        title = card.get("title") or self.learned.get(str(card_id), {}).get("title") or "No title available"
+        description = card.get("desc", "No description available")
+        return [title, description]
+
+    def learn(self, mine_list):
+        # Mine cards carry their own names, keep them for cards missing from card-list.json
+        for mine in mine_list or []:
+            mine_id = str(mine.mine_id)
+            if not mine.title:
+                continue
+            if mine_id in self.learned or self.cards.get(mine_id, {}).get("title"):
+                continue
+            self.learned[mine_id] = {"title": mine.title, "desc": mine.desc or "No description available"}
+
+
+card_catalog = CardCatalog()
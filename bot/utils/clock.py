@@ -0,0 +1,37 @@
+import asyncio
+from contextvars import ContextVar
+
+# Worker slot of the scheduler job running in this task, lent to other accounts while the job sleeps
+current_slot = ContextVar("current_slot", default=None)
+
+
+class Clock:
+    """Sleeps used by the tapper, scaled by `scale`.
+
+    Replays and benchmarks set `scale` below 1 (or to 0) so the human-like
+    delays between actions don't dominate the run. A sleep longer than
+    `lend_after` seconds inside a scheduler job (the wait between tap
+    batches, not the few seconds of pacing between requests) gives the
+    job's worker slot back for its duration and waits for a free slot again
+    before returning.
+    """
+
+    def __init__(self, scale: float = 1.0, lend_after: float = 10.0):
+        self.scale = scale
+        self.lend_after = lend_after
+
+    async def sleep(self, delay: float):
+        # Lending is decided on the unscaled delay, so scaled runs lend slots like real ones
+        lend = delay > self.lend_after
+        delay = delay * self.scale
+        slot = current_slot.get()
+        if slot is None or not lend or not slot.release():
+            await asyncio.sleep(delay if delay > 0 else 0)
+            return
+
+        # A cancelled sleep doesn't take a slot back, the job is ending anyway
+        await asyncio.sleep(delay)
+        await slot.acquire()
+
+
+clock = Clock()
@@ -0,0 +1,34 @@
+import copy
+
+from bot.utils.json_cache import JsonFileCache
+
+
+class ComboAnswer(JsonFileCache):
+    def __init__(self, path: str = "./combo.json"):
+        self.data = {}
+        super().__init__(path)
+
+    def parse(self, data):
+        self.data = data if isinstance(data, dict) else {}
+
+    def dump(self):
+        return copy.deepcopy(self.data)
+
+    def get(self):
+        self.refresh()
+        combo = self.data.get('combo')
+        if isinstance(combo, list) and len(combo) == 3:
+            return list(combo)
+        return None
+
+    def mark_wrong(self, combo=None):
+        self.refresh()
+        # Only clear the answer that was actually rejected, not one edited in since
+        if combo is not None and self.data.get('combo') != list(combo):
+            return
+
+        self.data["combo"] = []
+        self.schedule_save()
+
+
+combo_store = ComboAnswer()
@@ -0,0 +1,145 @@
+import asyncio
+import atexit
+import json
+import os
+import stat
+import tempfile
+import weakref
+from abc import ABC, abstractmethod
+from time import monotonic
+
+
+def file_mode(path: str) -> int:
+    # mkstemp creates 0600 files and os.replace keeps that mode on the target
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def save_json_atomic(path: str, data, indent: int = 4):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding='utf8') as file:
+            json.dump(data, file, indent=indent, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Every live cache, so one exit handler can write the changes whose debounced save never ran
+_caches = weakref.WeakSet()
+
+
+class JsonFileCache(ABC):
+    """Process-wide view of a JSON file, re-parsed only when its mtime changes.
+
+    Subclasses turn the loaded JSON into their own structures in `parse` and
+    build the JSON to save back from them in `dump`.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0, save_delay: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.save_delay = save_delay
+        self.error = None
+        self._mtime = None
+        self._loaded = False
+        self._next_check = 0.0
+        self._save_task = None
+        self._dirty = False
+        _caches.add(self)
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        now = monotonic()
+        if not force and self._loaded and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+
+        mtime = self._file_mtime()
+        if self._loaded and mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        self._loaded = True
+        if mtime is None:
+            self.error = "File not found"
+            self.parse({})
+            return True
+
+        try:
+            with open(self.path, "r", encoding='utf8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            self.error = "File not found"
+            data = {}
+        except json.JSONDecodeError:
+            self.error = "Error reading JSON"
+            data = {}
+        else:
+            self.error = None
+
+        self.parse(data)
+        return True
+
+    @abstractmethod
+    def parse(self, data):
+        ...
+
+    @abstractmethod
+    def dump(self):
+        ...
+
+    def save_now(self):
+        self._dirty = False
+        save_json_atomic(self.path, self.dump())
+        # Our own write must not trigger a re-parse on the next refresh
+        self._mtime = self._file_mtime()
+
+    def schedule_save(self):
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.save_now()
+
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._delayed_save())
+
+    async def _delayed_save(self):
+        # Changes made during the delay are folded into the same write, changes made during the write get another one
+        while self._dirty:
+            await asyncio.sleep(self.save_delay)
+            self._dirty = False
+            data = self.dump()
+            await asyncio.to_thread(save_json_atomic, self.path, data)
+            self._mtime = self._file_mtime()
+
+    def _save_pending(self):
+        # A debounced write cancelled by shutdown is done synchronously at exit
+        if self._dirty:
+            self.save_now()
+
+    async def flush(self):
+        if self._save_task is not None and not self._save_task.done():
+            await self._save_task
+
+
+@atexit.register
+def save_pending():
+    for cache in list(_caches):
+        cache._save_pending()
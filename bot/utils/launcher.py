@@ -1,10 +1,28 @@
 import asyncio
 import argparse
+import os
+import signal
+import sys
 from random import randint
+from time import perf_counter
+from types import SimpleNamespace
 from better_proxy import Proxy
 
+from bot.config import settings
 from bot.utils import logger
-from bot.core.tapper import run_tapper
+from bot.utils.clock import clock
+from bot.utils.logger import configure_logging
+from bot.utils.metrics import metrics
+from bot.utils.profiler import profiler
+from bot.utils.replay import load_recording
+from bot.utils.token_cache import token_cache
+from bot.utils.tracing import tracer
+from bot.core.connector_pool import connector_pool
+from bot.core.limiter import TokenBucket
+from bot.core.scheduler import Scheduler
+from bot.core.supervisor import Supervisor, shard_accounts
+from bot.core.tg_pool import tg_pool
+from bot.core.tapper import Tapper, schedule_tapper
 from bot.core.registrator import register_sessions, get_tg_client
 from bot.utils.accounts import Accounts
 from bot.utils.firstrun import load_session_names
@@ -33,7 +51,15 @@ def get_proxy(raw_proxy: str) -> Proxy:
 async def process() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-a", "--action", type=int, help="Action to perform (1/2)")
-    action = parser.parse_args().action
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes to split accounts across")
+    parser.add_argument("--replay", help="Run one cycle per account against recorded traffic (file or folder)")
+    parser.add_argument("--replay-speed", type=float, default=0, help="Speed-up of delays while replaying (0 - no delays)")
+    args = parser.parse_args()
+    action = args.action
+    setup_logging()
+
+    if args.replay:
+        return await run_replay(path=args.replay, speed=args.replay_speed)
 
     if not action:
         print_banner()
@@ -55,16 +81,124 @@ async def process() -> None:
         await register_sessions()
     elif action == 1:
         accounts = await Accounts().get_accounts()
-        await run_tasks(accounts=accounts, used_session_names=used_session_names)
+        if args.workers > 1:
+            shards = shard_accounts(accounts, args.workers)
+            await Supervisor(target=run_worker, shards=shards, args=(used_session_names,)).run()
+        else:
+            install_profiler()
+            await start_metrics(port=settings.METRICS_PORT)
+            await run_tasks(accounts=accounts, used_session_names=used_session_names)
+
+
+async def start_metrics(port: int):
+    if port <= 0:
+        return None
+    runner = await metrics.serve(host=settings.METRICS_HOST, port=port, routes={"/profile": profiler.handle})
+    logger.info(f"Metrics are served on <y>http://{settings.METRICS_HOST}:{port}/metrics</y>")
+    return runner
+
+
+def install_profiler():
+    # SIGUSR1 (or GET /profile?seconds=N on the metrics port) takes a CPU and memory capture
+    if not hasattr(signal, "SIGUSR1"):
+        return
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, profiler.trigger)
+    logger.info(f"Send SIGUSR1 to process <y>{os.getpid()}</y> to profile it for {settings.PROFILE_SECONDS}s")
+
+def setup_logging(sink=sys.stdout, colorize=None, default_name: str = "bot"):
+    configure_logging(settings.LOG_MODE, sink=sink, colorize=colorize, sample=settings.LOG_SAMPLE,
+                      sample_window=settings.LOG_SAMPLE_WINDOW, directory=settings.LOG_DIR,
+                      file_size=settings.LOG_FILE_SIZE, default_name=default_name)
+
 
-async def run_tasks(accounts, used_session_names: str):
-    tasks = []
-    for account in accounts:
+async def run_tasks(accounts, used_session_names: str, scheduler: Scheduler | None = None):
+    if scheduler is None:
+        scheduler = Scheduler(workers=settings.SCHEDULER_WORKERS, max_cycles=settings.SCHEDULER_MAX_CYCLES,
+                              quiet_hours=settings.NIGHT_TIME if settings.NIGHT_MODE else None, quiet_check=settings.NIGHT_CHECKING)
+
+    # Accounts start at STARTS_PER_SECOND, client setup and preflight of each run concurrently
+    ramp = TokenBucket(rate=settings.STARTS_PER_SECOND)
+
+    async def start(account):
         session_name, user_agent, raw_proxy = account.values()
-        first_run = session_name not in used_session_names
-        tg_client = await get_tg_client(session_name=session_name, proxy=raw_proxy)
-        proxy = get_proxy(raw_proxy=raw_proxy)
-        tasks.append(asyncio.create_task(run_tapper(tg_client=tg_client, user_agent=user_agent, proxy=proxy, first_run=first_run)))
-        await asyncio.sleep(randint(5, 20))
+        await ramp.acquire()
+        delay = randint(settings.START_DELAY[0], settings.START_DELAY[1])
+        try:
+            tg_client = await get_tg_client(session_name=session_name, proxy=raw_proxy)
+            proxy = get_proxy(raw_proxy=raw_proxy)
+            await schedule_tapper(scheduler, tg_client=tg_client, user_agent=user_agent, proxy=proxy,
+                                  first_run=session_name not in used_session_names, delay=delay)
+        except Exception as error:
+            logger.error(f"{session_name} | Can't start: {error}")
+            return
+
+        logger.info(f"{session_name} | Starting in {delay} seconds")
+
+    async def ramp_up():
+        try:
+            await asyncio.gather(*(start(account) for account in accounts))
+        finally:
+            scheduler.close()
+
+    await asyncio.gather(scheduler.run(), ramp_up())
+
+
+async def report_status(index: int, scheduler: Scheduler, events, interval: float = 15):
+    while True:
+        events.put(("status", index, {
+            **scheduler.stats(),
+            "tg_connected": tg_pool.stats()["connected"],
+            "http_connectors": connector_pool.stats()["connectors"],
+        }))
+        await asyncio.sleep(interval)
+
+
+async def run_shard(index: int, accounts, used_session_names, events):
+    scheduler = Scheduler(workers=settings.SCHEDULER_WORKERS, max_cycles=settings.SCHEDULER_MAX_CYCLES,
+                          quiet_hours=settings.NIGHT_TIME if settings.NIGHT_MODE else None, quiet_check=settings.NIGHT_CHECKING)
+    reporter = asyncio.create_task(report_status(index, scheduler, events))
+    install_profiler()
+    # Every worker has its own metrics, served on METRICS_PORT + worker index
+    await start_metrics(port=settings.METRICS_PORT + index if settings.METRICS_PORT > 0 else 0)
+    try:
+        await run_tasks(accounts=accounts, used_session_names=used_session_names, scheduler=scheduler)
+    finally:
+        reporter.cancel()
+
+
+def run_worker(index: int, accounts, used_session_names, events):
+    """Entry point of a worker process started by the supervisor."""
+    setup_logging(sink=lambda message: events.put(("log", index, str(message))), colorize=True, default_name=f"worker-{index}")
+
+    # Each worker keeps its own token file, they would overwrite each other's entries otherwise
+    root, ext = os.path.splitext(settings.TOKEN_CACHE_PATH)
+    token_cache.path = f"{root}.{index}{ext}"
+    token_cache.refresh(force=True)
+
+    try:
+        asyncio.run(run_shard(index, accounts, used_session_names, events))
+    except KeyboardInterrupt:
+        pass
+
+
+async def run_replay(path: str, speed: float = 0):
+    sessions = load_recording(path)
+    if not sessions:
+        return logger.error(f"No recorded traffic found in {path}")
+
+    clock.scale = 1 / speed if speed > 0 else 0
+    tappers = [Tapper(tg_client=SimpleNamespace(name=name), first_run=False, replay=session)
+               for name, session in sessions.items()]
+    logger.info(f"Replaying <y>{len(tappers)}</y> recorded accounts from {path}")
+
+    started_at = perf_counter()
+    results = await asyncio.gather(*(tapper.run_once(proxy=None) for tapper in tappers), return_exceptions=True)
+    elapsed = perf_counter() - started_at
+    await tracer.flush()
+
+    for tapper, result in zip(tappers, results):
+        stats = tapper.replay.stats()
+        status = f"<r>{result!r}</r>" if isinstance(result, BaseException) else "<g>done</g>" if result is not None else "<r>stopped</r>"
+        logger.info(f"{tapper.session_name} | Replay {status} | Served: <y>{stats['served']}</y> | Not recorded: <y>{stats['misses']}</y> | Unused: <y>{stats['unused']}</y>")
 
-    await asyncio.gather(*tasks)
\ No newline at end of file
+    logger.info(f"Replay finished in <y>{round(elapsed, 3)}</y>s")
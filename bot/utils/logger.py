@@ -1,11 +1,162 @@
+import json
+import os
+import re
 import sys
-from loguru import logger
+import threading
+from collections import OrderedDict
+from time import monotonic
 
+from loguru import logger as _logger
 
-logger.remove()
-logger.add(sink=sys.stdout, format="<white>BUMS 2.1</white>"
-                                   " | <white>{time:YYYY-MM-DD HH:mm:ss}</white>"
-                                   " | <level>{level: <8}</level>"
-                                   " | <cyan><b>{line}</b></cyan>"
-                                   " - <white><b>{message}</b></white>")
-logger = logger.opt(colors=True)
+
+LOG_FORMAT = ("<white>BUMS 2.1</white>"
+              " | <white>{time:YYYY-MM-DD HH:mm:ss}</white>"
+              " | <level>{level: <8}</level>"
+              " | <cyan><b>{line}</b></cyan>"
+              " - <white><b>{message}</b></white>")
+
+# Color markup used in messages (<y>, <g>, </r>, ...), dropped from JSON output
+MARKUP = re.compile(r"</?[a-z][a-z ]*>")
+
+
+def set_sink(sink, **kwargs):
+    # Worker processes swap stdout for a sink that forwards lines to the supervisor
+    _logger.remove()
+    _logger.add(sink=sink, format=LOG_FORMAT, **kwargs)
+
+
+def split_session(message: str) -> tuple:
+    # Account lines are written as "<session name> | <text>"
+    session, separator, text = message.partition(" | ")
+    if separator and session and " " not in session:
+        return session, text
+    return None, message
+
+
+def json_format(record) -> str:
+    # Both production handlers share the record, the JSON line is built once
+    if "json" in record["extra"]:
+        return "{extra[json]}\n"
+    session, text = split_session(MARKUP.sub("", record["message"]))
+    entry = {
+        "time": record["time"].isoformat(timespec="milliseconds"),
+        "level": record["level"].name,
+        "session": session,
+        "message": text,
+        "where": f"{record['name']}:{record['line']}",
+    }
+    if record["extra"].get("suppressed"):
+        entry["suppressed"] = record["extra"]["suppressed"]
+    if record["exception"]:
+        entry["exception"] = repr(record["exception"].value)
+    record["extra"]["json"] = json.dumps(entry, ensure_ascii=False)
+    return "{extra[json]}\n"
+
+
+class LogSampler:
+    """Lets one message per `window` seconds through for each repetitive kind of line.
+
+    A message is repetitive when it contains one of `patterns`, e.g.
+    "Tapped" or "Sleep". Windows are kept per account, so a noisy account
+    doesn't hide the same line of the others. The line that opens a new
+    window carries the number of lines dropped in the previous one as
+    `suppressed`. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, patterns, window: float):
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self.window = window
+        self.suppressed = {}
+        self._window_end = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record) -> bool:
+        if record["level"].no >= 30:
+            return True
+        message = record["message"]
+        for pattern in self.patterns:
+            if pattern in message:
+                break
+        else:
+            return True
+
+        key = (split_session(message)[0], pattern)
+        now = monotonic()
+        with self._lock:
+            if now < self._window_end.get(key, 0):
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            self._window_end[key] = now + self.window
+            record["extra"]["suppressed"] = self.suppressed.pop(key, 0)
+        return True
+
+
+class AccountFiles:
+    """Sink writing each account's lines to its own rotating file in `directory`.
+
+    Lines without an account go to `<default_name>.log`. At most
+    `max_open` files are kept open, least recently used are closed first;
+    a file past `max_bytes` is renamed to `<name>.log.1` (shifting older
+    ones up to `backups`). Loguru calls `stop` when the handler is
+    removed, which it also does at exit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, backups: int = 3, max_open: int = 256, default_name: str = "bot"):
+        self.directory = directory
+        self.default_name = default_name
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_open = max_open
+        self._files = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, message):
+        session, _ = split_session(message.record["message"])
+        name = session or self.default_name
+        file = self._open(name)
+        file.write(message)
+        if file.tell() >= self.max_bytes:
+            self._rotate(name)
+
+    def stop(self):
+        while self._files:
+            self._files.popitem()[1].close()
+
+    def _open(self, name: str):
+        file = self._files.get(name)
+        if file is not None:
+            self._files.move_to_end(name)
+            return file
+        if len(self._files) >= self.max_open:
+            self._files.popitem(last=False)[1].close()
+        file = self._files[name] = open(os.path.join(self.directory, f"{name}.log"), "a", encoding="utf8", buffering=1)
+        return file
+
+    def _rotate(self, name: str):
+        self._files.pop(name).close()
+        path = os.path.join(self.directory, f"{name}.log")
+        for number in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{number}"):
+                os.replace(f"{path}.{number}", f"{path}.{number + 1}")
+        os.replace(path, f"{path}.1")
+
+
+def configure_logging(mode: str, sink=sys.stdout, colorize=None, sample=(), sample_window: float = 60,
+                      directory: str = "logs", file_size: int = 10, default_name: str = "bot"):
+    """Pretty colored lines (the default), or the production mode for large fleets.
+
+    Production writes JSON lines from a background thread (enqueue), samples
+    repetitive messages on `sink` and keeps every line of each account in
+    its own rotating file under `directory` (`file_size` in MB).
+    """
+    if mode != "production":
+        return set_sink(sink, colorize=colorize)
+
+    _logger.remove()
+    _logger.add(sink=sink, format=json_format, colorize=False, enqueue=True, filter=LogSampler(sample, sample_window))
+    files = AccountFiles(directory, max_bytes=file_size * 1024 * 1024, default_name=default_name)
+    _logger.add(sink=files, format=json_format, colorize=False, enqueue=True)
+
+
+set_sink(sys.stdout)
+logger = _logger.opt(colors=True)
@@ -0,0 +1,184 @@
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+
+from aiohttp import web
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """One metric family; samples are keyed by the tuple of label values, in `labels` order."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+
+    def key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def clear(self, **labels):
+        self._values.pop(self.key(labels), None)
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield self.name, format_labels(self.labels, key), value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self.key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; an observation is one bisect and three additions."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self.key(labels)
+        series = self._values.get(key)
+        if series is None:
+            # [count per bucket..., sum, count]
+            series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - started_at, **labels)
+
+    def samples(self):
+        for key, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", format_labels(self.labels, key, f'le="{format_value(bound)}"'), cumulative
+            yield f"{self.name}_sum", format_labels(self.labels, key), series[-2]
+            yield f"{self.name}_count", format_labels(self.labels, key), series[-1]
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text format on GET /metrics."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lag_task = None
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.render().encode("utf8"), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def watch_loop_lag(self, interval: float = 0.5):
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(loop.time() - started_at - interval, 0.0)
+            event_loop_lag.observe(lag)
+            event_loop_lag_last.set(lag)
+
+    async def serve(self, host: str, port: int, routes: dict | None = None) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        for path, handler in (routes or {}).items():
+            app.router.add_get(path, handler)
+            app.router.add_post(path, handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.create_task(self.watch_loop_lag())
+        return runner
+
+
+metrics = MetricsRegistry()
+
+api_request_seconds = metrics.histogram(
+    "bums_api_request_seconds", "Bums API request latency, limiter wait excluded", labels=("endpoint", "status"))
+api_retries = metrics.counter(
+    "bums_api_retries_total", "Bums API requests retried after an overload answer", labels=("endpoint", "status"))
+api_errors = metrics.counter(
+    "bums_api_errors_total", "Bums API requests that failed for good", labels=("endpoint", "status"))
+telegram_rpc_seconds = metrics.histogram(
+    "bums_telegram_rpc_seconds", "Telegram calls made to get the web app initData", labels=("method",))
+event_loop_lag = metrics.histogram(
+    "bums_event_loop_lag_seconds", "How late the event loop wakes up a sleeping task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+event_loop_lag_last = metrics.gauge("bums_event_loop_lag_last_seconds", "Last measured event loop lag")
+phase_active = metrics.gauge("bums_phase_active_accounts", "Accounts currently running a cycle phase", labels=("phase",))
+phase_seconds = metrics.histogram(
+    "bums_phase_seconds", "Wall time of a cycle phase, sleeps included", labels=("phase",),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800))
+account_mine_profit = metrics.gauge(
+    "bums_account_mine_profit_per_hour", "Mine profit per hour (minePower) reported by getGameInfo, not the realized rate", labels=("session",))
+account_coins = metrics.gauge("bums_account_coins", "Coin balance reported by getGameInfo", labels=("session",))
@@ -0,0 +1,118 @@
+import heapq
+from itertools import count
+
+from bot.core.models import Boost, MineCard, to_int
+
+
+def mine_payback(cost: int, reward_increase: int) -> float:
+    # Hours of the added profit needed to earn the card cost back
+    if reward_increase <= 0:
+        return float('inf')
+    return cost / reward_increase
+
+
+class MineUpgradePlanner:
+    """Orders mine-card purchases from a single getMineLists snapshot.
+
+    Cards are kept in a heap keyed by payback time (or list order when
+    `by_profit` is off) and bought against a local balance, so the whole
+    sequence is known without going back to the server after every upgrade.
+    The balance only changes in `advance`, once an upgrade went through; a
+    failed upgrade just drops its card for this plan.
+    """
+
+    def __init__(self, mine_list, balance: int, max_price: int, by_profit: bool = True):
+        self.balance = int(balance)
+        self.max_price = max_price
+        self.by_profit = by_profit
+        self._heap = []
+        self._order = count()
+        for mine in mine_list:
+            self.add(mine)
+
+    def add(self, mine: MineCard) -> bool:
+        if mine.status != 1 or mine.cost <= 0 or mine.cost > self.max_price:
+            return False
+
+        step = {"mineId": mine.mine_id, "level": mine.level, "cost": mine.cost, "reward": mine.reward_increase}
+        order = next(self._order)
+        key = mine_payback(mine.cost, step["reward"]) if self.by_profit else order
+        heapq.heappush(self._heap, (key, mine.cost, order, step))
+        return True
+
+    def next(self):
+        # The local balance only goes down, so a card we can't afford now is dropped for good
+        while self._heap:
+            _, cost, _, step = heapq.heappop(self._heap)
+            if cost <= self.balance:
+                return step
+        return None
+
+    def advance(self, step, data) -> bool:
+        # Called after a successful upgrade: pays for it, and a response describing
+        # the card's following level lets it compete again
+        coin = to_int(data.get('coin'), None) if isinstance(data, dict) else None
+        self.balance = coin if coin is not None else self.balance - step["cost"]
+        mine = MineCard.parse(data)
+        if mine is None or mine.mine_id != step["mineId"]:
+            return False
+        return self.add(mine)
+
+
+class TapUpgradePlanner:
+    """Orders boost (tap-card) upgrades from the tapInfo block already in hand.
+
+    Each successful upgrade is applied locally in `advance`: the cost comes
+    off the balance (or the balance is taken from the response) and the
+    level goes up by one. A failed upgrade changes neither. A boost only
+    competes again once its next cost is known from an upgradeLeve response.
+    """
+
+    def __init__(self, tap_info, balance: int, max_levels: dict):
+        self.balance = int(balance)
+        self.max_levels = max_levels
+        self.levels = {}
+        self._heap = []
+        for priority, card_type in enumerate(max_levels):
+            boost = tap_info.boosts.get(card_type) or Boost()
+            self.levels[card_type] = boost.level
+            self._push(card_type, boost, priority)
+
+    def _push(self, card_type, boost: Boost, priority=None) -> bool:
+        cost = boost.next_cost
+        if cost is None:
+            return False
+
+        if self.levels[card_type] >= self.max_levels[card_type]:
+            return False
+
+        if priority is None:
+            priority = list(self.max_levels).index(card_type)
+        # Cheapest first buys the most levels for the balance, config order breaks ties
+        heapq.heappush(self._heap, (cost, priority, card_type))
+        return True
+
+    @property
+    def all_upgraded(self) -> bool:
+        return all(self.levels.get(card_type, 0) >= max_level for card_type, max_level in self.max_levels.items())
+
+    def next(self):
+        while self._heap:
+            cost, _, card_type = heapq.heappop(self._heap)
+            if cost <= self.balance:
+                return {"type": card_type, "level": self.levels[card_type], "cost": cost}
+        return None
+
+    def advance(self, step, data) -> bool:
+        # Called after a successful upgrade
+        data = data if isinstance(data, dict) else {}
+        coin = to_int(data.get('coin'), None)
+        self.balance = coin if coin is not None else self.balance - step["cost"]
+        self.levels[step["type"]] = step["level"] + 1
+
+        boost = Boost.parse((data.get('tapInfo') or data).get(step["type"]))
+        if boost is None:
+            return False
+
+        self.levels[step["type"]] = boost.level or self.levels[step["type"]]
+        return self._push(step["type"], boost)
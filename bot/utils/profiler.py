@@ -0,0 +1,140 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from aiohttp import web
+
+from bot.config import settings
+from bot.utils import logger
+
+
+class SamplingProfiler:
+    """CPU and memory captures of a running bot, without stopping it.
+
+    `trigger` samples the event loop thread's stack every `interval`
+    seconds from a helper thread for the given time, then takes a
+    tracemalloc snapshot. tracemalloc only runs during the capture, so the
+    memory report shows what was allocated in that window and is still
+    alive. When tracing is already on (PYTHONTRACEMALLOC=1), it is left on
+    and each capture is diffed against the previous one instead. Both
+    reports are written to `path` as timestamped text files; the CPU one
+    ends with the raw stacks in the collapsed format flame graph tools read.
+    """
+
+    def __init__(self, path: str, seconds: float, interval: float = 0.005, top: int = 40):
+        self.path = path
+        self.seconds = seconds
+        self.interval = interval
+        self.top = top
+        self.captures = 0
+        self.running = False
+        self._snapshot = None
+
+    def trigger(self, seconds: float | None = None) -> bool:
+        if self.running:
+            logger.warning("Profiler | A capture is already running")
+            return False
+        self.running = True
+        asyncio.get_running_loop().create_task(self.capture(seconds or self.seconds))
+        return True
+
+    async def capture(self, seconds: float):
+        # Tracing slows every allocation down, it is only kept on if it was on before
+        persistent = tracemalloc.is_tracing()
+        try:
+            if not persistent:
+                tracemalloc.start()
+            logger.info(f"Profiler | Sampling the event loop for <y>{seconds}</y>s")
+
+            stacks, samples = await asyncio.to_thread(self.sample, threading.get_ident(), seconds)
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            traced = tracemalloc.get_traced_memory()
+            if not persistent:
+                tracemalloc.stop()
+            previous, self._snapshot = (self._snapshot, snapshot) if persistent else (None, None)
+
+            stamp = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+            cpu_path = os.path.join(self.path, f"cpu-{stamp}.txt")
+            memory_path = os.path.join(self.path, f"memory-{stamp}.txt")
+            await asyncio.to_thread(self.write, cpu_path, self.cpu_report(stacks, samples, seconds))
+            await asyncio.to_thread(self.write, memory_path, self.memory_report(snapshot, previous, traced))
+
+            self.captures += 1
+            logger.success(f"Profiler | <g>Profile written</g> to {cpu_path} and {memory_path}")
+        except Exception as error:
+            logger.error(f"Profiler | Capture failed: {error}")
+        finally:
+            if not persistent and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.running = False
+
+    def sample(self, thread_id: int, seconds: float) -> tuple:
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stacks[";".join(reversed(stack))] += 1
+                samples += 1
+            time.sleep(self.interval)
+        return stacks, samples
+
+    def cpu_report(self, stacks: Counter, samples: int, seconds: float) -> str:
+        own, total = Counter(), Counter()
+        for stack, count in stacks.items():
+            functions = stack.split(";")
+            own[functions[-1]] += count
+            for function in set(functions):
+                total[function] += count
+
+        def table(counter):
+            return [f"{count / samples * 100:6.2f}%  {count:7d}  {function}" for function, count in counter.most_common(self.top)]
+
+        lines = [f"Sampled the event loop thread for {seconds}s every {self.interval}s: {samples} samples", ""]
+        if samples:
+            lines += ["Own time (where the loop thread was):", *table(own), "",
+                      "Total time (own plus callees):", *table(total), "",
+                      "Collapsed stacks:", *(f"{stack} {count}" for stack, count in stacks.most_common())]
+        return "\n".join(lines) + "\n"
+
+    def memory_report(self, snapshot, previous, traced: tuple) -> str:
+        current, peak = traced
+        lines = [f"Traced memory: {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB", ""]
+        if previous is None:
+            lines.append("Largest allocations since tracing started, still alive:")
+            lines += [str(stat) for stat in snapshot.statistics("lineno")[:self.top]]
+        else:
+            lines.append("Change since the previous capture:")
+            lines += [str(stat) for stat in snapshot.compare_to(previous, "lineno")[:self.top]]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def write(path: str, text: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf8") as file:
+            file.write(text)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        try:
+            seconds = float(request.query.get("seconds") or self.seconds)
+        except ValueError:
+            return web.json_response({"error": "seconds must be a number"}, status=400)
+        started = self.trigger(seconds)
+        return web.json_response({"started": started, "seconds": seconds, "path": self.path}, status=202 if started else 409)
+
+
+profiler = SamplingProfiler(path=settings.PROFILE_PATH, seconds=settings.PROFILE_SECONDS)
@@ -0,0 +1,113 @@
+import asyncio
+import atexit
+import gzip
+import json
+import os
+import shutil
+import threading
+from collections import deque
+from datetime import datetime
+
+from bot.config import settings
+
+
+class TrafficRecorder:
+    """Buffered JSONL log of API traffic, written by a background task.
+
+    `record` only appends to an in-memory buffer, so it is cheap enough to
+    call on every request. The writer flushes the buffer every
+    `flush_interval` seconds (or once `batch_size` records are waiting) from
+    a thread, and rotates the file once it grows past `max_bytes`; rotated
+    files are gzipped when `compress` is set. If the buffer reaches
+    `max_pending` records, new ones are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, path: str, max_bytes: int, compress: bool = True, flush_interval: float = 1.0,
+                 batch_size: int = 500, max_pending: int = 50000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self._buffer = deque()
+        self._writer = None
+        self._wakeup = None
+        self._lock = threading.Lock()
+        atexit.register(self._write_pending)
+
+    def record(self, entry: dict):
+        if len(self._buffer) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._buffer.append(entry)
+
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        while self._buffer:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await asyncio.to_thread(self._write_pending)
+
+    def _take(self) -> list:
+        batch = []
+        while self._buffer:
+            batch.append(self._buffer.popleft())
+        return batch
+
+    def _write_pending(self):
+        with self._lock:
+            self._write_batch(self._take())
+
+    def _write_batch(self, batch: list):
+        if not batch:
+            return
+
+        lines = "".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in batch)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf8") as file:
+            file.write(lines)
+            size = file.tell()
+        self.written += len(batch)
+
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        root, ext = os.path.splitext(self.path)
+        rotated = f"{root}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{ext}"
+        os.replace(self.path, rotated)
+        self.rotations += 1
+
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(f"{rotated}.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+
+    async def flush(self):
+        if self._writer is not None and not self._writer.done():
+            self._wakeup.set()
+        await asyncio.to_thread(self._write_pending)
+
+    def stats(self) -> dict:
+        return {"pending": len(self._buffer), "written": self.written, "dropped": self.dropped, "rotations": self.rotations}
+
+
+recorder = TrafficRecorder(
+    path=settings.RECORD_PATH,
+    max_bytes=settings.RECORD_MAX_SIZE * 1024 * 1024,
+    compress=settings.RECORD_COMPRESS,
+)
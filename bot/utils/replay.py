@@ -0,0 +1,97 @@
+import glob
+import gzip
+import json
+import os
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from bot.utils.clock import clock
+
+LOGIN_PATH = "/miniapps/api/user/telegram_auth"
+
+
+def recording_files(path: str) -> list:
+    if os.path.isdir(path):
+        # Rotated files sort before the live one, so this is recording order
+        return sorted(glob.glob(os.path.join(path, "*.jsonl")) + glob.glob(os.path.join(path, "*.jsonl.gz")))
+    return [path]
+
+
+def load_recording(path: str) -> dict:
+    """Reads traffic recorded with SAVE_RESPONSE_DATA into one ReplaySession per account."""
+    records = defaultdict(list)
+    for file_path in recording_files(path):
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                records[record.get("session")].append(record)
+    return {session: ReplaySession(session, session_records) for session, session_records in records.items()}
+
+
+class ReplayResponse:
+    """Just enough of aiohttp.ClientResponse for make_request."""
+
+    def __init__(self, method: str, url: str, status: int, headers: dict, body):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self.body = body
+
+    def raise_for_status(self):
+        if self.status < 400:
+            return
+        request_info = aiohttp.RequestInfo(URL(self.url), self.method, CIMultiDictProxy(CIMultiDict()), URL(self.url))
+        raise aiohttp.ClientResponseError(request_info=request_info, history=(), status=self.status,
+                                          message=str(self.body), headers=self.headers)
+
+    async def json(self):
+        return self.body
+
+
+class ReplaySession:
+    """Recorded responses of one account, served per endpoint in recording order."""
+
+    def __init__(self, name: str, records: list):
+        self.name = name
+        self.queues = defaultdict(deque)
+        self.served = 0
+        self.misses = 0
+        self.login_request = None
+
+        for record in records:
+            self.queues[self.key(record["method"], record["url"])].append(record)
+            if self.login_request is None and urlsplit(record["url"]).path == LOGIN_PATH:
+                self.login_request = record.get("request") or {}
+
+    @staticmethod
+    def key(method: str, url: str):
+        parts = urlsplit(url)
+        return method.upper(), parts.path, parts.query
+
+    def web_data(self):
+        # The recorded telegram_auth form carries the initData Telegram handed out at the time
+        request = self.login_request or {}
+        return request.get("invitationCode", ""), request.get("initData", "")
+
+    async def request(self, method: str, url: str) -> ReplayResponse:
+        queue = self.queues.get(self.key(method, url))
+        if not queue:
+            self.misses += 1
+            return ReplayResponse(method, url, 404, {}, "Not in recording")
+
+        record = queue.popleft()
+        self.served += 1
+        await clock.sleep(record.get("elapsed") or 0)
+        return ReplayResponse(method, url, record["status"], record.get("headers"), record.get("response"))
+
+    def stats(self) -> dict:
+        return {"served": self.served, "misses": self.misses, "unused": sum(len(queue) for queue in self.queues.values())}
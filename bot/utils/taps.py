@@ -0,0 +1,151 @@
+import math
+import random
+from time import monotonic
+
+
+def bonus_probability(bonus_chance) -> float:
+    # bonusChance is in hundredths of a percent (500 -> 5%), the unit the former generate_taps used:
+    # randint(0, 100) <= bonusChance / 100 rolled a percentage, with one extra chance from the inclusive bounds
+    return min(max(bonus_chance / 10000, 0.0), 1.0)
+
+
+def count_bonus_taps(taps: int, probability: float, rng=random) -> int:
+    """Binomial(taps, probability) draw in O(hits) by skipping geometric gaps."""
+    if taps <= 0 or probability <= 0:
+        return 0
+    if probability >= 1:
+        return taps
+
+    log_miss = math.log1p(-probability)
+    hits, position = 0, -1
+    while True:
+        position += int(math.log(1.0 - rng.random()) / log_miss) + 1
+        if position >= taps:
+            return hits
+        hits += 1
+
+
+def plan_tap_batches(tap_value: int, left_energy: int, coin_room: int, bonus_chance: int,
+                     bonus_ratio: int, max_taps: int, rng=random, min_taps: int = 1) -> list:
+    """Splits the usable energy into the fewest collectCoin batches of `min_taps` to `max_taps` taps.
+
+    Returns a list of (taps, amount) pairs. The amount of a batch includes
+    bonus taps worth `bonus_ratio` percent of a normal tap and never exceeds
+    the energy or today's coin limit left. Taps that don't fill a batch of
+    `min_taps` are left for later.
+    """
+    budget = min(left_energy, coin_room)
+    min_taps = max(min_taps, 1)
+    if tap_value <= 0 or max_taps < min_taps or budget < tap_value * min_taps:
+        return []
+
+    total_taps = budget // tap_value
+    batch_count = math.ceil(total_taps / max_taps)
+    if total_taps // batch_count < min_taps:
+        # Evenly split batches would be too small, full ones are sent and the rest waits
+        batch_count -= 1
+        total_taps = batch_count * max_taps
+    per_batch = math.ceil(total_taps / batch_count)
+
+    bonus_extra = max(tap_value * bonus_ratio // 100 - tap_value, 0)
+    probability = bonus_probability(bonus_chance)
+
+    batches = []
+    while total_taps > 0 and budget >= tap_value:
+        taps = min(per_batch, total_taps, budget // tap_value)
+        if taps < min_taps:
+            break
+        base = taps * tap_value
+        bonus = count_bonus_taps(taps, probability, rng) if bonus_extra else 0
+        if bonus:
+            bonus = min(bonus, (budget - base) // bonus_extra)
+
+        amount = base + bonus * bonus_extra
+        batches.append((taps, amount))
+        budget -= amount
+        total_taps -= taps
+
+    return batches
+
+
+def _first_int(data: dict, *keys):
+    for key in keys:
+        try:
+            return int(data[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class TapState:
+    """Local model of the tap-related fields of getGameInfo (a GameInfo).
+
+    After each collectCoin the sequence number, energy and today's coin are
+    taken from the response when it carries them, otherwise advanced
+    locally. Energy regenerates at `recovery` per second between batches.
+    """
+
+    def __init__(self, game_info):
+        self.sync(game_info)
+
+    def sync(self, game_info) -> int:
+        drift = abs(getattr(self, 'left_energy', game_info.left_energy) - game_info.left_energy)
+        self.left_energy = game_info.left_energy
+        self.total_energy = game_info.tap_info.total_energy
+        self.recovery = game_info.tap_info.recovery
+        self.today_coin = game_info.today_coin
+        self.today_coin_limit = game_info.today_coin_limit
+        self.collect_seq = game_info.tap_info.collect_seq
+        self.confirmed = True
+        self.updated_at = monotonic()
+        return drift
+
+    @property
+    def coin_room(self) -> int:
+        return max(self.today_coin_limit - self.today_coin, 0)
+
+    def regenerate(self):
+        now = monotonic()
+        gained = int((now - self.updated_at) * self.recovery)
+        if gained > 0:
+            self.left_energy = min(self.left_energy + gained, self.total_energy)
+            self.updated_at = now
+
+    def apply(self, amount: int, response_data=None):
+        data = response_data if isinstance(response_data, dict) else {}
+        collect_seq = _first_int(data, 'collectSeqNo')
+        left_energy = _first_int(data, 'energySurplus', 'leftEnergy')
+        today_coin = _first_int(data, 'todayCollegeCoin')
+
+        self.collect_seq = collect_seq if collect_seq is not None else self.collect_seq + 1
+        self.left_energy = left_energy if left_energy is not None else max(self.left_energy - amount, 0)
+        self.today_coin = today_coin if today_coin is not None else self.today_coin + amount
+        self.confirmed = None not in (collect_seq, left_energy)
+        self.updated_at = monotonic()
+
+    def seconds_to_energy(self, energy: int) -> float:
+        missing = min(energy, self.total_energy) - self.left_energy
+        if missing <= 0:
+            return 0.0
+        return missing / self.recovery if self.recovery > 0 else math.inf
+
+
+def next_tap_wakeup(state: TapState, reset_in: float, fill: float, min_delay: float = 60) -> float | None:
+    """Seconds until the next wakeup worth tapping for.
+
+    That is when energy is back to `fill` of the capacity, or of what today's
+    coin limit still allows if that is less. Once the limit is used up
+    nothing can be tapped before the daily reset, which is `reset_in`
+    seconds away. Returns None when energy doesn't regenerate.
+    """
+    if state.coin_room <= 0:
+        return max(reset_in, min_delay)
+
+    target = min(int(state.total_energy * fill), state.coin_room)
+    delay = state.seconds_to_energy(target)
+    if math.isinf(delay):
+        return None
+    if delay > reset_in:
+        # After the reset the coin limit is back, so the full capacity is the goal
+        delay = state.seconds_to_energy(int(state.total_energy * fill))
+    return max(delay, min_delay)
@@ -0,0 +1,95 @@
+import base64
+import copy
+import json
+from time import time
+
+from bot.config import settings
+from bot.utils.json_cache import JsonFileCache
+
+
+def token_expiry(token: str):
+    # JWT tokens carry their own expiry in the payload
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + '=' * (-len(parts[1]) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return int(exp) if exp else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenCache(JsonFileCache):
+    """Bearer tokens per session, persisted with their expiry.
+
+    Tokens that aren't JWTs get TOKEN_TTL seconds. When the API answers 401
+    earlier than that, the account's next tokens get the lifetime actually
+    observed; every token that is replaced without having been rejected
+    lets the estimate grow back by `growth` towards TOKEN_TTL. The learned
+    lifetimes are per account and kept in memory only, so one early 401
+    neither shortens other accounts' tokens nor survives a restart.
+    """
+
+    def __init__(self, path: str, default_ttl: int, growth: float = 1.25):
+        self.tokens = {}
+        self.default_ttl = default_ttl
+        self.growth = growth
+        self.learned_ttl = {}
+        super().__init__(path)
+
+    def parse(self, data):
+        if not isinstance(data, dict):
+            data = {}
+        self.tokens = data.get("tokens", {})
+
+    def dump(self):
+        return {"tokens": copy.deepcopy(self.tokens)}
+
+    def get(self, session_name: str, margin: int = 0):
+        self.refresh()
+        entry = self.tokens.get(session_name)
+        if not entry or entry.get("expires_at", 0) - margin <= time():
+            return None
+        return entry["token"]
+
+    def expires_in(self, session_name: str) -> float:
+        entry = self.tokens.get(session_name)
+        return entry.get("expires_at", 0) - time() if entry else 0
+
+    def ttl(self, session_name: str) -> int:
+        return min(self.default_ttl, self.learned_ttl.get(session_name, self.default_ttl))
+
+    def set(self, session_name: str, token: str):
+        # A previous entry still present was never rejected, so the shortened lifetime may be too short
+        learned = self.learned_ttl.get(session_name)
+        if learned is not None and session_name in self.tokens:
+            learned = int(learned * self.growth)
+            if learned >= self.default_ttl:
+                del self.learned_ttl[session_name]
+            else:
+                self.learned_ttl[session_name] = learned
+
+        now = int(time())
+        self.tokens[session_name] = {
+            "token": token,
+            "issued_at": now,
+            "expires_at": token_expiry(token) or now + self.ttl(session_name),
+        }
+        self.schedule_save()
+
+    def invalidate(self, session_name: str, token: str = None):
+        entry = self.tokens.get(session_name)
+        if not entry or (token is not None and entry["token"] != token):
+            return
+
+        if not token_expiry(entry["token"]):
+            lifetime = int(time()) - entry.get("issued_at", 0)
+            if 0 < lifetime < self.ttl(session_name):
+                self.learned_ttl[session_name] = lifetime
+
+        del self.tokens[session_name]
+        self.schedule_save()
+
+
+token_cache = TokenCache(path=settings.TOKEN_CACHE_PATH, default_ttl=settings.TOKEN_TTL)
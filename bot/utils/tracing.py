@@ -0,0 +1,243 @@
+import asyncio
+import os
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter, time
+
+import aiohttp
+
+from bot.config import settings
+from bot.utils.recorder import TrafficRecorder
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed unit of work: a cycle, a phase, an API call or a Telegram call.
+
+    Used as a context manager. Spans opened inside it (in the same task or
+    in tasks it starts) become its children, every API request made inside
+    it is added to `requests`, and an exception leaving it marks it failed.
+    """
+
+    __slots__ = ("tracer", "name", "kind", "trace_id", "span_id", "parent", "attributes",
+                 "requests", "status", "error", "started_at", "_started", "_token")
+
+    def __init__(self, tracer, name: str, kind: str, parent, attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes = attributes
+        self.requests = 0
+        self.status = "ok"
+        self.error = None
+
+    def __enter__(self):
+        self.started_at = time()
+        self._started = perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = perf_counter() - self._started
+        _current_span.reset(self._token)
+        if exc_type is not None and self.status == "ok":
+            self.fail(exc_type.__name__ if not str(exc) else f"{exc_type.__name__}: {exc}")
+        self.tracer.export(self, duration)
+        return False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error: str):
+        self.status = "error"
+        self.error = error
+
+    def add_request(self):
+        span = self
+        while span is not None:
+            span.requests += 1
+            span = span.parent
+
+
+class NoopSpan:
+    """Returned while tracing is off, so instrumented code costs one attribute lookup."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+    def fail(self, error: str):
+        pass
+
+    def add_request(self):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class OtlpExporter:
+    """Posts finished spans to an OTLP/HTTP collector as JSON, batched by a background task.
+
+    Like TrafficRecorder, `record` only buffers; spans past `max_pending`
+    and batches the collector refuses are counted in `dropped`.
+    """
+
+    def __init__(self, url: str, service: str = "bums-bot", flush_interval: float = 2.0,
+                 batch_size: int = 1000, max_pending: int = 50000):
+        self.url = url.rstrip("/") + "/v1/traces"
+        self.service = service
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.written = 0
+        self.dropped = 0
+        self._buffer = deque()
+        self._writer = None
+        self._wakeup = None
+
+    def record(self, entry: dict):
+        if len(self._buffer) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._buffer.append(entry)
+
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        async with aiohttp.ClientSession() as session:
+            while self._buffer:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                while self._buffer:
+                    batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                    await self._post(session, batch)
+
+    async def _post(self, session: aiohttp.ClientSession, batch: list):
+        try:
+            async with session.post(self.url, json=self.payload(batch), timeout=aiohttp.ClientTimeout(10)) as response:
+                response.raise_for_status()
+            self.written += len(batch)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.dropped += len(batch)
+
+    def payload(self, batch: list) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [otlp_attribute("service.name", self.service)]},
+            "scopeSpans": [{"scope": {"name": "bot"}, "spans": [otlp_span(entry) for entry in batch]}],
+        }]}
+
+    async def flush(self):
+        if self._writer is not None and not self._writer.done():
+            self._wakeup.set()
+            await self._writer
+
+    def stats(self) -> dict:
+        return {"pending": len(self._buffer), "written": self.written, "dropped": self.dropped}
+
+
+def otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def otlp_span(entry: dict) -> dict:
+    start = int(entry["start"] * 1e9)
+    attributes = {**entry["attributes"], "span.kind": entry["kind"], "requests": entry["requests"]}
+    if entry["session"]:
+        attributes["session"] = entry["session"]
+    span = {
+        "traceId": entry["trace_id"],
+        "spanId": entry["span_id"],
+        "name": entry["name"],
+        # SPAN_KIND_CLIENT for calls leaving the process, SPAN_KIND_INTERNAL otherwise
+        "kind": 3 if entry["kind"] in ("api", "telegram") else 1,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(start + int(entry["duration"] * 1e9)),
+        "attributes": [otlp_attribute(key, value) for key, value in attributes.items()],
+        "status": {"code": 2, "message": entry["error"] or ""} if entry["status"] == "error" else {"code": 1},
+    }
+    if entry["parent_id"]:
+        span["parentSpanId"] = entry["parent_id"]
+    return span
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter; does nothing while `exporter` is None."""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.spans = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def span(self, name: str, kind: str = "internal", **attributes):
+        if self.exporter is None:
+            return NOOP_SPAN
+        return Span(self, name, kind, _current_span.get(), attributes)
+
+    @staticmethod
+    def current():
+        return _current_span.get() or NOOP_SPAN
+
+    def export(self, span: Span, duration: float):
+        self.spans += 1
+        root = span
+        while root.parent is not None:
+            root = root.parent
+        self.exporter.record({
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent.span_id if span.parent else None,
+            "name": span.name,
+            "kind": span.kind,
+            # Spans only carry the account on the cycle span, children inherit it
+            "session": span.attributes.get("session") or root.attributes.get("session"),
+            "start": round(span.started_at, 6),
+            "duration": round(duration, 6),
+            "status": span.status,
+            "error": span.error,
+            "requests": span.requests,
+            "attributes": {key: value for key, value in span.attributes.items() if key != "session"},
+        })
+
+    async def flush(self):
+        if self.exporter is not None:
+            await self.exporter.flush()
+
+
+def make_exporter():
+    if not settings.TRACE_SPANS:
+        return None
+    if settings.TRACE_OTLP_URL:
+        return OtlpExporter(url=settings.TRACE_OTLP_URL)
+    return TrafficRecorder(path=settings.TRACE_PATH, max_bytes=settings.RECORD_MAX_SIZE * 1024 * 1024,
+                           compress=settings.RECORD_COMPRESS)
+
+
+tracer = Tracer(exporter=make_exporter())
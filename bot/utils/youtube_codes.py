@@ -0,0 +1,58 @@
+import copy
+
+from bot.utils.json_cache import JsonFileCache
+
+
+def normalize_task_name(name) -> str:
+    return " ".join(str(name).split()).casefold()
+
+
+class YoutubeCodes(JsonFileCache):
+    def __init__(self, path: str = "./youtube-codes.json"):
+        self.data = {"incorrect_codes": [], "codes": []}
+        self.index = {}
+        self.wrong = set()
+        super().__init__(path)
+
+    def parse(self, data):
+        if not isinstance(data, dict):
+            data = {}
+        data.setdefault("incorrect_codes", [])
+        data.setdefault("codes", [])
+        self.data = data
+
+        # Keep codes marked wrong by this process out even if the write hasn't landed yet
+        for task in list(data["codes"]):
+            if (normalize_task_name(task.get("name", "")), str(task.get("code"))) in self.wrong:
+                data["codes"].remove(task)
+                if task not in data["incorrect_codes"]:
+                    data["incorrect_codes"].append(task)
+
+        self.index = {normalize_task_name(task.get("name", "")): task for task in data["codes"]}
+
+    def dump(self):
+        return copy.deepcopy(self.data)
+
+    def get_code(self, task_name):
+        self.refresh()
+        task = self.index.get(normalize_task_name(task_name))
+        if task is None:
+            return None
+        try:
+            return int(task["code"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def mark_wrong(self, task_name):
+        self.refresh()
+        task = self.index.pop(normalize_task_name(task_name), None)
+        if task is None:
+            return
+
+        self.wrong.add((normalize_task_name(task.get("name", "")), str(task.get("code"))))
+        self.data["codes"].remove(task)
+        self.data["incorrect_codes"].append(task)
+        self.schedule_save()
+
+
+youtube_codes = YoutubeCodes()
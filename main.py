@@ -1,4 +1,5 @@
 import asyncio
+import multiprocessing
 import sys
 from contextlib import suppress
 
@@ -11,6 +12,7 @@ async def main():
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# bot.config exits on the placeholder API credentials, and the shared stores must not touch sessions/
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "tests")
+os.environ.setdefault("TOKEN_CACHE_PATH", os.path.join(tempfile.mkdtemp(prefix="bums-tests-"), "tokens.json"))
+
+# Imported first like in main.py: bot.config needs bot.utils, and starting from bot.core would hit the cycle
+import bot.utils  # noqa: E402,F401
@@ -0,0 +1,61 @@
+import asyncio
+
+from bot.core.game_state import GameState
+from bot.core.models import GameInfo
+
+UPGRADE = "/miniapps/api/user_game_level/upgradeLeve"
+SIGN = "/miniapps/api/sign/sign"
+COLLECT = "/miniapps/api/user_game/collectCoin"
+
+
+def cached_state() -> GameState:
+    state = GameState(ttl=60)
+    payload = {"gameInfo": {"coin": 1000, "energySurplus": 50, "todayCollegeCoin": 10}, "mineInfo": {},
+               "tapInfo": {"tap": {"level": 1, "value": 2, "nextCostCoin": 100}, "energy": {"value": 500},
+                           "recovery": {"value": 2}, "bonusChance": {}, "bonusRatio": {}, "collectInfo": {"collectSeqNo": 7}}}
+
+    async def fetch():
+        return GameInfo.parse(payload)
+
+    asyncio.run(state.get(fetch))
+    return state
+
+
+def test_balance_only_mutation_keeps_other_sections_fresh():
+    state = cached_state()
+    state.invalidate(endpoint=SIGN)
+
+    assert not state.is_fresh(("balance",))
+    assert state.is_fresh(("gameInfo", "tapInfo"))
+
+
+def test_coin_in_answer_updates_cached_balance():
+    state = cached_state()
+    state.invalidate(endpoint=UPGRADE, data={"coin": 900, "tapInfo": {"tap": {"level": 2, "value": 3, "nextCostCoin": 200}}})
+
+    assert state.is_fresh(("balance", "tapInfo"))
+    assert state.data.coin == 900
+    assert state.data.tap_info.boosts["tap"].next_cost == 200
+    # The answer carried only the upgraded boost, the others are still known
+    assert set(state.data.tap_info.boosts) == {"tap", "energy", "recovery", "bonusChance", "bonusRatio"}
+    assert (state.data.tap_info.total_energy, state.data.tap_info.recovery) == (500, 2)
+    # An answer without collectInfo keeps the known sequence number
+    assert state.data.tap_info.collect_seq == 7
+
+
+def test_collect_answer_updates_energy_and_sequence():
+    state = cached_state()
+    state.invalidate(endpoint=COLLECT, data={"coin": 1020, "collectSeqNo": 8, "energySurplus": 30, "todayCollegeCoin": 30})
+
+    assert state.is_fresh()
+    assert (state.data.coin, state.data.left_energy, state.data.today_coin) == (1020, 30, 30)
+    assert state.data.tap_info.collect_seq == 8
+
+
+def test_answer_without_values_marks_sections_stale():
+    state = cached_state()
+    state.invalidate(endpoint=UPGRADE, data={})
+
+    assert not state.is_fresh(("balance",))
+    assert not state.is_fresh(("tapInfo",))
+    assert state.is_fresh(("gameInfo",))
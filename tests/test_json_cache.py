@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from bot.utils import json_cache
+from bot.utils.json_cache import JsonFileCache, save_json_atomic
+
+
+def mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_save_keeps_existing_mode(tmp_path):
+    path = tmp_path / "codes.json"
+    path.write_text("{}")
+    os.chmod(path, 0o664)
+
+    save_json_atomic(str(path), {"a": 1})
+
+    assert mode(path) == 0o664
+    assert json.loads(path.read_text()) == {"a": 1}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_save_new_file_uses_umask(tmp_path):
+    path = tmp_path / "new.json"
+    umask = os.umask(0o022)
+    try:
+        save_json_atomic(str(path), [1, 2])
+    finally:
+        os.umask(umask)
+
+    assert mode(path) == 0o644
+
+
+def test_save_leaves_no_temp_file_on_error(tmp_path):
+    path = tmp_path / "data.json"
+    with pytest.raises(TypeError):
+        save_json_atomic(str(path), {"bad": object()})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+class Counts(JsonFileCache):
+    def __init__(self, path, save_delay: float = 2.0):
+        self.counts = {}
+        super().__init__(path, check_interval=0, save_delay=save_delay)
+
+    def parse(self, data):
+        self.counts = dict(data)
+
+    def dump(self):
+        return dict(self.counts)
+
+
+def test_cache_needs_parse_and_dump():
+    with pytest.raises(TypeError):
+        JsonFileCache("unused.json")
+
+
+def test_cache_reparses_on_change(tmp_path):
+    path = tmp_path / "counts.json"
+    path.write_text('{"a": 1}')
+    cache = Counts(str(path))
+    cache.refresh()
+    assert cache.counts == {"a": 1}
+
+    save_json_atomic(str(path), {"a": 2})
+    os.utime(path, ns=(0, 0))
+    assert cache.refresh()
+    assert cache.counts == {"a": 2}
+
+
+def test_pending_saves_written_at_exit(tmp_path):
+    path = tmp_path / "counts.json"
+    cache = Counts(str(path))
+    cache.refresh()
+    cache.counts["b"] = 3
+    # Marked dirty as if a debounced save was scheduled and never ran
+    cache._dirty = True
+
+    json_cache.save_pending()
+
+    assert json.loads(path.read_text()) == {"b": 3}
+    assert not cache._dirty
+
+
+def test_change_during_a_write_gets_its_own_save(tmp_path, monkeypatch):
+    path = tmp_path / "counts.json"
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_save(*args):
+        writing.set()
+        release.wait(timeout=5)
+        save_json_atomic(*args)
+
+    monkeypatch.setattr(json_cache, "save_json_atomic", slow_save)
+
+    async def main():
+        cache = Counts(str(path), save_delay=0.01)
+        cache.counts["a"] = 1
+        cache.schedule_save()
+        await asyncio.to_thread(writing.wait, 5)
+
+        cache.counts["b"] = 2
+        cache.schedule_save()
+        release.set()
+        await asyncio.wait_for(cache.flush(), timeout=5)
+        return cache
+
+    cache = asyncio.run(main())
+    assert json.loads(path.read_text()) == {"a": 1, "b": 2}
+    assert not cache._dirty
@@ -0,0 +1,170 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bot.core import limiter as module
+from bot.core.limiter import AdaptiveLimiter, EndpointLimiters, RetryBudget, TokenBucket, backoff_delay, retry_after_seconds
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_spaces_permits(clock):
+    bucket = TokenBucket(rate=10)
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0, 0.1, 0.2])
+
+
+def test_token_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.reserve() for _ in range(2)] == pytest.approx([0, 0.5])
+
+    # An idle bucket refills, but never beyond its capacity
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0, 0, 0, 0.5])
+
+
+def test_token_bucket_without_rate_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.reserve() == 0 for _ in range(100))
+
+
+def test_adaptive_limiter_halves_once_per_cooldown(clock):
+    limiter = AdaptiveLimiter(minimum=2, maximum=16, cooldown=2.0)
+    limiter.release(overloaded=True)
+    limiter.release(overloaded=True)
+    assert limiter.limit == 8
+    assert limiter.overloads == 2
+
+    clock.now += 2
+    for _ in range(5):
+        limiter.release(overloaded=True)
+        clock.now += 2
+    assert limiter.limit == 2
+
+
+def test_adaptive_limiter_grows_back_to_maximum(clock):
+    limiter = AdaptiveLimiter(minimum=1, maximum=4)
+    limiter.limit = 1.0
+    limiter.release()
+    assert limiter.limit == 2
+    for _ in range(100):
+        limiter.release()
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_adaptive_limiter_queues_beyond_the_limit():
+    async def main():
+        limiter = AdaptiveLimiter(minimum=1, maximum=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(main())
+
+
+def test_adaptive_limiter_woken_waiter_cancelled_passes_the_slot_on():
+    async def main():
+        limiter = AdaptiveLimiter(minimum=1, maximum=1)
+        await limiter.acquire()
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # The first waiter is handed the slot and cancelled before it runs
+        limiter.release()
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1)
+        assert first.cancelled()
+        assert limiter.in_flight == 1
+
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_adaptive_limiter_serves_waiters_before_newcomers():
+    async def main():
+        limiter = AdaptiveLimiter(minimum=1, maximum=1)
+        order = []
+
+        async def queued():
+            await limiter.acquire()
+            order.append("queued")
+            limiter.release()
+
+        await limiter.acquire()
+        task = asyncio.ensure_future(queued())
+        await asyncio.sleep(0)
+
+        limiter.release()
+        # Asks right after the release, before the woken waiter had a chance to run
+        await limiter.acquire()
+        order.append("newcomer")
+        limiter.release()
+        await asyncio.wait_for(task, timeout=1)
+
+        assert order == ["queued", "newcomer"]
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_retry_budget_is_spent_and_refilled(clock):
+    budget = RetryBudget(ratio=0.5, min_per_second=0, capacity=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    assert budget.denied == 1
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_retry_budget_minimum_rate(clock):
+    budget = RetryBudget(ratio=0, min_per_second=1, capacity=5)
+    budget.tokens = 0
+    assert not budget.withdraw()
+    clock.now += 3
+    assert sum(budget.withdraw() for _ in range(5)) == 3
+
+
+def test_endpoint_limiters_ignore_query_string():
+    limiters = EndpointLimiters(minimum=1, maximum=4)
+    assert limiters.get("/api/getGameInfo?code=1") is limiters.get("/api/getGameInfo")
+    assert list(limiters.stats()) == ["/api/getGameInfo"]
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, cap=30) <= 30 for attempt in range(20))
+
+
+def test_retry_after_seconds_and_http_date():
+    assert retry_after_seconds({"Retry-After": "7"}) == 7
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert retry_after_seconds({}) is None
+
+    moment = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert retry_after_seconds({"Retry-After": format_datetime(moment, usegmt=True)}) == pytest.approx(120, abs=2)
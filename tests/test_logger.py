@@ -0,0 +1,37 @@
+from loguru import logger
+
+from bot.utils.logger import AccountFiles, LogSampler
+
+
+class Level:
+    def __init__(self, no: int):
+        self.no = no
+
+
+def record(message: str, level: int = 20) -> dict:
+    return {"message": message, "level": Level(level), "extra": {}}
+
+
+def test_sampler_keeps_a_window_per_account():
+    sampler = LogSampler(["Tapped"], window=60)
+
+    assert sampler(record("alice | Tapped 30 times"))
+    assert not sampler(record("alice | Tapped 30 times"))
+    assert sampler(record("bob | Tapped 30 times"))
+    assert sampler(record("alice | Claimed reward"))
+    assert sampler(record("alice | Tapped too fast", level=30))
+    assert sampler.suppressed == {("alice", "Tapped"): 1}
+
+
+def test_account_files_are_closed_with_the_handler(tmp_path):
+    files = AccountFiles(str(tmp_path), max_bytes=1024 * 1024)
+    handler = logger.add(files, format="{message}")
+    logger.info("alice | hello")
+    logger.info("plain line")
+    opened = list(files._files.values())
+
+    logger.remove(handler)
+
+    assert len(opened) == 2 and all(file.closed for file in opened)
+    assert (tmp_path / "alice.log").read_text() == "alice | hello\n"
+    assert (tmp_path / "bot.log").read_text() == "plain line\n"
@@ -0,0 +1,55 @@
+import pytest
+
+from bot.core.models import GameInfo, MineCard, SpinInfo, to_int
+
+
+def payload() -> dict:
+    return {
+        "gameInfo": {"coin": "1500.0", "level": 3, "energySurplus": None, "collegeCanUse": ["Lottery"]},
+        "mineInfo": {"minePower": 120.5, "mineOfflineCoin": "40"},
+        "tapInfo": {"tap": {"level": 2, "value": "3", "nextCostCoin": 500}, "energy": {"value": 1000},
+                    "recovery": {"value": 4}, "bonusChance": {"value": 10}, "bonusRatio": {"value": 200},
+                    "collectInfo": {"collectSeqNo": 12}},
+        "propInfo": [{"source": "autoClick"}],
+    }
+
+
+def test_to_int_accepts_the_api_number_forms():
+    assert [to_int(5), to_int(2.7), to_int("8"), to_int("9.5")] == [5, 2, 8, 9]
+    assert to_int(None) == 0
+    assert to_int("n/a", None) is None
+
+
+def test_game_info_converts_fields():
+    game_info = GameInfo.parse(payload())
+
+    assert (game_info.coin, game_info.level, game_info.left_energy) == (1500, 3, 0)
+    assert (game_info.mine_power, game_info.offline_coin) == (120, 40)
+    assert game_info.college_can_use == ("Lottery",)
+    assert game_info.auto_click
+    assert (game_info.tap_info.tap, game_info.tap_info.total_energy, game_info.tap_info.collect_seq) == (3, 1000, 12)
+    assert game_info.tap_info.boosts["tap"].next_cost == 500
+
+
+@pytest.mark.parametrize("section, entry", [
+    ("gameInfo", None), ("mineInfo", None), ("tapInfo", None), ("tapInfo", "energy"), ("tapInfo", "collectInfo"),
+])
+def test_game_info_missing_required_field_is_rejected(section, entry):
+    data = payload()
+    if entry is None:
+        del data[section]
+    else:
+        del data[section][entry]
+    assert GameInfo.parse(data) is None
+
+
+def test_mine_card_needs_id_and_cost():
+    assert MineCard.parse({"mineId": 1}) is None
+    assert MineCard.parse("card") is None
+    card = MineCard.parse({"mineId": "7", "nextLevelCost": "300", "perHourReward": 10, "nextPerHourReward": 25})
+    assert (card.mine_id, card.cost, card.reward_increase, card.status) == (7, 300, 15, 1)
+
+
+def test_spin_info_without_max():
+    assert SpinInfo.parse({"staminaNow": "3"}) == SpinInfo(stamina_now=3, stamina_max=None)
+    assert SpinInfo.parse(None) == SpinInfo()
@@ -0,0 +1,103 @@
+from bot.core.models import MineCard, TapInfo
+from bot.utils.planner import MineUpgradePlanner, TapUpgradePlanner, mine_payback
+
+
+def card(mine_id, cost, reward=0, next_reward=100, level=1, status=1) -> MineCard:
+    return MineCard(mine_id=mine_id, level=level, status=status, cost=cost, reward=reward, next_reward=next_reward)
+
+
+def bought(planner: MineUpgradePlanner) -> list:
+    # Every upgrade succeeds and the answer carries nothing
+    mine_ids = []
+    while (step := planner.next()) is not None:
+        planner.advance(step, None)
+        mine_ids.append(step["mineId"])
+    return mine_ids
+
+
+def test_mine_payback():
+    assert mine_payback(1000, 100) == 10
+    assert mine_payback(1000, 0) == float('inf')
+
+
+def test_mine_planner_orders_by_payback():
+    planner = MineUpgradePlanner([card(1, 1000, next_reward=10), card(2, 1000, next_reward=100), card(3, 500, next_reward=10)],
+                                 balance=10_000, max_price=10_000)
+    assert bought(planner) == [2, 3, 1]
+
+
+def test_mine_planner_list_order_without_profit():
+    planner = MineUpgradePlanner([card(1, 1000, next_reward=10), card(2, 1000, next_reward=100)],
+                                 balance=10_000, max_price=10_000, by_profit=False)
+    assert bought(planner) == [1, 2]
+
+
+def test_mine_planner_skips_locked_and_overpriced_cards():
+    planner = MineUpgradePlanner([card(1, 100, status=0), card(2, 5000), card(3, 0), card(4, 100)],
+                                 balance=10_000, max_price=1000)
+    assert bought(planner) == [4]
+
+
+def test_mine_planner_pays_only_after_success():
+    planner = MineUpgradePlanner([card(1, 600, next_reward=100), card(2, 600, next_reward=90)], balance=1000, max_price=10_000)
+
+    first = planner.next()
+    assert first["mineId"] == 1 and planner.balance == 1000
+    # The first upgrade failed, nothing was paid and the second card is still affordable
+    second = planner.next()
+    assert second["mineId"] == 2
+
+    planner.advance(second, None)
+    assert planner.balance == 400
+    assert planner.next() is None
+
+
+def test_mine_planner_next_level_competes_again():
+    planner = MineUpgradePlanner([card(1, 100, next_reward=100)], balance=1000, max_price=10_000)
+    step = planner.next()
+
+    next_level = {"mineId": 1, "level": 2, "status": 1, "nextLevelCost": 200, "perHourReward": 100, "nextPerHourReward": 180}
+    assert planner.advance(step, next_level)
+    assert planner.balance == 900
+    assert planner.next() == {"mineId": 1, "level": 2, "cost": 200, "reward": 80}
+
+
+def tap_info(**boosts) -> TapInfo:
+    return TapInfo.parse({name: {"level": level, "value": 1, "nextCostCoin": cost} for name, (level, cost) in boosts.items()})
+
+
+def test_tap_planner_cheapest_first_within_max_levels():
+    planner = TapUpgradePlanner(tap_info(tap=(1, 300), energy=(1, 100), recovery=(5, 50)), balance=1000,
+                                max_levels={"tap": 5, "energy": 5, "recovery": 5})
+    assert planner.next() == {"type": "energy", "level": 1, "cost": 100}
+    assert not planner.all_upgraded
+
+
+def test_tap_planner_pays_only_after_success():
+    planner = TapUpgradePlanner(tap_info(tap=(1, 600), energy=(1, 700)), balance=1000, max_levels={"tap": 5, "energy": 5})
+
+    failed = planner.next()
+    assert failed["type"] == "tap"
+    assert planner.balance == 1000 and planner.levels["tap"] == 1
+
+    step = planner.next()
+    assert step["type"] == "energy"
+    planner.advance(step, {"coin": 250})
+    assert planner.balance == 250
+    assert planner.levels["energy"] == 2
+
+
+def test_tap_planner_next_cost_from_response():
+    planner = TapUpgradePlanner(tap_info(tap=(1, 100)), balance=1000, max_levels={"tap": 3})
+    step = planner.next()
+
+    assert planner.advance(step, {"tapInfo": {"tap": {"level": 2, "value": 2, "nextCostCoin": 200}}})
+    assert planner.balance == 900
+    step = planner.next()
+    assert step == {"type": "tap", "level": 2, "cost": 200}
+
+    # No next cost in the answer: the level is still counted, the boost stops competing
+    assert not planner.advance(step, {})
+    assert planner.levels["tap"] == 3
+    assert planner.next() is None
+    assert planner.all_upgraded
@@ -0,0 +1,121 @@
+import asyncio
+import datetime
+
+from bot.core.scheduler import Scheduler
+from bot.utils.clock import Clock
+
+
+def run_jobs(scheduler: Scheduler, jobs: dict):
+    async def main():
+        for key, job in jobs.items():
+            scheduler.add(key, job)
+        scheduler.close()
+        await asyncio.wait_for(scheduler.run(), timeout=5)
+
+    asyncio.run(main())
+
+
+def test_sleeping_job_lends_its_slot():
+    clock = Clock(lend_after=0.01)
+    events = []
+
+    def job(name):
+        async def run():
+            events.append(("start", name))
+            await clock.sleep(0.1)
+            events.append(("end", name))
+        return run
+
+    run_jobs(Scheduler(workers=1, max_cycles=2), {"a": job("a"), "b": job("b")})
+
+    assert events[:2] == [("start", "a"), ("start", "b")]
+
+
+def test_short_sleeps_keep_the_slot():
+    clock = Clock(lend_after=1.0)
+    events = []
+
+    def job(name):
+        async def run():
+            events.append(("start", name))
+            await clock.sleep(0.05)
+            events.append(("end", name))
+        return run
+
+    run_jobs(Scheduler(workers=1, max_cycles=2), {"a": job("a"), "b": job("b")})
+
+    assert events == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+
+
+def test_workers_cap_jobs_doing_work():
+    clock = Clock(lend_after=0.01)
+    active = peak = 0
+
+    async def job():
+        nonlocal active, peak
+        for _ in range(3):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+            await clock.sleep(0.02)
+
+    scheduler = Scheduler(workers=2, max_cycles=6)
+    run_jobs(scheduler, {str(number): job for number in range(6)})
+
+    assert peak == 2
+    assert scheduler.runs == 6
+    assert scheduler._slots._value == 2
+
+
+def test_lent_slots_still_cap_cycles_in_flight():
+    clock = Clock(lend_after=0.01)
+    in_flight = peak = 0
+
+    async def job():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await clock.sleep(0.02)
+        in_flight -= 1
+
+    scheduler = Scheduler(workers=1, max_cycles=3)
+    run_jobs(scheduler, {str(number): job for number in range(8)})
+
+    assert peak == 3
+    assert scheduler.runs == 8
+
+
+def test_pacing_sleeps_keep_the_slot_by_default():
+    clock = Clock(scale=0.001)
+    events = []
+
+    def job(name):
+        async def run():
+            events.append(("start", name))
+            # 3 s of pacing between requests, scaled down but still too short to lend
+            await clock.sleep(3)
+            events.append(("end", name))
+        return run
+
+    run_jobs(Scheduler(workers=1, max_cycles=2), {"a": job("a"), "b": job("b")})
+
+    assert events == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+
+
+def test_quiet_hours_defer_due_jobs():
+    scheduler = Scheduler(workers=1, quiet_hours=[0, 7], quiet_check=(3600, 3600))
+    night = datetime.datetime(2024, 1, 1, 3, tzinfo=datetime.timezone.utc).timestamp()
+    day = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc).timestamp()
+
+    assert scheduler._quiet_until(night) == night + 3600
+    assert scheduler._quiet_until(day) is None
+
+
+def test_quiet_hours_across_midnight():
+    scheduler = Scheduler(workers=1, quiet_hours=[22, 6])
+    late = datetime.datetime(2024, 1, 1, 23, tzinfo=datetime.timezone.utc).timestamp()
+    evening = datetime.datetime(2024, 1, 1, 21, tzinfo=datetime.timezone.utc).timestamp()
+
+    assert scheduler._quiet_until(late) is not None
+    assert scheduler._quiet_until(evening) is None
@@ -0,0 +1,28 @@
+from bot.core.supervisor import shard_accounts
+
+
+def accounts(*names) -> list:
+    return [{"session_name": name} for name in names]
+
+
+def index_of(shards: list, name: str) -> int:
+    return next(index for index, shard in enumerate(shards) if any(account["session_name"] == name for account in shard))
+
+
+def test_shards_are_stable_across_restarts():
+    names = [f"account{number}" for number in range(50)]
+    shards = shard_accounts(accounts(*names), workers=4)
+
+    assert sum(len(shard) for shard in shards) == 50
+    assert shards == shard_accounts(accounts(*names), workers=4)
+
+
+def test_empty_shards_keep_indices():
+    names = [f"account{number}" for number in range(50)]
+    full = shard_accounts(accounts(*names), workers=8)
+
+    # With fewer accounts than workers, the remaining ones keep their worker (and its token file)
+    few = shard_accounts(accounts("account3", "account7"), workers=8)
+    assert len(few) == 8
+    assert index_of(few, "account3") == index_of(full, "account3")
+    assert index_of(few, "account7") == index_of(full, "account7")
@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.core import tapper as module
+from bot.core.models import GameInfo
+from bot.core.tapper import Tapper
+from bot.core.tg_pool import tg_pool
+from bot.config import settings
+from bot.utils.token_cache import token_cache
+from bot.utils.clock import Clock
+
+
+@pytest.fixture(autouse=True)
+def instant_sleeps(monkeypatch):
+    monkeypatch.setattr(module, "clock", Clock(scale=0))
+
+
+def tapper() -> Tapper:
+    return Tapper(tg_client=SimpleNamespace(name="account"), first_run=False)
+
+
+def test_failed_telegram_authorization_stops_the_account():
+    account = tapper()
+
+    async def no_web_data(proxy):
+        return None
+
+    account.get_tg_web_data = no_web_data
+    assert asyncio.run(account.run_due(proxy=None)) is None
+
+
+def test_cycle_errors_reach_the_scheduler():
+    account = tapper()
+
+    async def broken_cycle(proxy, phases=None):
+        raise TypeError("'NoneType' object is not subscriptable")
+
+    account.run_once = broken_cycle
+    with pytest.raises(TypeError):
+        asyncio.run(account.run_due(proxy=None))
+
+
+def returning(value):
+    async def call(*args, **kwargs):
+        return value
+    return call
+
+
+@pytest.mark.parametrize("signed, waits_for_reset", [(True, True), (None, False)])
+def test_sign_in_waits_for_reset_only_after_success(signed, waits_for_reset):
+    account = tapper()
+    account.sign_in_data = returning({"data": {"signStatus": 0, "lists": [{"status": 0, "normal": 100, "daysDesc": "Day 1"}]}})
+    account.sign_in = returning(signed)
+
+    delay = asyncio.run(account.phase_sign_in(None, auth_token="token"))
+    assert (delay is not None) == waits_for_reset
+
+
+@pytest.mark.parametrize("opened, waits_for_reset", [({"rewardLists": [{"name": "Coins"}]}, True), (None, False)])
+def test_free_box_waits_for_reset_only_after_success(opened, waits_for_reset):
+    account = tapper()
+    box = {"propId": 500010001, "toDayUse": False, "toDayMaxUseNum": 1, "toDayNowUseNum": None}
+    account.box_info = returning({"data": [box]})
+    account.open_box = returning(opened)
+
+    delay = asyncio.run(account.phase_free_box(None, auth_token="token"))
+    assert (delay is not None) == waits_for_reset
+
+
+def test_rejected_tap_submit_refetches_game_info():
+    account = tapper()
+    fetches = []
+    submits = []
+
+    async def fetch_user_data(http_client, auth_token):
+        fetches.append(auth_token)
+        return GameInfo.parse({
+            "gameInfo": {"energySurplus": 500, "todayMaxCollegeCoin": 10**6}, "mineInfo": {},
+            "tapInfo": {"tap": {"value": 1}, "energy": {"value": 500}, "recovery": {"value": 1},
+                        "bonusChance": {}, "bonusRatio": {}, "collectInfo": {"collectSeqNo": 3}},
+        })
+
+    async def submit_taps(http_client, auth_token, collect_seq, taps_amount, hashCode):
+        submits.append(collect_seq)
+        return None
+
+    account.fetch_user_data = fetch_user_data
+    account.submit_taps = submit_taps
+    asyncio.run(account.phase_taps(None, auth_token="token"))
+
+    # One fetch to plan, one more after the rejection instead of the cached payload, then the phase gives up
+    assert len(fetches) == 2
+    assert len(submits) == 2
+
+
+def test_failed_telegram_connect_leaves_other_holders_alone():
+    async def connect():
+        raise ConnectionError("network is unreachable")
+
+    client = SimpleNamespace(name="shared", is_connected=False, connect=connect)
+    account = Tapper(tg_client=client, first_run=False)
+    # Another cycle of the same account holds the client
+    tg_pool._users["shared"] = 1
+    try:
+        assert asyncio.run(account.get_tg_web_data(proxy=None)) is None
+        assert tg_pool._users["shared"] == 1
+    finally:
+        tg_pool._users.pop("shared", None)
+
+
+@pytest.mark.parametrize("expires_in, wake_in, refresh_in", [
+    (3600, 600, None),      # still valid at the next cycle
+    (1200, 2700, 900),      # expires before the next cycle, renewed ahead of the margin
+    (200, 0, 0),            # already inside the margin when a cycle starts
+    (0, 2700, None),        # no token, the next cycle logs in anyway
+])
+def test_token_refresh_is_scheduled_before_expiry(monkeypatch, expires_in, wake_in, refresh_in):
+    account = tapper()
+    delays = []
+
+    async def refresh_token(proxy, delay=0):
+        delays.append(delay)
+
+    monkeypatch.setattr(settings, "TOKEN_REFRESH_MARGIN", 300)
+    monkeypatch.setattr(token_cache, "expires_in", lambda session_name: expires_in)
+    account.refresh_token = refresh_token
+
+    async def main():
+        account.schedule_refresh(proxy=None, wake_in=wake_in)
+        if account.refresh_task:
+            await account.refresh_task
+
+    asyncio.run(main())
+    assert delays == ([] if refresh_in is None else [refresh_in])
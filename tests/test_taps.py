@@ -0,0 +1,103 @@
+import math
+import random
+
+import pytest
+
+from bot.core.models import GameInfo
+from bot.utils.taps import TapState, bonus_probability, count_bonus_taps, next_tap_wakeup, plan_tap_batches
+
+
+def test_no_bonus_splits_budget_evenly():
+    batches = plan_tap_batches(tap_value=2, left_energy=100, coin_room=1000, bonus_chance=0, bonus_ratio=0, max_taps=30)
+    assert batches == [(25, 50), (25, 50)]
+
+
+def test_budget_is_the_smaller_of_energy_and_coin_room():
+    batches = plan_tap_batches(tap_value=1, left_energy=100, coin_room=40, bonus_chance=0, bonus_ratio=0, max_taps=30)
+    assert sum(amount for _, amount in batches) == 40
+    assert all(taps <= 30 for taps, _ in batches)
+
+
+@pytest.mark.parametrize("left_energy", [0, 1, 14])
+def test_below_minimum_plans_nothing(left_energy):
+    assert plan_tap_batches(1, left_energy, 1000, 0, 0, max_taps=30, min_taps=15) == []
+
+
+def test_minimum_batch_size_is_respected():
+    # 31 taps can't be split into two batches of 25+, one full batch goes out and the rest waits
+    batches = plan_tap_batches(1, 31, 1000, 0, 0, max_taps=30, min_taps=25)
+    assert batches == [(30, 30)]
+
+    for energy in range(15, 200):
+        for taps, _ in plan_tap_batches(1, energy, 1000, 0, 0, max_taps=30, min_taps=15):
+            assert 15 <= taps <= 30
+
+
+def test_max_below_min_plans_nothing():
+    assert plan_tap_batches(1, 100, 1000, 0, 0, max_taps=10, min_taps=15) == []
+
+
+def test_bonus_never_overspends_the_budget():
+    rng = random.Random(7)
+    for _ in range(200):
+        energy = rng.randint(0, 5000)
+        batches = plan_tap_batches(3, energy, 10**9, bonus_chance=5000, bonus_ratio=300, max_taps=30, rng=rng)
+        assert sum(amount for _, amount in batches) <= energy
+        assert all(amount >= taps * 3 for taps, amount in batches)
+
+
+@pytest.mark.parametrize("bonus_chance, probability", [(0, 0), (500, 0.05), (2500, 0.25), (10000, 1), (20000, 1), (-5, 0)])
+def test_bonus_chance_is_in_hundredths_of_a_percent(bonus_chance, probability):
+    assert bonus_probability(bonus_chance) == pytest.approx(probability)
+
+
+def test_bonus_odds_match_the_former_roll():
+    # generate_taps rolled randint(0, 100) <= bonusChance / 100: 6 of 101 outcomes at 500
+    legacy = sum(roll <= 500 / 100 for roll in range(101)) / 101
+    assert bonus_probability(500) == pytest.approx(legacy, abs=0.01)
+
+
+def test_count_bonus_taps_edges_and_mean():
+    rng = random.Random(1)
+    assert count_bonus_taps(0, 0.5, rng) == 0
+    assert count_bonus_taps(10, 0.0, rng) == 0
+    assert count_bonus_taps(10, 1.0, rng) == 10
+
+    draws = [count_bonus_taps(1000, 0.1, rng) for _ in range(200)]
+    assert 90 < sum(draws) / len(draws) < 110
+
+
+def game_info(left_energy=100, total_energy=500, recovery=2, today_coin=0, limit=10000, seq=5) -> GameInfo:
+    return GameInfo.parse({
+        "gameInfo": {"energySurplus": left_energy, "todayCollegeCoin": today_coin, "todayMaxCollegeCoin": limit},
+        "mineInfo": {},
+        "tapInfo": {"tap": {"value": 1}, "energy": {"value": total_energy}, "recovery": {"value": recovery},
+                    "bonusChance": {}, "bonusRatio": {}, "collectInfo": {"collectSeqNo": seq}},
+    })
+
+
+def test_tap_state_applies_response_or_advances_locally():
+    state = TapState(game_info())
+
+    state.apply(30, {"collectSeqNo": 9, "energySurplus": 60, "todayCollegeCoin": 30})
+    assert (state.collect_seq, state.left_energy, state.today_coin, state.confirmed) == (9, 60, 30, True)
+
+    state.apply(20)
+    assert (state.collect_seq, state.left_energy, state.today_coin, state.confirmed) == (10, 40, 50, False)
+
+
+def test_tap_wakeup_waits_for_energy_fill():
+    state = TapState(game_info(left_energy=100, total_energy=500, recovery=2))
+    # 80% of 500 is 400, 300 missing at 2 per second
+    assert next_tap_wakeup(state, reset_in=10**6, fill=0.8) == pytest.approx(150, abs=1)
+
+
+def test_tap_wakeup_after_coin_limit_is_reset():
+    state = TapState(game_info(today_coin=10000, limit=10000))
+    assert next_tap_wakeup(state, reset_in=3600, fill=0.8) == 3600
+
+
+def test_tap_wakeup_without_recovery():
+    state = TapState(game_info(recovery=0))
+    assert next_tap_wakeup(state, reset_in=3600, fill=0.8) is None
+    assert math.isinf(state.seconds_to_energy(400))
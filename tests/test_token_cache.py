@@ -0,0 +1,103 @@
+import base64
+import json
+
+import pytest
+
+from bot.utils import token_cache as module
+from bot.utils.token_cache import TokenCache, token_expiry
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return TokenCache(path=str(tmp_path / "tokens.json"), default_ttl=3600)
+
+
+def jwt(exp: int) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_token_expiry_reads_jwt_payload():
+    assert token_expiry(jwt(1234)) == 1234
+    assert token_expiry("opaque-token") is None
+
+
+def test_token_valid_until_default_ttl(cache, clock):
+    cache.set("a", "token")
+    clock.now += 3599
+    assert cache.get("a") == "token"
+    assert cache.get("a", margin=300) is None
+    clock.now += 1
+    assert cache.get("a") is None
+
+
+def test_jwt_expiry_wins_over_default_ttl(cache, clock):
+    cache.set("a", jwt(int(clock.now) + 60))
+    assert cache.expires_in("a") == 60
+
+
+def test_early_401_shortens_only_that_account(cache, clock):
+    cache.set("a", "token-a")
+    cache.set("b", "token-b")
+    clock.now += 600
+    cache.invalidate("a", token="token-a")
+
+    assert cache.get("a") is None
+    assert cache.ttl("a") == 600
+    assert cache.ttl("b") == 3600
+
+    cache.set("a", "token-a2")
+    assert cache.expires_in("a") == 600
+
+
+def test_invalidate_ignores_other_token(cache, clock):
+    cache.set("a", "current")
+    clock.now += 10
+    cache.invalidate("a", token="stale")
+    assert cache.get("a") == "current"
+    assert cache.ttl("a") == 3600
+
+
+def test_learned_ttl_grows_back(cache, clock):
+    cache.set("a", "t1")
+    clock.now += 1000
+    cache.invalidate("a")
+    cache.set("a", "t2")
+
+    ttls = []
+    for number in range(3, 12):
+        clock.now += cache.ttl("a")
+        cache.set("a", f"t{number}")
+        ttls.append(cache.ttl("a"))
+
+    assert ttls[0] == 1250
+    assert ttls == sorted(ttls)
+    assert ttls[-1] == 3600
+    assert "a" not in cache.learned_ttl
+
+
+def test_learned_ttl_not_persisted(cache, clock, tmp_path):
+    cache.set("a", "t1")
+    clock.now += 100
+    cache.invalidate("a")
+    cache.set("a", "t2")
+
+    reloaded = TokenCache(path=str(tmp_path / "tokens.json"), default_ttl=3600)
+    reloaded.refresh(force=True)
+    assert reloaded.get("a") == "t2"
+    assert reloaded.ttl("a") == 3600